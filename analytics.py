@@ -0,0 +1,218 @@
+# analytics.py
+"""Running hiring-trend aggregates per company and team (`scraper.py stats`).
+
+Each run's parsed postings are diffed against the store's set of open postings.
+Only that delta updates the aggregates: open count, new and closed per day, and
+a histogram of how many days closed postings stayed open (for the median). No
+run history is re-read. A company's first run is a baseline, so its existing
+postings don't count as new.
+
+The same rates give each board a poll interval. Boards that change often are
+polled every MIN_POLL_INTERVAL_HOURS and quiet ones every MAX_POLL_INTERVAL_HOURS.
+`scraper.py --due-only` skips boards that aren't due yet.
+"""
+import argparse
+import json
+import os
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Dict, List, NamedTuple, Optional
+from constants import (MAX_POLL_INTERVAL_HOURS, MIN_POLL_INTERVAL_HOURS, TREND_RETENTION_DAYS,
+                       TREND_WINDOW_DAYS, TRENDS_FILE)
+from models import JobPosting
+
+# Postings without a team are only counted in the company totals
+NO_TEAM = ""
+
+
+class Trend(NamedTuple):
+    name: str
+    open: int
+    new: int
+    closed: int
+    previous_new: int
+    median_days_open: Optional[float]
+    poll_interval_hours: float
+
+    @property
+    def net(self) -> int:
+        return self.new - self.closed
+
+    @property
+    def ramping_up(self) -> bool:
+        return self.net > 0 and self.new > self.previous_new
+
+
+def _new_aggregate() -> Dict[str, Any]:
+    # days: ISO date -> [new, closed]; durations: days open -> closed postings
+    return {"open": 0, "days": {}, "durations": {}}
+
+
+def _median_from_histogram(durations: Dict[str, int]) -> Optional[float]:
+    total = sum(durations.values())
+    if not total:
+        return None
+    # Values at the two middle positions (the same one when total is odd)
+    middle = {(total - 1) // 2, total // 2}
+    values = []
+    seen = 0
+    for days, count in sorted((int(days), count) for days, count in durations.items()):
+        values.extend(days for position in middle if seen <= position < seen + count)
+        seen += count
+    return sum(values) / len(values)
+
+
+class TrendStore:
+    def __init__(self, path: str = TRENDS_FILE, retention_days: int = TREND_RETENTION_DAYS):
+        self.path = path
+        self.retention_days = retention_days
+        # company -> {"open": {job_id: [first_seen, team]}, "total": aggregate,
+        #             "teams": {team: aggregate}, "last_run": ISO timestamp}
+        self._companies: Dict[str, Dict[str, Any]] = self._load()
+        self._dirty = False
+
+    def record(self, company: str, jobs: List[JobPosting], when: Optional[datetime] = None):
+        """Applies one run's delta for a board to its aggregates."""
+        when = when or datetime.now(timezone.utc)
+        today = when.date().isoformat()
+        current = {str(job.job_id): job.team or NO_TEAM for job in jobs}
+
+        state = self._companies.get(company)
+        if state is None:
+            # Baseline: seed the open set without counting it as new
+            state = self._companies[company] = {"open": {}, "total": _new_aggregate(), "teams": {}}
+            for job_id, team in current.items():
+                state["open"][job_id] = [today, team]
+                for aggregate in self._aggregates(state, team):
+                    aggregate["open"] += 1
+        else:
+            open_jobs = state["open"]
+            for job_id in open_jobs.keys() - current.keys():
+                first_seen, team = open_jobs.pop(job_id)
+                days_open = str((when.date() - date.fromisoformat(first_seen)).days)
+                for aggregate in self._aggregates(state, team):
+                    self._count(aggregate, today, closed=days_open)
+            for job_id in current.keys() - open_jobs.keys():
+                open_jobs[job_id] = [today, current[job_id]]
+                for aggregate in self._aggregates(state, current[job_id]):
+                    self._count(aggregate, today)
+
+        state["last_run"] = when.isoformat()
+        self._dirty = True
+
+    def _aggregates(self, state: Dict[str, Any], team: str) -> List[Dict[str, Any]]:
+        """The company total and, for postings with a team, the team's aggregate."""
+        if team == NO_TEAM:
+            return [state["total"]]
+        return [state["total"], state["teams"].setdefault(team, _new_aggregate())]
+
+    def _count(self, aggregate: Dict[str, Any], day: str, closed: Optional[str] = None):
+        counts = aggregate["days"].setdefault(day, [0, 0])
+        if closed is None:
+            counts[0] += 1
+            aggregate["open"] += 1
+        else:
+            counts[1] += 1
+            aggregate["open"] -= 1
+            aggregate["durations"][closed] = aggregate["durations"].get(closed, 0) + 1
+
+    # --- Queries ---
+
+    def trends(self, window_days: int = TREND_WINDOW_DAYS, teams: bool = False,
+               companies: Optional[List[str]] = None) -> List[Trend]:
+        """Per-company (or per-team) trends over the last window, biggest net growth first."""
+        today = datetime.now(timezone.utc).date()
+        result = []
+        for company in companies or sorted(self._companies):
+            state = self._companies.get(company)
+            if state is None:
+                continue
+            interval = self.poll_interval_hours(company)
+            if teams:
+                for team, aggregate in sorted(state["teams"].items()):
+                    result.append(self._trend(f"{company}/{team}", aggregate, today, window_days, interval))
+            else:
+                result.append(self._trend(company, state["total"], today, window_days, interval))
+        return sorted(result, key=lambda trend: (trend.net, trend.new), reverse=True)
+
+    def _trend(self, name: str, aggregate: Dict[str, Any], today: date, window_days: int, interval: float) -> Trend:
+        new, closed = self._window_counts(aggregate, today, window_days)
+        previous_new, _ = self._window_counts(aggregate, today - timedelta(days=window_days), window_days)
+        return Trend(name, aggregate["open"], new, closed, previous_new,
+                     _median_from_histogram(aggregate["durations"]), interval)
+
+    def _window_counts(self, aggregate: Dict[str, Any], end: date, window_days: int):
+        start = (end - timedelta(days=window_days)).isoformat()
+        counts = [counts for day, counts in aggregate["days"].items() if start < day <= end.isoformat()]
+        return sum(count[0] for count in counts), sum(count[1] for count in counts)
+
+    def open_count(self, company: str) -> int:
+        state = self._companies.get(company)
+        return state["total"]["open"] if state else 0
+
+    def poll_interval_hours(self, company: str, window_days: int = TREND_WINDOW_DAYS) -> float:
+        """Hours between polls of a board, shorter the more postings it opens and closes per day."""
+        state = self._companies.get(company)
+        if state is None:
+            return MIN_POLL_INTERVAL_HOURS
+        new, closed = self._window_counts(state["total"], datetime.now(timezone.utc).date(), window_days)
+        changes_per_day = (new + closed) / window_days
+        return min(MAX_POLL_INTERVAL_HOURS, max(MIN_POLL_INTERVAL_HOURS, 24 / (1 + changes_per_day)))
+
+    def is_due(self, company: str, now: Optional[datetime] = None) -> bool:
+        """Whether a board's poll interval has passed since its last recorded run."""
+        state = self._companies.get(company)
+        if state is None or "last_run" not in state:
+            return True
+        now = now or datetime.now(timezone.utc)
+        elapsed = now - datetime.fromisoformat(state["last_run"])
+        return elapsed >= timedelta(hours=self.poll_interval_hours(company))
+
+    # --- Persistence ---
+
+    def close(self):
+        if self._dirty:
+            self.save()
+
+    def save(self):
+        cutoff = (datetime.now(timezone.utc).date() - timedelta(days=self.retention_days)).isoformat()
+        for state in self._companies.values():
+            for aggregate in [state["total"], *state["teams"].values()]:
+                aggregate["days"] = {day: counts for day, counts in aggregate["days"].items() if day >= cutoff}
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            with open(self.path, "w") as f:
+                json.dump(self._companies, f)
+            self._dirty = False
+        except IOError as e:
+            print(f"Warning: Could not save trends: {e}")
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        try:
+            with open(self.path, "r") as f:
+                return json.load(f)
+        except (json.JSONDecodeError, IOError):
+            return {}
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(prog="scraper.py stats", description="Show hiring trends per company.")
+    parser.add_argument("companies", nargs="*", help="companies to show (default: all tracked)")
+    parser.add_argument("--teams", action="store_true", help="break trends down by team")
+    parser.add_argument("--window", type=int, default=TREND_WINDOW_DAYS, metavar="DAYS",
+                        help=f"days to compare (default: {TREND_WINDOW_DAYS})")
+    args = parser.parse_args(argv)
+
+    trends = TrendStore().trends(args.window, teams=args.teams, companies=args.companies or None)
+    if not trends:
+        print("No trends yet; they are collected on every scrape.")
+        return
+
+    print(f"{'':2}{'company':32} {'open':>5} {'new':>5} {'closed':>6} {'net':>5} "
+          f"{'prev new':>8} {'median days':>11} {'poll every':>10}")
+    for trend in trends:
+        median = "-" if trend.median_days_open is None else f"{trend.median_days_open:g}"
+        print(f"{'+' if trend.ramping_up else ' ':2}{trend.name:32} {trend.open:5d} {trend.new:5d} "
+              f"{trend.closed:6d} {trend.net:+5d} {trend.previous_new:8d} {median:>11} "
+              f"{trend.poll_interval_hours:9.1f}h")
+    print(f"\nnew/closed/net over the last {args.window} days, prev new over the {args.window} days before; "
+          f"+ marks companies ramping up")
@@ -0,0 +1,91 @@
+# bench_decode.py
+"""Compares the typed msgspec decoder with the pure-Python json path.
+
+Builds a synthetic payload per ATS (with the large unused fields real boards
+return), checks both backends produce the same postings, and times each.
+
+Run from the repo root: python3 benchmarks/bench_decode.py [postings per board]
+"""
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from company_configs import load_company_configs
+from scraper import JobScraper
+
+RUNS = 5
+DESCRIPTION = "<p>" + "We are hiring engineers to build great things. " * 40 + "</p>"
+CITIES = ["Vancouver, BC", "Toronto, ON", "Remote - Canada", "San Francisco, CA", "Burnaby"]
+
+
+def make_payload(parser_key: str, count: int) -> bytes:
+    if parser_key == "workday":
+        data = {"total": count, "jobPostings": [
+            {"title": f"Software Developer {i}", "externalPath": f"/job/{i}", "locationsText": CITIES[i % 5],
+             "postedOn": f"Posted {i % 30} Days Ago", "bulletFields": [f"R{i}"]} for i in range(count)],
+            "facets": [{"facetParameter": "locations", "values": [{"id": str(i), "descriptor": c} for i, c in enumerate(CITIES)]}]}
+    elif parser_key == "greenhouse":
+        data = {"jobs": [
+            {"id": i, "title": f"Software Developer {i}", "absolute_url": f"https://example.com/{i}",
+             "location": {"name": CITIES[i % 5]}, "first_published": "2026-10-01T10:00:00-04:00",
+             "updated_at": "2026-10-02T10:00:00-04:00", "requisition_id": f"REQ-{i}", "content": DESCRIPTION,
+             "metadata": [{"id": 1, "name": "Team", "value": "Platform"}], "data_compliance": []} for i in range(count)],
+            "meta": {"total": count}}
+    elif parser_key == "lever":
+        data = [
+            {"id": f"lever-{i}", "text": f"Software Developer {i}", "applyUrl": f"https://example.com/{i}",
+             "categories": {"location": CITIES[i % 5], "team": "Engineering", "commitment": "Full-time"},
+             "createdAt": 1760000000000 + i, "description": DESCRIPTION, "descriptionPlain": DESCRIPTION,
+             "lists": [{"text": "Requirements", "content": DESCRIPTION}]} for i in range(count)]
+    elif parser_key == "ashbyhq":
+        data = {"data": {"jobBoard": {"jobPostings": [
+            {"id": f"ashby-{i}", "title": f"Software Developer {i}", "teamId": "team-1" if i % 2 else "team-2",
+             "locationId": f"loc-{i % 5}", "locationName": CITIES[i % 5], "workplaceType": "Hybrid",
+             "compensationTierSummary": "$100K - $150K"} for i in range(count)]}}}
+    else:
+        data = {"totalCount": count, "jobs": [
+            {"data": {"req_id": f"{i}", "title": f"Software Developer {i}", "location_name": CITIES[i % 5],
+                      "posted_date": "2026-10-01T10:00:00+0000", "description": DESCRIPTION}} for i in range(count)]}
+    return json.dumps(data).encode()
+
+
+def comparable(jobs):
+    # relative dates ("Posted 3 Days Ago") resolve against now(), so compare them to the minute
+    return [(job.job_id, job.title, job.location, job.url,
+             job.posted_date.replace(second=0, microsecond=0) if job.posted_date else None) for job in jobs]
+
+
+def time_backend(scraper: JobScraper, name: str, config, payload: bytes) -> float:
+    start = time.perf_counter()
+    for _ in range(RUNS):
+        scraper._decode_and_parse(name, config, payload)
+    return (time.perf_counter() - start) / RUNS * 1000
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    configs = load_company_configs(["clio", "stripe", "xero", "jane", "github"])
+    configs["jane"].team_id = "team-1"
+
+    python_scraper = JobScraper({}, decoder="python")
+    typed_scraper = JobScraper({}, decoder="msgspec")
+    if typed_scraper.decoder is None:
+        print("Install msgspec to run the decode benchmark: pip install msgspec")
+        sys.exit(1)
+
+    print(f"{'board':<12}{'payload':>10}{'postings':>10}{'python ms':>12}{'msgspec ms':>12}{'speedup':>9}")
+    for name, config in configs.items():
+        payload = make_payload(config.parser_key, count)
+        python_jobs = python_scraper._decode_and_parse(name, config, payload)
+        typed_jobs = typed_scraper._decode_and_parse(name, config, payload)
+        if comparable(python_jobs) != comparable(typed_jobs):
+            print(f"Mismatch for {name}: {len(python_jobs)} vs {len(typed_jobs)} postings")
+            sys.exit(1)
+
+        python_ms = time_backend(python_scraper, name, config, payload)
+        typed_ms = time_backend(typed_scraper, name, config, payload)
+        print(f"{config.parser_key:<12}{len(payload) // 1024:>8}KB{len(typed_jobs):>10}"
+              f"{python_ms:>12.2f}{typed_ms:>12.2f}{python_ms / typed_ms:>8.1f}x")
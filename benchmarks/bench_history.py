@@ -0,0 +1,68 @@
+# bench_history.py
+"""Times history queries over a synthetic archive.
+
+Writes six months of daily runs for 50 companies (about 200 open postings
+each, a few opening and closing every day) to a temporary directory, then
+times `open_at` and `churn` over all of it.
+
+Run from the repo root: python3 benchmarks/bench_history.py [companies] [days]
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from history import HistoryArchive
+from models import JobPosting
+
+RUNS = 5
+OPEN_POSTINGS = 200
+CITIES = ["Vancouver, BC", "Toronto, ON", "Remote - Canada", "San Francisco, CA", "Burnaby"]
+
+
+def build_archive(archive: HistoryArchive, companies: int, days: int):
+    rng = random.Random(0)
+    start = datetime.now(timezone.utc) - timedelta(days=days)
+    for company_index in range(companies):
+        company = f"company{company_index}"
+        next_id = 0
+        # job id -> last day it is listed
+        open_until = {}
+        for day in range(days):
+            # a few short-lived postings and a few long-lived ones every day
+            for _ in range(rng.randint(0, 2) + (OPEN_POSTINGS if day == 0 else 0)):
+                open_until[next_id] = day + rng.randint(1, 7) if rng.random() < 0.5 else day + rng.randint(30, 200)
+                next_id += 1
+            open_until = {job_id: last for job_id, last in open_until.items() if last >= day}
+            jobs = [JobPosting(company=company, job_id=str(job_id), title=f"Software Developer {job_id}",
+                               location=CITIES[job_id % 5], url=f"https://example.com/{company}/{job_id}",
+                               posted_date=start + timedelta(days=day))
+                    for job_id in sorted(open_until)]
+            archive.record(company, jobs, when=start + timedelta(days=day, hours=12))
+
+
+def timed(query) -> float:
+    start = time.perf_counter()
+    for _ in range(RUNS):
+        result = query()
+    return (time.perf_counter() - start) / RUNS * 1000, result
+
+
+if __name__ == "__main__":
+    companies = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    days = int(sys.argv[2]) if len(sys.argv) > 2 else 180
+    with tempfile.TemporaryDirectory() as root:
+        archive = HistoryArchive(os.path.join(root, "history"))
+        started = time.perf_counter()
+        build_archive(archive, companies, days)
+        print(f"built {companies} companies x {days} days in {time.perf_counter() - started:.1f} s")
+
+        middle = (datetime.now(timezone.utc) - timedelta(days=days // 2)).date()
+        open_ms, jobs = timed(lambda: archive.open_at("company0", middle))
+        churn_ms, churned = timed(lambda: archive.churn(7))
+        print(f"open_at: {open_ms:8.2f} ms ({len(jobs)} postings)")
+        print(f"churn:   {churn_ms:8.2f} ms ({len(churned)} postings)")
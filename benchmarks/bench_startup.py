@@ -0,0 +1,55 @@
+# bench_startup.py
+"""Measures CLI startup for a single-company run against a small time budget.
+
+Run from the repo root: python3 benchmarks/bench_startup.py [company]
+"""
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RUNS = 10
+
+# Budgets in milliseconds for a single-company run, measured before any request is sent
+CONFIG_LOAD_BUDGET_MS = 10
+STARTUP_BUDGET_MS = 250
+
+
+def time_in_process(company: str) -> float:
+    sys.path.insert(0, REPO_DIR)
+    from company_configs import load_company_configs
+
+    load_company_configs([company])  # builds the index on first use
+    samples = []
+    for _ in range(RUNS):
+        start = time.perf_counter()
+        load_company_configs([company])
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def time_subprocess(company: str) -> float:
+    code = ("import scraper; configs = scraper.load_company_configs([%r]); "
+            "scraper.JobScraper(configs)._open_transport(len(configs))" % company)
+    samples = []
+    for _ in range(RUNS):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", code], cwd=REPO_DIR, check=True)
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+if __name__ == "__main__":
+    company = sys.argv[1] if len(sys.argv) > 1 else "jane"
+
+    config_ms = time_in_process(company)
+    startup_ms = time_subprocess(company)
+
+    print(f"Config load for {company}: {config_ms:.2f} ms (budget {CONFIG_LOAD_BUDGET_MS} ms)")
+    print(f"Process startup to first request: {startup_ms:.1f} ms (budget {STARTUP_BUDGET_MS} ms)")
+
+    if config_ms > CONFIG_LOAD_BUDGET_MS or startup_ms > STARTUP_BUDGET_MS:
+        print("Startup budget exceeded")
+        sys.exit(1)
@@ -0,0 +1,74 @@
+# bench_transport.py
+"""Compares the HTTP/2 transport with the requests HTTP/1.1 session on real boards.
+
+Fetches the configured boards concurrently, as a run does, several times per
+transport. Reports the first (cold) sweep, which includes connection setup,
+and the median of the warm sweeps. Needs network access, and httpx[http2]
+for the HTTP/2 side.
+
+Run from the repo root: python3 benchmarks/bench_transport.py [company ...] [--rounds N]
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import requests
+from company_configs import load_company_configs
+from constants import DEFAULT_FETCH_WORKERS, REQUEST_TIMEOUT_SECONDS
+from transport import ACCEPT_ENCODING, Http2Transport, SessionTransport, load_httpx
+
+
+def fetch(transport, config):
+    body = config.body if config.http_method.upper() == "POST" else None
+    try:
+        return len(transport.request(config.http_method, config.api_url, body, timeout=REQUEST_TIMEOUT_SECONDS))
+    except requests.exceptions.RequestException:
+        return None
+
+
+def sweep(transport, configs, workers):
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        sizes = list(executor.map(lambda config: fetch(transport, config), configs))
+    elapsed = time.perf_counter() - start
+    return elapsed, sum(size for size in sizes if size), sizes.count(None)
+
+
+def bench(transport, configs, rounds, workers):
+    results = [sweep(transport, configs, workers) for _ in range(rounds)]
+    transport.close()
+    cold = results[0][0] * 1000
+    warm = statistics.median(result[0] for result in results[1:]) * 1000 if rounds > 1 else cold
+    _, received, errors = results[-1]
+    line = (f"{transport.name:8s} {cold:10.0f} {warm:10.0f} {received / 1024:10.0f}KB {errors:7d}")
+    versions = getattr(transport, "http_versions", None)
+    if versions:
+        line += "   " + ", ".join(f"{version} x{count}" for version, count in versions.most_common())
+    print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("companies", nargs="*", help="boards to fetch (default: all configured companies)")
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--workers", type=int, default=DEFAULT_FETCH_WORKERS)
+    args = parser.parse_args()
+
+    configs = list(load_company_configs(args.companies or None).values())
+    print(f"{len(configs)} boards, {args.rounds} rounds, {args.workers} concurrent fetches, "
+          f"Accept-Encoding: {ACCEPT_ENCODING}")
+    print(f"{'':8s} {'cold ms':>10s} {'warm ms':>10s} {'received':>12s} {'errors':>7s}")
+    bench(SessionTransport(max_connections=args.workers), configs, args.rounds, args.workers)
+    if load_httpx() is None:
+        print('http2    skipped: pip install "httpx[http2]"')
+    else:
+        bench(Http2Transport(max_connections=args.workers), configs, args.rounds, args.workers)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,449 @@
+# cluster.py
+"""Coordinator/worker mode for sweeping many boards with many workers.
+
+`scraper.py coordinate` splits the selected companies into shards and writes
+them to a file-backed queue. `scraper.py worker` processes, on this machine or
+any machine sharing the queue directory, claim shards, fetch and parse them and
+write back posting batches. The coordinator merges the batches into the usual
+outputs, history and trends.
+
+Queue layout (one directory per sweep):
+
+  <queue>/<run>/pending/<shard>.json   shards waiting for a worker
+  <queue>/<run>/leased/<shard>.json    claimed shards; the worker touches the file as a heartbeat
+  <queue>/<run>/done/<shard>.json      finished shards
+  <queue>/<run>/failed/<shard>.json    shards that ran out of attempts
+  <queue>/<run>/results/<shard>.ndjson one line per company: parsed count, fresh and parsed postings,
+                                       or {"failed": true} for a board that failed to fetch or parse
+
+Every state change is an atomic rename, so exactly one worker wins a claim. A
+lease whose heartbeat is older than the lease time is requeued, so shards of a
+dead worker are retried elsewhere; if the original worker finishes after all,
+its rename fails and the result is dropped.
+
+The coordinator gives up on the remaining shards when nothing in the queue has
+changed (no claim, heartbeat or finished shard) for a lease time after its local
+workers exited, or for --idle-timeout when it started none. Workers don't keep
+last results of their own; the coordinator saves the merged ones.
+"""
+import argparse
+import heapq
+import json
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+from company_configs import CompanyConfig, load_company_configs
+from constants import (COORDINATOR_IDLE_TIMEOUT_SECONDS, COST_POSTINGS_PER_REQUEST, DEFAULT_FETCH_WORKERS,
+                       LEASE_SECONDS, MAX_SHARD_ATTEMPTS, PIPELINE_QUEUE_SIZE, QUEUE_DIR, SHARDS_PER_WORKER)
+from models import JobPosting
+
+STATES = ("pending", "leased", "done", "failed", "results")
+POLL_SECONDS = 0.5
+SCRAPER_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "scraper.py")
+
+
+def plan_shards(configs: Dict[str, CompanyConfig], costs: Dict[str, float], shard_count: int) -> List[List[str]]:
+    """Splits companies into about `shard_count` shards of similar cost, keeping each host's boards together.
+
+    A host whose boards cost more than one shard's share is split, so one busy
+    host (e.g. boards-api.greenhouse.io) still spreads over several workers.
+    """
+    by_host: Dict[str, List[str]] = defaultdict(list)
+    for name, config in configs.items():
+        by_host[urlparse(config.api_url).netloc].append(name)
+
+    total = sum(costs[name] for name in configs) or 1
+    target = total / max(shard_count, 1)
+
+    # Units of work that must stay together: a host's boards, cut at the target cost
+    units: List[List[str]] = []
+    for names in by_host.values():
+        unit, unit_cost = [], 0.0
+        for name in sorted(names, key=lambda name: costs[name], reverse=True):
+            if unit and unit_cost + costs[name] > target:
+                units.append(unit)
+                unit, unit_cost = [], 0.0
+            unit.append(name)
+            unit_cost += costs[name]
+        units.append(unit)
+
+    # Longest-first onto the cheapest shard
+    shards: List[List[Any]] = [[0.0, index, []] for index in range(min(shard_count, len(units)) or 1)]
+    for unit in sorted(units, key=lambda unit: sum(costs[name] for name in unit), reverse=True):
+        shard = heapq.heappop(shards)
+        shard[0] += sum(costs[name] for name in unit)
+        shard[2].extend(unit)
+        heapq.heappush(shards, shard)
+    return [shard[2] for shard in sorted(shards, key=lambda shard: shard[1]) if shard[2]]
+
+
+class WorkQueue:
+    def __init__(self, directory: str, lease_seconds: float = LEASE_SECONDS,
+                 max_attempts: int = MAX_SHARD_ATTEMPTS):
+        self.directory = directory
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+
+    def _path(self, state: str, shard_id: str, extension: str = ".json") -> str:
+        return os.path.join(self.directory, state, f"{shard_id}{extension}")
+
+    def _ids(self, state: str) -> List[str]:
+        try:
+            return sorted(os.path.splitext(name)[0] for name in os.listdir(os.path.join(self.directory, state))
+                          if not name.startswith("."))
+        except FileNotFoundError:
+            return []
+
+    # --- Coordinator side ---
+
+    def create(self, shards: List[List[str]]):
+        for state in STATES:
+            os.makedirs(os.path.join(self.directory, state), exist_ok=True)
+        for index, companies in enumerate(shards):
+            shard_id = f"shard-{index:05d}"
+            self._write(self._path("pending", shard_id), {"id": shard_id, "companies": companies, "attempts": 0})
+
+    def requeue_expired(self) -> List[str]:
+        """Returns expired leases to pending (or failed, after max_attempts); returns their ids."""
+        expired = []
+        now = time.time()
+        for shard_id in self._ids("leased"):
+            path = self._path("leased", shard_id)
+            try:
+                if now - os.path.getmtime(path) < self.lease_seconds:
+                    continue
+                # Taking the lease away is one rename, so it either beats a late finish or loses to it
+                revoked = self._path("leased", f".{shard_id}.revoked")
+                os.rename(path, revoked)
+            except FileNotFoundError:
+                continue
+            shard = self._read(revoked)
+            shard["attempts"] += 1
+            state = "failed" if shard["attempts"] >= self.max_attempts else "pending"
+            self._write(revoked, shard)
+            os.rename(revoked, self._path(state, shard_id))
+            print(f"Lease on {shard_id} expired; moved to {state}")
+            expired.append(shard_id)
+        return expired
+
+    def finished(self) -> bool:
+        return not self._ids("pending") and not self._ids("leased")
+
+    def counts(self) -> Dict[str, int]:
+        return {state: len(self._ids(state)) for state in STATES}
+
+    def results(self) -> List[Dict[str, Any]]:
+        batches = []
+        for shard_id in self._ids("results"):
+            with open(self._path("results", shard_id, ".ndjson"), "r") as f:
+                batches.extend(json.loads(line) for line in f if line.strip())
+        return batches
+
+    def activity(self) -> Tuple[Tuple[int, ...], float]:
+        """Shard counts per state and the newest lease heartbeat; changes whenever a worker makes progress."""
+        heartbeats = [0.0]
+        for shard_id in self._ids("leased"):
+            try:
+                heartbeats.append(os.path.getmtime(self._path("leased", shard_id)))
+            except FileNotFoundError:
+                continue
+        return tuple(self.counts().values()), max(heartbeats)
+
+    def companies_in(self, *states: str) -> List[str]:
+        companies = []
+        for state in states:
+            for shard_id in self._ids(state):
+                try:
+                    companies.extend(self._read(self._path(state, shard_id))["companies"])
+                except FileNotFoundError:
+                    continue  # moved on since the listing
+        return companies
+
+    def failed_companies(self) -> List[str]:
+        return self.companies_in("failed")
+
+    # --- Worker side ---
+
+    def claim(self) -> Optional[Dict[str, Any]]:
+        """Moves a pending shard to leased for this worker; None when nothing is pending."""
+        for shard_id in self._ids("pending"):
+            leased = self._path("leased", shard_id)
+            try:
+                os.rename(self._path("pending", shard_id), leased)
+            except FileNotFoundError:
+                continue  # another worker claimed it first
+            try:
+                # rename keeps the old mtime; start the lease clock now
+                os.utime(leased)
+                return self._read(leased)
+            except FileNotFoundError:
+                continue  # revoked as stale before the clock was reset
+        return None
+
+    def heartbeat(self, shard_id: str) -> bool:
+        try:
+            os.utime(self._path("leased", shard_id))
+            return True
+        except FileNotFoundError:
+            return False
+
+    def complete(self, shard_id: str, batches: List[Dict[str, Any]]) -> bool:
+        """Publishes a shard's results if this worker still holds its lease."""
+        staged = self._path("results", f".{shard_id}.tmp", "")
+        with open(staged, "w") as f:
+            f.write("".join(json.dumps(batch) + "\n" for batch in batches))
+        try:
+            os.rename(self._path("leased", shard_id), self._path("done", shard_id))
+        except FileNotFoundError:
+            # the lease expired and the shard was handed to another worker
+            os.remove(staged)
+            return False
+        os.replace(staged, self._path("results", shard_id, ".ndjson"))
+        return True
+
+    def _read(self, path: str) -> Dict[str, Any]:
+        with open(path, "r") as f:
+            return json.load(f)
+
+    def _write(self, path: str, data: Dict[str, Any]):
+        # hidden, so listings never see a half-written file
+        staged = os.path.join(os.path.dirname(path), f".{os.path.basename(path)}.tmp")
+        with open(staged, "w") as f:
+            json.dump(data, f)
+        os.replace(staged, path)
+
+
+class _Heartbeat(threading.Thread):
+    """Keeps a shard's lease alive while the worker processes it."""
+
+    def __init__(self, queue: WorkQueue, shard_id: str):
+        super().__init__(daemon=True)
+        self.queue = queue
+        self.shard_id = shard_id
+        self.stopped = threading.Event()
+
+    def run(self):
+        while not self.stopped.wait(self.queue.lease_seconds / 3):
+            if not self.queue.heartbeat(self.shard_id):
+                return
+
+    def stop(self):
+        self.stopped.set()
+        self.join()
+
+
+class _ParsedCollector:
+    """Snapshot store that keeps each board's parsed postings for the result batch."""
+
+    def __init__(self):
+        self.parsed: Dict[str, List[JobPosting]] = {}
+
+    def record(self, company: str, jobs: List[JobPosting]):
+        self.parsed[company] = jobs
+
+    def close(self):
+        pass
+
+
+def process_shard(shard: Dict[str, Any], args: argparse.Namespace) -> List[Dict[str, Any]]:
+    """Fetches and parses a shard's boards; returns one batch per fetched company."""
+    from scraper import JobScraper
+
+    configs = load_company_configs(shard["companies"])
+    collector = _ParsedCollector()
+    # The coordinator saves the merged last results; workers sharing a directory mustn't race on the file
+    scraper = JobScraper(configs, parse_workers=args.parse_workers, decoder=args.decoder,
+                         fetch_workers=args.fetch_workers, snapshots=[collector], transport=args.transport,
+                         queue_size=args.queue_size, last_results_file=None)
+    fresh_by_company: Dict[str, List[JobPosting]] = defaultdict(list)
+    with scraper:
+        for job in scraper.run():
+            fresh_by_company[job.company].append(job)
+
+    batches = [{"company": company,
+                "parsed_count": len(parsed),
+                "fresh": [job.to_dict() for job in fresh_by_company.get(company, [])],
+                "parsed": [job.to_dict() for job in parsed]}
+               for company, parsed in collector.parsed.items()]
+    # boards whose fetch or parse failed (or that have no config) still get a batch, so the coordinator reports them
+    batches.extend({"company": company, "failed": True}
+                   for company in shard["companies"] if company not in collector.parsed)
+    return batches
+
+
+def run_worker(queue: WorkQueue, args: argparse.Namespace) -> int:
+    """Claims and processes shards until the queue is drained; returns the number processed."""
+    processed = 0
+    while True:
+        shard = queue.claim()
+        if shard is None:
+            if args.exit_when_idle or queue.finished():
+                return processed
+            time.sleep(POLL_SECONDS)
+            continue
+
+        print(f"[{args.id}] Claimed {shard['id']} ({len(shard['companies'])} companies)")
+        heartbeat = _Heartbeat(queue, shard["id"])
+        heartbeat.start()
+        try:
+            batches = process_shard(shard, args)
+        except Exception as e:
+            # Leave the lease to expire, so the shard is retried (elsewhere) up to MAX_SHARD_ATTEMPTS
+            print(f"[{args.id}] Error processing {shard['id']}: {e}")
+            continue
+        finally:
+            heartbeat.stop()
+        if queue.complete(shard["id"], batches):
+            processed += 1
+        else:
+            print(f"[{args.id}] Lost the lease on {shard['id']}; its result was dropped")
+
+
+def worker_main(argv: Optional[List[str]] = None):
+    from decoders import DECODER_BACKENDS
+    from transport import TRANSPORTS
+
+    parser = argparse.ArgumentParser(prog="scraper.py worker", description="Process shards from a coordinator's queue.")
+    parser.add_argument("queue", help="the sweep directory printed by `scraper.py coordinate`")
+    parser.add_argument("--id", default=f"{socket.gethostname()}-{os.getpid()}", help="worker name shown in leases")
+    parser.add_argument("--exit-when-idle", action="store_true",
+                        help="exit as soon as no shard is pending, instead of waiting for the sweep to finish")
+    parser.add_argument("--fetch-workers", type=int, default=DEFAULT_FETCH_WORKERS, metavar="N")
+    parser.add_argument("--parse-workers", type=int, default=0, metavar="N")
+    parser.add_argument("--queue-size", type=int, default=PIPELINE_QUEUE_SIZE, metavar="N")
+    parser.add_argument("--decoder", choices=DECODER_BACKENDS, default="auto")
+    parser.add_argument("--transport", choices=TRANSPORTS, default="auto")
+    parser.add_argument("--lease", type=float, default=LEASE_SECONDS, metavar="SECONDS",
+                        help=f"lease time; must match the coordinator's (default: {LEASE_SECONDS:g})")
+    args = parser.parse_args(argv)
+
+    processed = run_worker(WorkQueue(args.queue, lease_seconds=args.lease), args)
+    print(f"[{args.id}] Processed {processed} shard(s)")
+
+
+def wait_for_sweep(queue: WorkQueue, local: List[subprocess.Popen], idle_timeout: float) -> bool:
+    """Requeues expired leases until every shard is done or failed; returns False if the sweep stalled.
+
+    A sweep has stalled once no local worker is running and the queue hasn't
+    changed (no claim, heartbeat or finished shard) for `idle_timeout` seconds.
+    """
+    last_activity, idle_since = None, time.monotonic()
+    while not queue.finished():
+        queue.requeue_expired()
+        activity = queue.activity()
+        if activity != last_activity:
+            last_activity, idle_since = activity, time.monotonic()
+        elif (all(process.poll() is not None for process in local)
+              and time.monotonic() - idle_since >= idle_timeout):
+            counts = queue.counts()
+            print(f"\n--- No worker has made progress for {idle_timeout:g}s; giving up on "
+                  f"{counts['pending']} pending and {counts['leased']} leased shards ---")
+            return False
+        time.sleep(POLL_SECONDS)
+    return True
+
+
+def coordinate_main(argv: Optional[List[str]] = None):
+    from analytics import TrendStore
+    from history import HistoryArchive
+    from scraper import build_parser, save_last_results, select_configs, validate_args
+    from sinks import open_sink
+
+    parser = build_parser("Shard a sweep over a work queue and merge the workers' results.")
+    parser.add_argument("--queue-dir", default=QUEUE_DIR, metavar="DIR",
+                        help=f"shared directory for sweep queues (default: {QUEUE_DIR})")
+    parser.add_argument("--workers", type=int, default=1, metavar="N",
+                        help="expected number of workers, used to size the shards (default: 1)")
+    parser.add_argument("--local-workers", type=int, default=0, metavar="N",
+                        help="also start N worker processes on this machine")
+    parser.add_argument("--lease", type=float, default=LEASE_SECONDS, metavar="SECONDS",
+                        help=f"seconds without a heartbeat before a shard is retried (default: {LEASE_SECONDS:g})")
+    parser.add_argument("--idle-timeout", type=float, default=COORDINATOR_IDLE_TIMEOUT_SECONDS, metavar="SECONDS",
+                        help="without local workers, give up when no worker has claimed, renewed or finished a "
+                             f"shard for this long (default: {COORDINATOR_IDLE_TIMEOUT_SECONDS:g})")
+    args = validate_args(parser, parser.parse_args(argv))
+    # Per-run options that have no meaning for a sweep spread over separate worker processes
+    unsupported = [flag for flag, value in (("--deadline", args.deadline), ("--profile", args.profile)) if value]
+    if unsupported:
+        parser.error(f"{' and '.join(unsupported)} can't be used with coordinate")
+
+    trends = TrendStore()
+    configs = select_configs(args, trends)
+    costs = {name: 1 + trends.open_count(name) / COST_POSTINGS_PER_REQUEST for name in configs}
+    workers = max(args.workers, args.local_workers, 1)
+    shards = plan_shards(configs, costs, workers * SHARDS_PER_WORKER)
+
+    run_dir = os.path.join(args.queue_dir, datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S"))
+    queue = WorkQueue(run_dir, lease_seconds=args.lease)
+    queue.create(shards)
+    print(f"--- Queued {len(configs)} companies in {len(shards)} shards at {run_dir} ---")
+    print(f"Start workers with: python3 scraper.py worker {run_dir}")
+
+    local = [subprocess.Popen([sys.executable, SCRAPER_SCRIPT, "worker", run_dir,
+                               "--id", f"{socket.gethostname()}-local{index}", "--lease", str(args.lease),
+                               "--fetch-workers", str(args.fetch_workers),
+                               "--parse-workers", str(args.parse_workers),
+                               "--queue-size", str(args.queue_size), "--decoder", args.decoder,
+                               "--transport", args.transport])
+             for index in range(args.local_workers)]
+
+    started = time.monotonic()
+    finished = False
+    try:
+        finished = wait_for_sweep(queue, local, idle_timeout=args.lease if local else args.idle_timeout)
+    finally:
+        for process in local:
+            if not finished:
+                process.terminate()
+            process.wait()
+    counts = queue.counts()
+    print(f"\n--- Sweep {'finished' if finished else 'stopped'} in {time.monotonic() - started:.1f}s: "
+          f"{counts['done']} shards done, {counts['failed']} failed ---")
+    for company in queue.failed_companies():
+        print(f"  - {company.title()}: failed after {MAX_SHARD_ATTEMPTS} attempts")
+    unfinished = [] if finished else queue.companies_in("pending", "leased")
+    for company in unfinished:
+        print(f"  - {company.title()}: not processed, no worker picked it up")
+
+    sinks = [open_sink(path) for path in args.output]
+    snapshots = ([HistoryArchive()] if args.history else []) + ([trends] if args.trends else [])
+    fresh_by_company: Dict[str, List[JobPosting]] = {}
+    failed_boards: List[str] = []
+    try:
+        for batch in queue.results():
+            if batch.get("failed"):
+                failed_boards.append(batch["company"])
+                continue
+            for store in snapshots:
+                store.record(batch["company"], [JobPosting.from_dict(job) for job in batch["parsed"]])
+            fresh = [JobPosting.from_dict(job) for job in batch["fresh"]]
+            for sink in sinks:
+                for job in fresh:
+                    sink.write(job)
+            fresh_by_company[batch["company"]] = fresh
+    finally:
+        for sink in sinks:
+            sink.close()
+        for store in snapshots:
+            store.close()
+    save_last_results(fresh_by_company)
+    fresh_jobs = [job for jobs in fresh_by_company.values() for job in jobs]
+
+    if failed_boards:
+        print(f"\n--- {len(failed_boards)} board(s) failed to fetch or parse (see the worker logs) ---")
+        for company in failed_boards:
+            print(f"  - {company.title()}")
+
+    print(f"\n Found {len(fresh_jobs)} new, relevant jobs")
+    if not sinks:
+        for job in fresh_jobs:
+            print(f"  - {job.title} at {job.company.title()} ({job.location}) | ID: {job.job_id}")
+    if unfinished:
+        sys.exit(f"Sweep incomplete: {len(unfinished)} companies were not processed")
@@ -0,0 +1,93 @@
+# coalescing.py
+"""Single-flight request coalescing for board fetches.
+
+Configs that differ only in client-side filtering (e.g. two companies or
+profiles reading the same Greenhouse board) send identical requests. The
+coalescer keys each request on its normalized method, URL and body, sends each
+distinct request once per run, and hands the same response body to every
+caller. Callers that ask while the request is in flight wait for it instead of
+sending their own.
+
+A response is only kept while callers are still expected for it: the scraper
+says up front how many boards send each request, and the entry is dropped once
+the last of them has read it. Requests nobody announced (paged feeds, Workday
+boards with resolved facets) are shared only with callers that arrive while
+they are in flight, so finished responses don't pile up over a run.
+"""
+import json
+import threading
+from typing import Any, Callable, Dict, Mapping, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+RequestKey = Tuple[str, str, str]
+
+
+def request_key(method: str, url: str, body: Optional[Any] = None) -> RequestKey:
+    """Normalizes a request so equivalent ones compare equal.
+
+    The scheme and host are lowercased, query parameters sorted, the fragment
+    dropped, and JSON bodies serialized with sorted keys.
+    """
+    parts = urlsplit(url)
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    normalized_url = urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path or "/", query, ""))
+    normalized_body = "" if body is None else json.dumps(body, sort_keys=True, separators=(",", ":"))
+    return method.upper(), normalized_url, normalized_body
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Optional[bytes] = None
+        self.error: Optional[BaseException] = None
+
+
+class RequestCoalescer:
+    def __init__(self, send: Callable[[str, str, Optional[Any]], bytes],
+                 expected: Optional[Mapping[RequestKey, int]] = None):
+        self._send = send
+        self._calls: Dict[RequestKey, _Call] = {}
+        # key -> callers still to come; a response is dropped once none are left
+        self._expected: Dict[RequestKey, int] = dict(expected or {})
+        self._lock = threading.Lock()
+        self.sent = 0
+        self.coalesced = 0
+
+    def fetch(self, method: str, url: str, body: Optional[Any] = None) -> bytes:
+        """Returns the response body, sending the request only if no equivalent one is in flight or kept."""
+        key = request_key(method, url, body)
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.sent += 1
+            else:
+                self.coalesced += 1
+            remaining = self._expected.pop(key, 0) - 1
+            if remaining > 0:
+                self._expected[key] = remaining
+            elif call.done.is_set():
+                self._release(key, call)
+
+        if leader:
+            try:
+                call.result = self._send(method, url, body)
+            except BaseException as e:
+                call.error = e
+            finally:
+                with self._lock:
+                    # Let later callers try again rather than replaying the failure all run
+                    if call.error is not None or key not in self._expected:
+                        self._release(key, call)
+                    call.done.set()
+        else:
+            call.done.wait()
+
+        if call.error is not None:
+            raise call.error
+        return call.result
+
+    def _release(self, key: RequestKey, call: _Call):
+        if self._calls.get(key) is call:
+            del self._calls[key]
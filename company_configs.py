@@ -1,6 +1,10 @@
-from typing import Dict, List, Any, Optional
-from dataclasses import dataclass
-from constants import JobPostingAgeKey
+import json
+import os
+import re
+import tomllib
+from typing import Dict, Iterable, List, Any, Optional, Tuple
+from dataclasses import dataclass, fields
+from constants import COMPANY_CONFIGS_FILE, COMPANY_CONFIGS_INDEX_FILE
 
 @dataclass
 class CompanyConfig:
@@ -14,701 +18,189 @@ class CompanyConfig:
     job_id_key: str = "bulletFields"
     job_age_key: str = "postedOn"
     career_page_url: Optional[str] = "No url available"
+    # Workday only: human-readable facet names resolved to IDs at run time, e.g. {"locationCountry": ["Canada"]}
+    facet_names: Optional[Dict[str, List[str]]] = None
 
-# Company configurations - add new companies here
-COMPANY_CONFIGS = {
-    # WORKDAY
-    "clio": CompanyConfig(
-        api_url="https://clio.wd3.myworkdayjobs.com/wday/cxs/clio/ClioCareerSite/jobs",
-        body={
-            "appliedFacets": {
-                "locations": [
-                    "1b6969fbfbca0101f164999ecea20000",
-                    "951c033a9bfe1000baf025938f160000",
-                    "29827a73287b01033875f6106f2c0000"
-                ],
-                "jobFamilyGroup": [
-                    "29827a73287b0103383979088de50000"
-                ]
-            },
-            "limit": 20,
-            "offset": 0,
-            "searchText": "Software+Developer"
-        },
-        job_age_key=JobPostingAgeKey.POSTED_ON,
-        career_page_url=""
-    ),
-    "crowdstrike": CompanyConfig(
-        api_url="https://crowdstrike.wd5.myworkdayjobs.com/wday/cxs/crowdstrike/crowdstrikecareers/jobs",
-        body={
-            "appliedFacets": {
-                "locationCountry": [
-                    "a30a87ed25634629aa6c3958aa2b91ea"
-                ],
-                "Job_Family": [
-                    "1408861ee6e201641be2c2f6b000c00b"
-                ],
-                "locations": [
-                    "27086a67c269015eef3a02793f019508"
-                ]
-            },
-            "limit": 20,
-            "offset": 0,
-            "searchText": ""
-        },
-        job_age_key=JobPostingAgeKey.POSTED_ON,
-        career_page_url="https://clio.wd3.myworkdayjobs.com/en-US/ClioCareerSite?locations=1b6969fbfbca0101f164999ecea20000&locations=951c033a9bfe1000baf025938f160000&locations=29827a73287b01033875f6106f2c0000&jobFamilyGroup=29827a73287b0103383979088de50000&workerSubType=29827a73287b0103383999ceb88b0000"
-    ),
-    "remitly": CompanyConfig(
-        api_url="https://remitly.wd5.myworkdayjobs.com/wday/cxs/remitly/Remitly_Careers/jobs",
-        body={
-            "appliedFacets": {
-                "locationCountry": [
-                    "a30a87ed25634629aa6c3958aa2b91ea"
-                ],
-                "jobFamilyGroup": [
-                    "c9699b32e2da1029a051260e906d0000"
-                ]
-            },
-            "limit": 20,
-            "offset": 0,
-            "searchText": "Software+Developer"
-        },
-        job_age_key=JobPostingAgeKey.POSTED_ON,
-        career_page_url="https://remitly.wd5.myworkdayjobs.com/en-US/Remitly_Careers?redirect=/Remitly_Careers/job/New-Westminster-British-Columbia-Canada/Identity---Trust-Investigation-Specialist-II_R_104597/apply?source=Remitly%2520Careers%2520Site&locationCountry=a30a87ed25634629aa6c3958aa2b91ea&locations=2458716c04a71002062e0e03eb960000&jobFamilyGroup=c9699b32e2da1029a051260e906d0000"
-    ),
-    "openlane": CompanyConfig(
-        api_url="https://kar.wd1.myworkdayjobs.com/wday/cxs/kar/OPENLANE_Careers/jobs",
-        body={
-            "appliedFacets": {
-                "jobFamilyGroup": [
-                    "1feabb51d74b0122d6b8a81cb700682d"
-                ],
-                "Location_Region_State_Province": [
-                    "cb76ca97a13347548a188f23caa96b17"
-                ],
-                "Location_Country": [
-                    "a30a87ed25634629aa6c3958aa2b91ea"
-                ]
-            },
-            "limit": 20,
-            "offset": 0,
-            "searchText": ""
-        },
-        job_age_key=JobPostingAgeKey.POSTED_ON
-    ),
-    "weirmotors": CompanyConfig(
-        api_url="https://weir.wd3.myworkdayjobs.com/wday/cxs/weir/Weir_External_Careers/jobs",
-        body={
-            "appliedFacets": {
-                "Country": [
-                    "a30a87ed25634629aa6c3958aa2b91ea"
-                ],
-                "Region_State_Province": [
-                    "cb76ca97a13347548a188f23caa96b17"
-                ],
-                "jobFamilyGroup": [
-                    "c8ebc28620ef01501164ed0d01011278"
-                ]
-            },
-            "limit": 20,
-            "offset": 0,
-            "searchText": "Software+Developer"
-        }
-    ),
-    "accolade": CompanyConfig(
-        api_url="https://osv-accolade.wd5.myworkdayjobs.com/wday/cxs/osv_accolade/External_Careers/jobs",
-        body={
-            "appliedFacets": {
-                "jobFamilyGroup": [
-                    "591060563623017f6db55ba7fd6b24f0"
-                ],
-                "primaryLocation": [
-                    "2f2b3b9e18dc0199117b8d94ec01725e"
-                ]
-            },
-            "limit": 20,
-            "offset": 0,
-            "searchText": ""
-        },
-        job_id_key="bulletFields"
-    ),
-    "workday": CompanyConfig(
-        api_url="https://workday.wd5.myworkdayjobs.com/wday/cxs/workday/Workday/jobs",
-        body={
-            "appliedFacets": {
-                "jobFamilyGroup": [
-                    "a88cba90a00841e0b750341c541b9d56",
-                    "11d42f4a487c46b9b29ab3e087c2f5ca",
-                    "8c5ce7a1cffb43e0a819c249a49fcb00"
-                ],
-                "locations": [
-                    "2dbd309d3ef64fffb7131f8b596a774a"
-                ]
-            },
-            "limit": 20,
-            "offset": 0,
-            "searchText": ""
-        },
-        job_age_key=JobPostingAgeKey.POSTED_ON,
-        career_page_url="https://workday.wd5.myworkdayjobs.com/Workday?source=Careers_Website_eng&jobFamilyGroup=a88cba90a00841e0b750341c541b9d56&jobFamilyGroup=11d42f4a487c46b9b29ab3e087c2f5ca&jobFamilyGroup=8c5ce7a1cffb43e0a819c249a49fcb00&locations=2dbd309d3ef64fffb7131f8b596a774a"
-    ),
-    "autodesk": CompanyConfig(
-        api_url="https://autodesk.wd1.myworkdayjobs.com/wday/cxs/autodesk/Ext/jobs",
-        body={
-            "appliedFacets": {
-                "locations": [
-                    "dc0c7cba54ea1000a5a4d48e95d30000"
-                ],
-                "locationCountry": [
-                    "a30a87ed25634629aa6c3958aa2b91ea"
-                ],
-                "jobFamilyGroup": [
-                    "1f75c4299c9201c0f3b5f8e6fa01c5bf"
-                ]
-            },
-            "limit": 20,
-            "offset": 0,
-            "searchText": ""
-        },
-        job_age_key=JobPostingAgeKey.POSTED_ON
-    ),
-    "bcaa": CompanyConfig(
-        api_url="https://bcaa.wd3.myworkdayjobs.com/wday/cxs/bcaa/bcaacareers/jobs",
-        body={
-            "appliedFacets": {
-                "jobFamilyGroup": [
-                    "25ae589691dd01fe130456399749e007"
-                ]
-            },
-            "limit": 20,
-            "offset": 0,
-            "searchText": ""
-        },
-        job_age_key=JobPostingAgeKey.POSTED_ON,
-        career_page_url="https://bcaa.wd3.myworkdayjobs.com/bcaacareers?locations=25ae589691dd0132f6d55795a6499214&locations=6b86c3d1fbd8019abef7f55ef34de34b&locations=6b86c3d1fbd801e88583ac08f04dd44a&locations=6b86c3d1fbd80114c130afbaef4dcb4a"
-    ),
-    "flexera": CompanyConfig(
-        api_url="https://flexerasoftware.wd1.myworkdayjobs.com/wday/cxs/flexerasoftware/FlexeraSoftware/jobs",
-        body={
-            "appliedFacets": {
-                "locationCountry": [
-                    "a30a87ed25634629aa6c3958aa2b91ea"
-                ]
-            },
-            "limit": 20,
-            "offset": 0,
-            "searchText": ""
-        },
-        job_age_key=JobPostingAgeKey.POSTED_ON,
-        career_page_url="https://flexerasoftware.wd1.myworkdayjobs.com/FlexeraSoftware?locationCountry=a30a87ed25634629aa6c3958aa2b91ea"
-    ),
-    "ticketmaster": CompanyConfig(
-        api_url="https://livenation.wd1.myworkdayjobs.com/wday/cxs/livenation/TMExternalSite/jobs",
-        body={
-            "appliedFacets": {
-                "jobFamilyGroup": [
-                    "def6fe28d9a210a6e1ddb30d81afbf0e"
-                ],
-                "locations": [
-                    "4aba963a78d401654a86adbe5b01c998"
-                ]
-            },
-            "limit": 20,
-            "offset": 0,
-            "searchText": ""
-        },
-        job_age_key=JobPostingAgeKey.POSTED_ON
-    ),
-    "arcticwolf": CompanyConfig(
-        api_url="https://arcticwolf.wd1.myworkdayjobs.com/wday/cxs/arcticwolf/External/jobs",
-        body= {
-        "appliedFacets": {
-            "locations": [
-                "f6cfbd603ca11001f6248a5f81c80000"
-            ],
-            "jobFamilyGroup": [
-                "f6cfbd603ca11001ed8fdbe0fca80000"
-            ]
-        },
-        "limit": 20,
-        "offset": 0,
-        "searchText": ""
-        },
-        job_age_key="JobPostingAgeKey.POSTED_ON"
-    ),
-    "brilliancanada": CompanyConfig(
-        api_url="https://brilliancanada.wd3.myworkdayjobs.com/wday/cxs/brilliancanada/Omegro/jobs",
-        body={
-            "appliedFacets": {
-                    "locations": [
-                        "fc8da1b0f51d018732ec146710020601"
-                    ],
-                    "jobFamilyGroup": [
-                        "bd289a9e9c38109a2fdd27bbd15d53af"
-                    ]
-                },
-            "limit": 20,
-            "offset": 0,
-        },
-        job_age_key=JobPostingAgeKey.POSTED_ON
-    ),
-    # GREENHOUSE
-    "take-two": CompanyConfig(
-        api_url="https://boards-api.greenhouse.io/v1/boards/taketwo/jobs",
-        http_method="GET",
-        parser_key="greenhouse",
-        job_id_key="id",
-        job_age_key="first_published",
-    ),
-    "samsara": CompanyConfig(
-        api_url="https://boards-api.greenhouse.io/v1/boards/samsara/jobs",
-        http_method="GET",
-        parser_key="greenhouse",
-        job_id_key="id",
-        job_age_key="first_published"
-    ),
-    "stripe": CompanyConfig(
-        api_url="https://boards-api.greenhouse.io/v1/boards/stripe/jobs",
-        http_method="GET",
-        parser_key="greenhouse",
-        job_id_key="id",
-        job_age_key="first_published"
-    ),
-    "gitlab": CompanyConfig(
-        api_url="https://boards-api.greenhouse.io/v1/boards/gitlab/jobs",
-        http_method="GET",
-        parser_key="greenhouse",
-        job_id_key="id",
-        job_age_key="first_published"
-    ),
-    "brex": CompanyConfig(
-        api_url="https://boards-api.greenhouse.io/v1/boards/brex/jobs",
-        http_method="GET",
-        parser_key="greenhouse",
-        job_id_key="id",
-        job_age_key="first_published"
-    ),
-    "affinity": CompanyConfig(
-        api_url="https://boards-api.greenhouse.io/v1/boards/affinity/jobs",
-        http_method="GET",
-        parser_key="greenhouse",
-        job_id_key="id",
-        job_age_key="first_published"
-    ),
-    "hootsuite": CompanyConfig(
-        api_url="https://boards-api.greenhouse.io/v1/boards/hootsuite/jobs",
-        http_method="GET",
-        parser_key="greenhouse",
-        job_id_key="id",
-        job_age_key="first_published"
-    ),
-    "workleap": CompanyConfig(
-        api_url="https://boards-api.greenhouse.io/v1/boards/workleap/jobs",
-        http_method="GET",
-        parser_key="greenhouse",
-        job_id_key="id",
-        job_age_key="first_published"
-    ),
-    "asana": CompanyConfig(
-        api_url="https://boards-api.greenhouse.io/v1/boards/asana/jobs",
-        http_method="GET",
-        parser_key="greenhouse",
-        job_id_key="id",
-        job_age_key="first_published"
-    ),
-    "instacart": CompanyConfig(
-        api_url="https://boards-api.greenhouse.io/v1/boards/instacart/jobs",
-        http_method="GET",
-        parser_key="greenhouse",
-        job_id_key="id",
-        job_age_key="first_published"
-    ),
-    "unbounce": CompanyConfig(
-        api_url="https://boards-api.greenhouse.io/v1/boards/unbounce/jobs",
-        http_method="GET",
-        parser_key="greenhouse",
-        job_id_key="id",
-        job_age_key="first_published"
-    ),
-    "coalition": CompanyConfig(
-        api_url="https://boards-api.greenhouse.io/v1/boards/coalition/jobs",
-        http_method="GET",
-        parser_key="greenhouse",
-        job_id_key="id",
-        job_age_key="first_published"
-    ),
-    "boomi": CompanyConfig(
-        api_url="https://boards-api.greenhouse.io/v1/boards/boomilp/jobs",
-        http_method="GET",
-        parser_key="greenhouse",
-        job_id_key="id",
-        job_age_key="first_published"
-    ),
-    "leagueinc": CompanyConfig(
-        api_url="https://boards-api.greenhouse.io/v1/boards/leagueinc/jobs",
-        http_method="GET",
-        parser_key="greenhouse",
-        job_id_key="id",
-        job_age_key="first_published"
-    ),
-    "shift4": CompanyConfig(
-        api_url="https://boards-api.greenhouse.io/v1/boards/shift4/jobs",
-        http_method="GET",
-        parser_key="greenhouse",
-        job_id_key="id",
-        job_age_key="first_published"
-    ),
-    "benevity": CompanyConfig(
-        api_url="https://boards-api.greenhouse.io/v1/boards/benevity/jobs",
-        http_method="GET",
-        parser_key="greenhouse",
-        job_id_key="id",
-        job_age_key="first_published"
-    ),
-    "launchpotato": CompanyConfig(
-        api_url="https://boards-api.greenhouse.io/v1/boards/launchpotato/jobs",
-        http_method="GET",
-        parser_key="greenhouse",
-        job_id_key="id",
-        job_age_key="first_published"
-    ),
-    "earnin": CompanyConfig(
-        api_url="https://boards-api.greenhouse.io/v1/boards/earnin/jobs",
-        http_method="GET",
-        parser_key="greenhouse",
-        job_id_key="id",
-        job_age_key="first_published"
-    ),
-    "destinationcanada": CompanyConfig(
-        api_url="https://boards-api.greenhouse.io/v1/boards/destinationcanada/jobs",
-        http_method="GET",
-        parser_key="greenhouse",
-        job_id_key="id",
-        job_age_key="first_published"
-    ),
-    "workstream": CompanyConfig(
-        api_url="https://boards-api.greenhouse.io/v1/boards/workstream/jobs",
-        http_method="GET",
-        parser_key="greenhouse",
-        job_id_key="id",
-        job_age_key="first_published"
-    ),
-    "visier": CompanyConfig(
-        api_url="https://boards-api.greenhouse.io/v1/boards/visiersolutionsinc/jobs",
-        http_method="GET",
-        parser_key="greenhouse",
-        job_id_key="id",
-        job_age_key="first_published"
-    ),
-    "coinbase": CompanyConfig(
-        api_url="https://boards-api.greenhouse.io/v1/boards/coinbase/jobs",
-        http_method="GET",
-        parser_key="greenhouse",
-        job_id_key="id",
-        job_age_key="first_published"
-    ),
-    "sproutsocial": CompanyConfig(
-        api_url="https://boards-api.greenhouse.io/v1/boards/sproutsocial/jobs",
-        http_method="GET",
-        parser_key="greenhouse",
-        job_id_key="id",
-        job_age_key="first_published"
-    ),
-    "gomotive": CompanyConfig(
-        api_url="https://boards-api.greenhouse.io/v1/boards/gomotive/jobs",
-        http_method="GET",
-        parser_key="greenhouse",
-        job_id_key="id",
-        job_age_key="first_published"
-    ),
-    "pingidentity": CompanyConfig(
-        api_url="https://boards-api.greenhouse.io/v1/boards/pingidentity/jobs",
-        http_method="GET",
-        parser_key="greenhouse",
-        job_id_key="id",
-        job_age_key="first_published",
-    ),
-    "sayari": CompanyConfig(
-        api_url="https://boards-api.greenhouse.io/v1/boards/sayari/jobs",
-        http_method="GET",
-        parser_key="greenhouse",
-        job_id_key="id",
-        job_age_key="first_published",
-    ),
-    ### LEVER 
-    "xero": CompanyConfig(
-        api_url="https://api.lever.co/v0/postings/xero?location=Vancouver,%20CA&team=Engineering",
-        http_method="GET",
-        parser_key="lever",
-        job_id_key="text",
-        job_age_key="createdAt"
-    ),
-    "super.com": CompanyConfig(
-        api_url="https://api.lever.co/v0/postings/super-com?location=Canada&team=Engineering",
-        http_method="GET",
-        parser_key="lever",
-        job_id_key="text",
-        job_age_key="createdAt"
-    ), 
-    "wealthsimple": CompanyConfig(
-        api_url="https://api.lever.co/v0/postings/wealthsimple?location=Canada&team=Engineering",
-        http_method="GET",
-        parser_key="lever",
-        job_id_key="text",
-        job_age_key="createdAt"
-    ),
-    # "arcteryx": CompanyConfig(
-    #     api_url="https://api.lever.co/v0/postings/suger?location=Vancouver,%20BC&team=Engineering",
-    #     http_method="GET",
-    #     parser_key="lever",
-    #     job_id_key="text",
-    #     job_age_key="createdAt"
-    # ),
-    "suger": CompanyConfig(
-        api_url="https://api.lever.co/v0/postings/suger?location=Vancouver,%20BC&team=Engineering",
-        http_method="GET",
-        parser_key="lever",
-        job_id_key="text",
-        job_age_key="createdAt"
-    ),
-    "sensortower": CompanyConfig(
-        api_url="https://api.lever.co/v0/postings/sensortower?location=Vancouver",
-        http_method="GET",
-        parser_key="lever",
-        job_id_key="text",
-        job_age_key="createdAt"
-    ),
-    "maple": CompanyConfig(
-        api_url="https://api.lever.co/v0/postings/getmaple",
-        http_method="GET",
-        parser_key="lever",
-        job_id_key="text",
-        job_age_key="createdAt"
-    ),
-    "d2l": CompanyConfig(
-        api_url="https://boards-api.greenhouse.io/v1/boards/d2l/jobs",
-        http_method="GET",
-        parser_key="greenhouse",
-        job_id_key="id",
-        job_age_key="first_published",
-    ),
-    ## ASHBYHQ
-    "commonroom": CompanyConfig(
-        api_url="https://jobs.ashbyhq.com/api/non-user-graphql?op=ApiJobPostings",
-        http_method="POST",
-        data_path=["data", "jobBoardWithTeams", "jobPostings"],
-        body= {
-            "query": """
-                query FullJobBoard($organizationHostedJobsPageName: String!) {
-                jobBoardWithTeams(organizationHostedJobsPageName: $organizationHostedJobsPageName) {
-                    jobPostings {
-                    id
-                    title
-                    locationName
-                    teamId
-                    }
-                }
-                }
-            """,
-            "variables": {
-                "organizationHostedJobsPageName": "commonroom"
-            }
-        },
-        parser_key="ashbyhq",
-        job_id_key="id",
-        job_age_key=None,
-        team_id="20fb07a1-36ca-4c01-9bbf-fa00b804e315"
-    ),
-    "quora": CompanyConfig(
-        api_url="https://jobs.ashbyhq.com/api/non-user-graphql?op=ApiJobBoardWithTeams",
-        http_method="POST",
-        data_path=["data","jobBoard", "jobPostings"],
-        body= {
-                "query": """
-                    query ApiJobBoardWithTeams($organizationHostedJobsPageName: String!) {
-                    jobBoard: jobBoardWithTeams(
-                        organizationHostedJobsPageName: $organizationHostedJobsPageName
-                    ) {
-                        teams {
-                        id
-                        name
-                        parentTeamId
-                        __typename
-                        }
-                        jobPostings {
-                        id
-                        title
-                        teamId
-                        locationId
-                        locationName
-                        secondaryLocations {
-                            ...JobPostingSecondaryLocationParts
-                            __typename
-                        }
-                        compensationTierSummary
-                        __typename
-                        }
-                        __typename
-                    }
-                    }
-
-                    fragment JobPostingSecondaryLocationParts on JobPostingSecondaryLocation {
-                    locationId
-                    locationName
-                    __typename
-                    }
-            """,
-            "variables": {
-                "organizationHostedJobsPageName": "quora"
-            }
-        },
-        parser_key="ashbyhq",
-        job_id_key="id",
-        job_age_key=None,
-        team_id="f2fc32f2-ac96-4385-9b66-6ca7feb3e9f1"
-    ),
-    "flaglerhealth": CompanyConfig(
-        api_url="https://jobs.ashbyhq.com/api/non-user-graphql?op=ApiJobBoardWithTeams",
-        http_method="POST",
-        data_path=["data","jobBoard", "jobPostings"],
-        body= {
-                "query": """
-                    query ApiJobBoardWithTeams($organizationHostedJobsPageName: String!) {
-                    jobBoard: jobBoardWithTeams(
-                        organizationHostedJobsPageName: $organizationHostedJobsPageName
-                    ) {
-                        jobPostings {
-                        id
-                        title
-                        teamId
-                        locationId
-                        locationName
-                        workplaceType
-                        employmentType
-                        }
-                        __typename
-                        }
-                    }
-            """,
-            "variables": {
-                "organizationHostedJobsPageName": "flaglerhealth"
-                }
-        },
-        parser_key="ashbyhq",
-        job_id_key="id",
-        job_age_key=None,
-        team_id="14147696-3a4a-4b1b-abcd-d05b054d7e59"
-    ),
-    "auditboard": CompanyConfig(
-        api_url="https://jobs.ashbyhq.com/api/non-user-graphql?op=ApiJobBoardWithTeams",
-        http_method="POST",
-        data_path=["data","jobBoard", "jobPostings"],
-        body= {
-                "query": """
-                    query ApiJobBoardWithTeams($organizationHostedJobsPageName: String!) {
-                    jobBoard: jobBoardWithTeams(
-                        organizationHostedJobsPageName: $organizationHostedJobsPageName
-                    ) {
-                        jobPostings {
-                        id
-                        title
-                        teamId
-                        locationId
-                        locationName
-                        }
-                    }
-                    }
-            """,
-            "variables": {
-              	"organizationHostedJobsPageName": "auditboard"
-            }
-        },
-        parser_key="ashbyhq",
-        job_id_key="id",
-        job_age_key=None,
-        team_id="8875229b-aa84-46a4-85a7-018a8719bd68"
-    ),
-    "stedi": CompanyConfig(
-            api_url="https://jobs.ashbyhq.com/api/non-user-graphql?op=ApiJobBoardWithTeams",
-            http_method="POST",
-            data_path=["data","jobBoard", "jobPostings"],
-            body= {
-                    "query": """
-                        query ApiJobBoardWithTeams($organizationHostedJobsPageName: String!) {
-                        jobBoard: jobBoardWithTeams(
-                            organizationHostedJobsPageName: $organizationHostedJobsPageName
-                        ) {
-                            jobPostings {
-                            id
-                            title
-                            teamId
-                            locationId
-                            locationName
-                            workplaceType  
-                            }
-                        }
-                    }
-                """,
-                "variables": {
-                    "organizationHostedJobsPageName": "stedi"
-                }
-            },
-            parser_key="ashbyhq",
-            job_id_key="id",
-            job_age_key=None,
-            team_id="e46929dd-8491-47cf-ba7b-962ed1f05e3f"
-            ),
-    "github": CompanyConfig(
-        api_url="https://www.github.careers/api/jobs?keywords=software&page=1&locations=,British%20Columbia,Canada&sortBy=relevance&descending=false&internal=false&deviceId=undefined&domain=githubinc.jibeapply.com",
-        http_method="GET",
-        parser_key="github",
-        job_id_key="req_id",
-        job_age_key="posted_date"
-    ),
-    "jane":  CompanyConfig(
-            api_url="https://jobs.ashbyhq.com/api/non-user-graphql",
-            http_method="POST",
-            data_path=["data","jobBoard", "jobPostings"],
-            body= {
-                    "query": """
-                        query ApiJobBoardWithTeams($organizationHostedJobsPageName: String!) {
-                        jobBoard: jobBoardWithTeams(
-                            organizationHostedJobsPageName: $organizationHostedJobsPageName
-                        ) {
-                            jobPostings {
-                            id
-                            title
-                            teamId
-                            locationId
-                            locationName
-                            workplaceType  
-                            }
-                        }
-                    }
-                """,
-                "variables": {
-                    "organizationHostedJobsPageName": "jane"
-                }
-            },
-            parser_key="ashbyhq",
-            job_id_key="id",
-            job_age_key=None,
-            team_id="ac78cc47-6459-472f-8c68-a6e5de347650"
-            ),
-    # "atlassian": CompanyConfig(
-    #     api_url="https://www.atlassian.com/endpoint/careers/listings",
-    #     http_method="GET",
-    #     parser_key="atlassian", 
-    #     job_id_key="id",
-    #     job_age_key="updatedDate"
-    # )
+# Company configurations live in company_configs.toml - add new companies there
+CONFIG_DIR = os.path.dirname(os.path.abspath(__file__))
+CONFIG_PATH = os.path.join(CONFIG_DIR, COMPANY_CONFIGS_FILE)
+INDEX_PATH = os.path.join(CONFIG_DIR, COMPANY_CONFIGS_INDEX_FILE)
+
+PARSER_KEYS = {"workday", "greenhouse", "lever", "ashbyhq", "github", "atlassian"}
+HTTP_METHODS = {"GET", "POST"}
+
+_SCHEMA = {
+    "api_url": str,
+    "http_method": str,
+    "data_path": list,
+    "body": dict,
+    "team_id": str,
+    "parser_key": str,
+    "job_id_key": str,
+    "job_age_key": str,
+    "career_page_url": str,
+    "facet_names": dict,
 }
+assert set(_SCHEMA) == {field.name for field in fields(CompanyConfig)}, "Config schema is out of sync with CompanyConfig"
+
+_SECTION_HEADER = re.compile(rb'^\[(companies|templates)\.(?:"([^"]+)"|([A-Za-z0-9_-]+))\]\s*$')
+_PLACEHOLDER = re.compile(r"\{\{(\w+)\}\}")
+
+_templates: Dict[str, Dict[str, Any]] = {}
+
+
+def available_companies() -> List[str]:
+    """Returns every configured company name, in file order, without parsing any config."""
+    return list(_load_index()["companies"])
+
+
+def load_company_configs(names: Optional[Iterable[str]] = None) -> Dict[str, CompanyConfig]:
+    """Loads and validates configs for `names` (default: all companies).
+
+    Only the sections of the requested companies (and their templates) are read
+    and parsed, using the byte offsets from the compiled index. Unknown names
+    are skipped; callers can compare the result against what they asked for.
+    """
+    index = _load_index()
+    wanted = index["companies"] if names is None else [name for name in names if name in index["companies"]]
+
+    configs = {}
+    with open(CONFIG_PATH, "rb") as f:
+        for name in wanted:
+            section = _read_section(f, index["companies"][name])["companies"][name]
+            configs[name] = _build_config(name, section, _template(f, index, name, section.get("template")))
+    return configs
+
+
+def config_from_section(name: str, section: Dict[str, Any]) -> CompanyConfig:
+    """Builds and validates a config from a company section that isn't in the TOML file (yet)."""
+    index = _load_index()
+    with open(CONFIG_PATH, "rb") as f:
+        return _build_config(name, section, _template(f, index, name, section.get("template")))
+
+
+def _template(f, index: Dict[str, Any], name: str, template_name: Optional[str]) -> Dict[str, Any]:
+    if template_name not in index["templates"]:
+        raise ValueError(f"Invalid config for '{name}': unknown template {template_name!r}")
+    if template_name not in _templates:
+        _templates[template_name] = _read_section(f, index["templates"][template_name])["templates"][template_name]
+    return _templates[template_name]
+
+
+def _read_section(f, span: Tuple[int, int]) -> Dict[str, Any]:
+    start, end = span
+    f.seek(start)
+    return tomllib.loads(f.read(end - start).decode("utf-8"))
+
+
+def _load_index() -> Dict[str, Dict[str, List[int]]]:
+    """Returns the name -> (start, end) byte offset index, rebuilding it when the TOML changed."""
+    stat = os.stat(CONFIG_PATH)
+    try:
+        with open(INDEX_PATH, "r") as f:
+            index = json.load(f)
+        if index.get("source_size") == stat.st_size and index.get("source_mtime_ns") == stat.st_mtime_ns:
+            return index
+    except (json.JSONDecodeError, IOError):
+        pass
+
+    index = _build_index(stat)
+    try:
+        with open(INDEX_PATH, "w") as f:
+            json.dump(index, f)
+    except IOError as e:
+        print(f"Warning: Could not write company config index: {e}")
+    return index
+
+
+def _build_index(stat: os.stat_result) -> Dict[str, Any]:
+    index = {"source_size": stat.st_size, "source_mtime_ns": stat.st_mtime_ns, "templates": {}, "companies": {}}
+    current = None
+    offset = 0
+
+    with open(CONFIG_PATH, "rb") as f:
+        for line in f:
+            if line.startswith(b"["):
+                if current:
+                    current[1] = offset
+                match = _SECTION_HEADER.match(line)
+                if not match:
+                    raise ValueError(f"Unsupported section header in {COMPANY_CONFIGS_FILE}: {line.decode().strip()} "
+                                     "(use dotted keys instead of sub-tables)")
+                kind = match.group(1).decode()
+                name = (match.group(2) or match.group(3)).decode()
+                if name in index[kind]:
+                    raise ValueError(f"Duplicate {kind} entry in {COMPANY_CONFIGS_FILE}: {name}")
+                current = [offset, None]
+                index[kind][name] = current
+            offset += len(line)
+
+    if current:
+        current[1] = offset
+    return index
+
+
+def _build_config(name: str, section: Dict[str, Any], template: Dict[str, Any]) -> CompanyConfig:
+    """Merges a company section over its template, fills in template vars and validates the result."""
+    template_vars = template.get("vars", [])
+    unknown_keys = set(section) - set(_SCHEMA) - set(template_vars) - {"template"}
+    if unknown_keys:
+        raise ValueError(f"Invalid config for '{name}': unknown keys {sorted(unknown_keys)}")
+    missing_vars = [var for var in template_vars if var not in section]
+    if missing_vars:
+        raise ValueError(f"Invalid config for '{name}': missing template vars {missing_vars}")
+
+    values = {var: str(section[var]) for var in template_vars}
+    merged = _merge({key: value for key, value in template.items() if key != "vars"},
+                    {key: value for key, value in section.items() if key in _SCHEMA})
+    merged = _substitute(name, merged, values)
+
+    for key, value in merged.items():
+        if not isinstance(value, _SCHEMA[key]):
+            raise ValueError(f"Invalid config for '{name}': {key} must be a {_SCHEMA[key].__name__}")
+    if "api_url" not in merged:
+        raise ValueError(f"Invalid config for '{name}': api_url is required")
+    if merged.get("http_method", "POST").upper() not in HTTP_METHODS:
+        raise ValueError(f"Invalid config for '{name}': http_method must be one of {sorted(HTTP_METHODS)}")
+    if merged.get("parser_key", "workday") not in PARSER_KEYS:
+        raise ValueError(f"Invalid config for '{name}': parser_key must be one of {sorted(PARSER_KEYS)}")
+    if not all(isinstance(key, str) for key in merged.get("data_path", [])):
+        raise ValueError(f"Invalid config for '{name}': data_path must be a list of strings")
+    if not all(isinstance(names, list) and all(isinstance(item, str) for item in names)
+               for names in merged.get("facet_names", {}).values()):
+        raise ValueError(f"Invalid config for '{name}': facet_names must map facet parameters to lists of names")
+
+    return CompanyConfig(**merged)
+
+
+def _merge(base: Dict[str, Any], override: Dict[str, Any]) -> Dict[str, Any]:
+    result = dict(base)
+    for key, value in override.items():
+        if isinstance(value, dict) and isinstance(result.get(key), dict):
+            result[key] = _merge(result[key], value)
+        else:
+            result[key] = value
+    return result
 
-"""
- TODO: 
- - go through entire script
 
+def _substitute(name: str, value: Any, values: Dict[str, str]) -> Any:
+    if isinstance(value, dict):
+        return {key: _substitute(name, item, values) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_substitute(name, item, values) for item in value]
+    if isinstance(value, str):
+        def replace(match: re.Match) -> str:
+            if match.group(1) not in values:
+                raise ValueError(f"Invalid config for '{name}': template placeholder {match.group(0)} has no value")
+            return values[match.group(1)]
+        return _PLACEHOLDER.sub(replace, value)
+    return value
 
 
- """
+def __getattr__(name: str):
+    # Backwards compatible access to every config; only paid for when used
+    if name == "COMPANY_CONFIGS":
+        configs = load_company_configs()
+        globals()["COMPANY_CONFIGS"] = configs
+        return configs
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,5 +1,5 @@
 from enum import StrEnum
-from typing import Set
+from typing import Any, Dict, List, Set
 
 # --- Constants ---
 TIMESTAMP_MILLISECOND_THRESHOLD = 1_000_000_000_000
@@ -14,25 +14,109 @@ class JobPostingAgeKey(StrEnum):
 # --- Filtering Configuration ---
 MAX_AGE_FOR_JOB_IN_DAYS: int = 3
 
-# Terms to exclude from job searches 
-TERMS_TO_EXCLUDE: Set[str] = {
-    "STAFF", "MANAGER", "MOBILE",
-    "MACHINE LEARNING", "MLOPS", "DEVOPS", "SALESFORCE",
-    "DIRECTOR", "HELP DESK", "VP", "EXECUTIVE", "CO-OP",
-    "COOP", "INTERN", "SALES", 'ASSISTANT', "SUPERVISOR",
-    "RESEARCHER", "ANDROID", "HEAD", "LEAD", 'MANAGEMENT',
-    "PRINCIPAL", "DESIGNER", "ARCHITECT", "DATA SCIENTIST", 
-    "SCIENTIST", "STRATEGIST", "PRODUCT OWNER", "COMMUNICATIONS SPECIALIST",
-    "CONSULTANT", "IOS", "BILINGUAL"
+# Titles to exclude, matched against classified titles (see titles.py). A title is
+# relevant when none of its seniorities, nor its role family or specialties, are in these.
+EXCLUDE_SENIORITIES: Set[str] = {
+    "intern", "lead", "staff", "principal", "manager", "director", "executive",
 }
+EXCLUDE_TITLE_FAMILIES: Set[str] = {
+    "data_science", "research", "design", "architecture", "sales", "it_support",
+    "product", "consulting", "communications", "strategy", "administrative",
+}
+EXCLUDE_SPECIALTIES: Set[str] = {
+    "mobile", "machine_learning", "devops", "salesforce", "bilingual",
+}
+
+# bundled title tokens and phrases for families, seniorities and specialties (next to titles.py)
+TITLE_RULES_FILE = "data/title_rules.json"
+
+# Locations to Include and Exclude, matched against normalized locations (see locations.py).
+# A rule matches when every field it sets is equal; a job is relevant when any of
+# its locations matches an include rule and no exclude rule.
+INCLUDE_LOCATIONS: List[Dict[str, Any]] = [
+    {"country": "CA"},  # anywhere in Canada, minus the excluded provinces below
+    {"remote": True, "country": None},  # "Remote" with no country given
+]
 
-# Locations to Include and Exclude 
-LOCATION_KEY_WORDS = ["VANCOUVER", "BURNABY", "CANADA", "REMOTE"]
+EXCLUDE_LOCATIONS: List[Dict[str, Any]] = [
+    {"province": "ON"}, {"province": "QC"}, {"province": "AB"},
+]
 
-EXCLUDE_LOCATION_KEY_WORDS = ["TORONTO", "MONTREAL",
-                              "OTTAWA", "CALGARY", "ONTARIO", "ALBERTA", "QUEBEC"]
+# offline gazetteer used to normalize location strings (next to locations.py)
+GAZETTEER_FILE = "data/gazetteer.json"
 
 # path for job ids to exclude
 APPLIED_JOBS_FILE = "excluded_jobs.json"
 
-# TODO: think about the logic above more. Some places do list multiple offices or do "Remote Canada" (or something similar)
\ No newline at end of file
+# --- Fetching ---
+DEFAULT_FETCH_WORKERS: int = 8
+# boards waiting between pipeline stages (fetch -> parse -> filter -> output) before the
+# stage feeding them blocks; peak payloads in memory ~ fetch workers + this + parse workers
+# (plus responses shared by several boards, until the last of them has read it)
+PIPELINE_QUEUE_SIZE: int = 4
+# paginated feeds (Jibe, Lever): postings per page, pages fetched at once, and most pages read per board
+PAGE_SIZE: int = 100
+PAGE_FETCH_CONCURRENCY: int = 4
+MAX_PAGES_PER_BOARD: int = 20
+REQUEST_TIMEOUT_SECONDS: float = 10
+# requests never get less than this, even right before the run deadline
+MIN_REQUEST_TIMEOUT_SECONDS: float = 0.5
+
+# postings buffered per output sink before a batched write
+OUTPUT_BATCH_SIZE: int = 500
+
+# on-disk caches (Workday facet catalogs, each board's last fresh postings, ...)
+CACHE_DIR = ".cache"
+WORKDAY_FACET_CACHE_FILE = f"{CACHE_DIR}/workday_facets.json"
+LAST_RESULTS_FILE = f"{CACHE_DIR}/last_results.json"
+WORKDAY_FACET_CACHE_TTL_DAYS: int = 7
+# a cached catalog younger than this isn't re-fetched just because its board came back empty
+WORKDAY_FACET_MIN_REFRESH_HOURS: float = 24
+DIGEST_SENT_FILE = f"{CACHE_DIR}/digest_sent.json"
+TRENDS_FILE = f"{CACHE_DIR}/trends.json"
+# ATS tenants detected by `scraper.py discover`, keyed by tenant and by careers URL
+ATS_RESOLUTION_CACHE_FILE = f"{CACHE_DIR}/ats_resolutions.json"
+
+# --- Hiring trends (`scraper.py stats`) ---
+TREND_WINDOW_DAYS: int = 7
+# per-day new/closed counts kept this long
+TREND_RETENTION_DAYS: int = 120
+# poll hints: busy boards every MIN hours, quiet boards every MAX hours
+MIN_POLL_INTERVAL_HOURS: float = 1
+MAX_POLL_INTERVAL_HOURS: float = 24
+
+# compressed per-company, per-day archive of every run's parsed postings
+HISTORY_DIR = "history"
+
+# --- Email digest (`scraper.py digest`); SMTP settings come from the environment ---
+DIGEST_WINDOW_DAYS: float = 1
+# sent postings are remembered this long, so they aren't mailed again while still listed
+DIGEST_SENT_RETENTION_DAYS: int = 30
+# where the local SMTP stand-in (`--smtp local`) drops .eml files
+DIGEST_OUTBOX_DIR = "outbox"
+
+# --- Coordinator/worker sweeps (`scraper.py coordinate` / `worker`) ---
+# shared directory holding each sweep's shard queue
+QUEUE_DIR = "queue"
+# shards per expected worker, so fast workers pick up the slack of slow ones
+SHARDS_PER_WORKER: int = 4
+# a shard whose worker hasn't sent a heartbeat for this long is retried elsewhere
+LEASE_SECONDS: float = 60
+MAX_SHARD_ATTEMPTS: int = 3
+# without local workers, the coordinator gives up once no worker has made progress for this long
+COORDINATOR_IDLE_TIMEOUT_SECONDS: float = 10 * 60
+# a board with this many open postings costs about as much as one extra request
+COST_POSTINGS_PER_REQUEST: int = 100
+
+# --- Local HTTP API (`scraper.py serve`) ---
+SERVE_HOST = "127.0.0.1"
+SERVE_PORT: int = 8765
+# time between the server's background scrapes
+SERVE_REFRESH_SECONDS: float = 15 * 60
+
+# where `scraper.py --profile` writes its report (.folded, .prof and .txt)
+PROFILE_OUTPUT_PREFIX = "profile/run"
+
+# company job board configs and their compiled name -> offset index (next to company_configs.py)
+COMPANY_CONFIGS_FILE = "company_configs.toml"
+COMPANY_CONFIGS_INDEX_FILE = ".company_configs.index.json"
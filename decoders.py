@@ -0,0 +1,156 @@
+# decoders.py
+"""Typed decode backends that turn raw job board payloads into compact records.
+
+The msgspec backend decodes response bytes straight into per-ATS structs that
+only declare the fields the parsers read, so unused fields (descriptions,
+metadata, compensation, ...) are skipped instead of being built into dicts.
+When msgspec is not installed, or a payload doesn't match its schema, the
+scraper falls back to the pure-Python json path.
+"""
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from company_configs import CompanyConfig
+
+DECODER_BACKENDS = ("auto", "msgspec", "python")
+
+
+# parser_key -> (job_id_key, job_age_key, data_path) the schema was written for
+_SCHEMA_FIELDS: Dict[str, Tuple[str, Optional[str], Optional[List[str]]]] = {
+    "workday": ("bulletFields", "postedOn", None),
+    "greenhouse": ("id", "first_published", None),
+    "lever": ("text", "createdAt", None),
+    "ashbyhq": ("id", None, ["data", "jobBoard", "jobPostings"]),
+    "github": ("req_id", "posted_date", None),
+}
+
+
+@lru_cache(maxsize=None)
+def _schemas() -> Dict[str, Any]:
+    """parser_key -> msgspec schema, built on first use so startup doesn't pay for importing msgspec."""
+    import msgspec
+
+    class _Struct(msgspec.Struct, gc=False):
+        """Base for decoded records; unknown JSON fields are skipped by msgspec."""
+
+    # --- Workday ---
+    class WorkdayPosting(_Struct):
+        title: Optional[str] = None
+        locationsText: Optional[str] = None
+        bulletFields: List[str] = []
+        postedOn: Optional[str] = None
+
+    class WorkdayResponse(_Struct):
+        jobPostings: List[WorkdayPosting] = []
+
+    # --- Greenhouse ---
+    class GreenhouseLocation(_Struct):
+        name: Optional[str] = None
+
+    class GreenhouseJob(_Struct):
+        id: Union[int, str, None] = None
+        title: Optional[str] = None
+        absolute_url: Optional[str] = None
+        location: Optional[GreenhouseLocation] = None
+        first_published: Optional[str] = None
+
+    class GreenhouseResponse(_Struct):
+        jobs: List[GreenhouseJob] = []
+
+    # --- Lever ---
+    class LeverCategories(_Struct):
+        location: Optional[str] = None
+        team: Optional[str] = None
+
+    class LeverPosting(_Struct):
+        id: Optional[str] = None
+        text: Optional[str] = None
+        applyUrl: Optional[str] = None
+        categories: Optional[LeverCategories] = None
+        createdAt: Optional[int] = None
+
+    # --- AshbyHQ ---
+    class AshbyPosting(_Struct):
+        id: Optional[str] = None
+        title: Optional[str] = None
+        locationName: Optional[str] = None
+        teamId: Optional[str] = None
+
+    class AshbyBoard(_Struct):
+        jobPostings: List[AshbyPosting] = []
+
+    class AshbyData(_Struct):
+        jobBoard: Optional[AshbyBoard] = None
+
+    class AshbyResponse(_Struct):
+        data: Optional[AshbyData] = None
+
+    # --- GitHub (Jibe) ---
+    class JibeJobData(_Struct):
+        req_id: Optional[str] = None
+        title: Optional[str] = None
+        location_name: Optional[str] = None
+        posted_date: Optional[str] = None
+
+    class JibeJob(_Struct):
+        data: Optional[JibeJobData] = None
+
+    class JibeResponse(_Struct):
+        jobs: List[JibeJob] = []
+
+    return {
+        "workday": WorkdayResponse,
+        "greenhouse": GreenhouseResponse,
+        "lever": List[LeverPosting],
+        "ashbyhq": AshbyResponse,
+        "github": JibeResponse,
+    }
+
+
+class MsgspecDecoder:
+    """Decodes payloads into per-ATS msgspec structs, one cached decoder per schema."""
+    name = "msgspec"
+
+    def __init__(self):
+        import msgspec
+
+        self._decoders = {key: msgspec.json.Decoder(schema) for key, schema in _schemas().items()}
+        self._errors = (msgspec.DecodeError, msgspec.ValidationError)
+
+    def supports(self, config: CompanyConfig) -> bool:
+        """Whether the config reads exactly the fields its ATS schema declares."""
+        fields = _SCHEMA_FIELDS.get(config.parser_key)
+        if fields is None:
+            return False
+        job_id_key, job_age_key, data_path = fields
+        if config.job_id_key != job_id_key:
+            return False
+        if job_age_key is not None and config.job_age_key != job_age_key:
+            return False
+        return (config.data_path or None) == data_path
+
+    def decode(self, config: CompanyConfig, payload: bytes) -> Optional[Any]:
+        """Returns the decoded records, or None when the payload doesn't fit the schema."""
+        try:
+            decoded = self._decoders[config.parser_key].decode(payload)
+        except self._errors:
+            return None
+
+        if config.parser_key == "ashbyhq":
+            board = decoded.data.jobBoard if decoded.data else None
+            return board.jobPostings if board else []
+        return decoded
+
+
+def get_decoder(backend: str = "auto") -> Optional[MsgspecDecoder]:
+    """Returns the typed decoder for `backend`, or None to use the pure-Python path."""
+    if backend not in DECODER_BACKENDS:
+        raise ValueError(f"Unknown decoder backend: {backend}")
+    if backend == "python":
+        return None
+    try:
+        return MsgspecDecoder()
+    except ImportError:  # optional dependency: pip install msgspec
+        if backend == "msgspec":
+            print("Warning: msgspec is not installed, falling back to the Python decoder")
+        return None
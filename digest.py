@@ -0,0 +1,250 @@
+# digest.py
+"""Email digest of fresh postings (`scraper.py digest`).
+
+Runs a scrape, keeps the postings from the digest window, groups them by company
+and mails one HTML + text digest per recipient over a single SMTP connection.
+Each recipient's sent postings are remembered in .cache/digest_sent.json by a
+fingerprint of their visible fields, so a posting is only mailed again if it
+changed. Rendered rows are shared between recipients. Only `--smtp local` (or
+SMTP_HOST=local) writes .eml files to the outbox directory instead of connecting
+to a server; with no host configured the digest refuses to run.
+
+SMTP settings come from the environment:
+
+  DIGEST_RECIPIENTS  comma-separated addresses (required)
+  DIGEST_SENDER      From address (default: SMTP_USERNAME)
+  SMTP_HOST          server host (required), or "local" for the outbox stand-in
+  SMTP_PORT          default 587 (STARTTLS); 465 uses implicit TLS
+  SMTP_USERNAME, SMTP_PASSWORD
+"""
+import hashlib
+import html
+import json
+import os
+import smtplib
+import ssl
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from email.message import EmailMessage
+from string import Template
+from typing import Dict, List, Optional, Tuple
+from constants import DIGEST_OUTBOX_DIR, DIGEST_SENT_FILE, DIGEST_SENT_RETENTION_DAYS, DIGEST_WINDOW_DAYS
+from models import JobPosting
+
+SMTP_TIMEOUT_SECONDS = 30
+DEFAULT_SMTP_PORT = 587
+SMTP_SSL_PORT = 465
+LOCAL_SMTP_HOST = "local"
+
+# Templates are compiled once; a digest is company sections of job rows
+HTML_DOCUMENT = Template("""<html><body style="font-family: sans-serif">
+<h2>$count new jobs at $companies companies</h2>
+$sections
+</body></html>
+""")
+HTML_SECTION = Template("<h3>$company</h3>\n<ul>\n$rows</ul>\n")
+HTML_ROW = Template('<li><a href="$url">$title</a> &mdash; $location$posted</li>\n')
+
+TEXT_DOCUMENT = Template("$count new jobs at $companies companies\n\n$sections")
+TEXT_SECTION = Template("$company\n$rows\n")
+TEXT_ROW = Template("  - $title ($location)$posted\n    $url\n")
+
+
+def posting_key(job: JobPosting) -> str:
+    return f"{job.company}:{job.job_id}"
+
+
+def posting_fingerprint(job: JobPosting) -> str:
+    """Hash of the fields a recipient sees; a changed posting gets a new fingerprint."""
+    visible = f"{job.title}\x1f{job.location}\x1f{job.url}"
+    return hashlib.sha1(visible.encode("utf-8")).hexdigest()[:16]
+
+
+def in_window(jobs: List[JobPosting], window_days: float = DIGEST_WINDOW_DAYS) -> List[JobPosting]:
+    """Postings published within the window; boards without dates are always included."""
+    cutoff = datetime.now(timezone.utc) - timedelta(days=window_days)
+    return [job for job in jobs if job.posted_date is None or job.posted_date >= cutoff]
+
+
+def group_by_company(jobs: List[JobPosting]) -> Dict[str, List[JobPosting]]:
+    grouped: Dict[str, List[JobPosting]] = defaultdict(list)
+    for job in jobs:
+        grouped[job.company].append(job)
+    return {company: sorted(grouped[company], key=lambda job: str(job.title))
+            for company in sorted(grouped)}
+
+
+class SentState:
+    """Per-recipient fingerprints of postings that were already mailed."""
+
+    def __init__(self, path: str = DIGEST_SENT_FILE, retention_days: int = DIGEST_SENT_RETENTION_DAYS):
+        self.path = path
+        self.retention = timedelta(days=retention_days)
+        # recipient -> posting key -> {"fingerprint": ..., "sent_at": ISO timestamp}
+        self._sent: Dict[str, Dict[str, Dict[str, str]]] = self._load()
+
+    def unsent(self, recipient: str, jobs: List[JobPosting]) -> List[JobPosting]:
+        sent = self._sent.get(recipient, {})
+        return [job for job in jobs
+                if sent.get(posting_key(job), {}).get("fingerprint") != posting_fingerprint(job)]
+
+    def mark_sent(self, recipient: str, jobs: List[JobPosting]):
+        sent_at = datetime.now(timezone.utc).isoformat()
+        sent = self._sent.setdefault(recipient, {})
+        for job in jobs:
+            sent[posting_key(job)] = {"fingerprint": posting_fingerprint(job), "sent_at": sent_at}
+
+    def save(self):
+        cutoff = (datetime.now(timezone.utc) - self.retention).isoformat()
+        for recipient, sent in self._sent.items():
+            self._sent[recipient] = {key: entry for key, entry in sent.items() if entry["sent_at"] >= cutoff}
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            with open(self.path, "w") as f:
+                json.dump(self._sent, f, indent=2)
+        except IOError as e:
+            print(f"Warning: Could not save digest state: {e}")
+
+    def _load(self) -> Dict[str, Dict[str, Dict[str, str]]]:
+        try:
+            with open(self.path, "r") as f:
+                return json.load(f)
+        except (json.JSONDecodeError, IOError):
+            return {}
+
+
+class DigestRenderer:
+    """Renders digests, formatting each posting's rows once for all recipients."""
+
+    def __init__(self):
+        # posting key -> (html row, text row)
+        self._rows: Dict[str, Tuple[str, str]] = {}
+
+    def render(self, grouped: Dict[str, List[JobPosting]]) -> Tuple[str, str]:
+        """Returns the (html, text) bodies of a digest."""
+        html_sections, text_sections = [], []
+        for company, jobs in grouped.items():
+            rows = [self._row(job) for job in jobs]
+            html_sections.append(HTML_SECTION.substitute(
+                company=html.escape(company.title()), rows="".join(row[0] for row in rows)))
+            text_sections.append(TEXT_SECTION.substitute(
+                company=company.title(), rows="".join(row[1] for row in rows)))
+
+        counts = {"count": sum(len(jobs) for jobs in grouped.values()), "companies": len(grouped)}
+        return (HTML_DOCUMENT.substitute(counts, sections="".join(html_sections)),
+                TEXT_DOCUMENT.substitute(counts, sections="".join(text_sections)))
+
+    def _row(self, job: JobPosting) -> Tuple[str, str]:
+        key = posting_key(job)
+        if key not in self._rows:
+            posted = f", posted {job.posted_date:%b %d}" if job.posted_date else ""
+            fields = {"title": str(job.title), "location": str(job.location), "url": job.url or ""}
+            self._rows[key] = (
+                HTML_ROW.substitute({name: html.escape(value) for name, value in fields.items()},
+                                    posted=posted),
+                TEXT_ROW.substitute(fields, posted=posted),
+            )
+        return self._rows[key]
+
+
+class LocalOutbox:
+    """SMTP stand-in that writes each message to an .eml file instead of sending it."""
+
+    def __init__(self, directory: str = DIGEST_OUTBOX_DIR):
+        self.directory = directory
+        self.sent: List[EmailMessage] = []
+
+    def send_message(self, message: EmailMessage):
+        os.makedirs(self.directory, exist_ok=True)
+        stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S")
+        path = os.path.join(self.directory, f"{stamp}-{len(self.sent)}-{message['To']}.eml")
+        with open(path, "wb") as f:
+            f.write(bytes(message))
+        self.sent.append(message)
+
+    def __enter__(self) -> "LocalOutbox":
+        return self
+
+    def __exit__(self, *exc_info):
+        pass
+
+
+def smtp_from_env(host: Optional[str] = None):
+    """Opens the SMTP connection described by the environment (or the local outbox, if asked for)."""
+    host = host or os.environ.get("SMTP_HOST")
+    if not host:
+        raise ValueError(f"no SMTP server configured: set SMTP_HOST (or '{LOCAL_SMTP_HOST}' for the outbox)")
+    if host == LOCAL_SMTP_HOST:
+        return LocalOutbox()
+
+    port = int(os.environ.get("SMTP_PORT", DEFAULT_SMTP_PORT))
+    context = ssl.create_default_context()
+    if port == SMTP_SSL_PORT:
+        smtp = smtplib.SMTP_SSL(host, port, timeout=SMTP_TIMEOUT_SECONDS, context=context)
+    else:
+        smtp = smtplib.SMTP(host, port, timeout=SMTP_TIMEOUT_SECONDS)
+        smtp.starttls(context=context)
+    username = os.environ.get("SMTP_USERNAME")
+    if username:
+        smtp.login(username, os.environ.get("SMTP_PASSWORD", ""))
+    return smtp
+
+
+def send_digests(jobs: List[JobPosting], recipients: List[str], sender: str, smtp,
+                 state: SentState, renderer: Optional[DigestRenderer] = None) -> int:
+    """Mails each recipient their unsent postings over the one `smtp` connection; returns messages sent."""
+    renderer = renderer or DigestRenderer()
+    sent = 0
+    with smtp:
+        for recipient in recipients:
+            unsent = state.unsent(recipient, jobs)
+            if not unsent:
+                print(f"Digest: nothing new for {recipient}")
+                continue
+
+            grouped = group_by_company(unsent)
+            html_body, text_body = renderer.render(grouped)
+            message = EmailMessage()
+            message["Subject"] = (f"{len(unsent)} new jobs at {len(grouped)} companies "
+                                  f"({datetime.now():%a %b %d})")
+            message["From"] = sender
+            message["To"] = recipient
+            message.set_content(text_body)
+            message.add_alternative(html_body, subtype="html")
+
+            smtp.send_message(message)
+            # Record per message, so a failure part-way doesn't re-send to earlier recipients
+            state.mark_sent(recipient, unsent)
+            state.save()
+            sent += 1
+            print(f"Digest: sent {len(unsent)} jobs to {recipient}")
+    return sent
+
+
+def main(argv: Optional[List[str]] = None):
+    from scraper import build_parser, parse_duration, scrape, validate_args
+
+    parser = build_parser("Scrape and email a digest of fresh, relevant jobs.")
+    parser.add_argument("--window", type=parse_duration, default=DIGEST_WINDOW_DAYS * 86400, metavar="DURATION",
+                        help=f"include postings published within this window (default: {DIGEST_WINDOW_DAYS:g} day)")
+    parser.add_argument("--smtp", default=None, metavar="HOST",
+                        help=f"SMTP host, overriding SMTP_HOST; '{LOCAL_SMTP_HOST}' writes .eml files "
+                             f"to {DIGEST_OUTBOX_DIR}/ instead of sending")
+    parser.add_argument("--to", action="append", default=[], metavar="ADDRESS",
+                        help="recipient, overriding DIGEST_RECIPIENTS; repeat for several")
+    args = validate_args(parser, parser.parse_args(argv))
+
+    recipients = args.to or [address.strip() for address in os.environ.get("DIGEST_RECIPIENTS", "").split(",")
+                             if address.strip()]
+    if not recipients:
+        parser.error("no recipients: set DIGEST_RECIPIENTS or pass --to")
+    if not (args.smtp or os.environ.get("SMTP_HOST")):
+        parser.error(f"no SMTP server: set SMTP_HOST or pass --smtp ('{LOCAL_SMTP_HOST}' writes .eml files "
+                     f"to {DIGEST_OUTBOX_DIR}/)")
+    sender = os.environ.get("DIGEST_SENDER") or os.environ.get("SMTP_USERNAME") or "job-scraper@localhost"
+
+    jobs = in_window(scrape(args), window_days=args.window / 86400)
+    if not jobs:
+        print("Digest: no postings in the window, nothing to send")
+        return
+    send_digests(jobs, recipients, sender, smtp_from_env(args.smtp), SentState())
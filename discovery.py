@@ -0,0 +1,271 @@
+# discovery.py
+"""Detects a company's ATS from its careers-page URL and generates its config (`scraper.py discover`).
+
+Known ATS hosts are recognized by URL pattern:
+
+  Greenhouse  boards.greenhouse.io/<board>, job-boards.greenhouse.io/<board>
+  Lever       jobs.lever.co/<org>
+  Ashby       jobs.ashbyhq.com/<org>
+  Workday     <tenant>.wd<N>.myworkdayjobs.com/[<locale>/]<site>
+  Jibe        <host>/api/jobs, or any *.jibeapply.com host
+
+Each URL costs one probe request. A recognized tenant's job API is called once
+to check the board exists. Any other URL is fetched once, and the page is
+scanned for links to one of the hosts above. Resolutions are cached in
+.cache/ats_resolutions.json by tenant, so bulk onboarding never probes a known
+tenant twice.
+"""
+import argparse
+import json
+import os
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+import requests
+from coalescing import RequestCoalescer
+from company_configs import CONFIG_PATH, available_companies, config_from_section
+from constants import ATS_RESOLUTION_CACHE_FILE, DEFAULT_FETCH_WORKERS, REQUEST_TIMEOUT_SECONDS
+from transport import Transport, get_transport
+
+_WORKDAY_HOST = re.compile(r"^(?P<tenant>[\w-]+)\.(?P<pod>wd\d+)\.myworkdayjobs\.com$", re.IGNORECASE)
+_LOCALE = re.compile(r"^[a-z]{2}-[A-Z]{2}$")
+
+# ATS links embedded in careers pages hosted elsewhere
+_EMBEDDED_LINKS = re.compile(
+    r"https?://(?:boards|job-boards|boards-api)\.greenhouse\.io/[^\s\"'<>]+"
+    r"|https?://(?:jobs|api)\.lever\.co/[^\s\"'<>]+"
+    r"|https?://jobs\.ashbyhq\.com/[^\s\"'<>]+"
+    r"|https?://[\w-]+\.wd\d+\.myworkdayjobs\.com/[^\s\"'<>]+",
+    re.IGNORECASE)
+_JIBE_MARKER = re.compile(r"jibeapply\.com|jibe-", re.IGNORECASE)
+
+# Smallest Workday request that proves the site exists
+_WORKDAY_PROBE_BODY = {"appliedFacets": {}, "limit": 1, "offset": 0, "searchText": ""}
+
+
+@dataclass
+class Resolution:
+    """A detected ATS tenant and the company section that reads it."""
+    name: str
+    template: str
+    # template vars and field overrides, in the order they are written to the TOML
+    fields: Dict[str, str] = field(default_factory=dict)
+    source_url: str = ""
+    verified: bool = False
+
+    @property
+    def tenant(self) -> str:
+        return _tenant_key(self.template, self.fields)
+
+    def section(self) -> Dict[str, Any]:
+        return {"template": self.template, **self.fields}
+
+    def to_toml(self) -> str:
+        name = self.name if re.fullmatch(r"[A-Za-z0-9_-]+", self.name) else f'"{self.name}"'
+        lines = [f"[companies.{name}]", f'template = "{self.template}"']
+        lines.extend(f"{key} = {json.dumps(value)}" for key, value in self.fields.items())
+        return "\n".join(lines) + "\n"
+
+
+def _tenant_key(template: str, fields: Dict[str, str]) -> str:
+    identity = fields.get("board") or fields.get("organization") or fields.get("api_url", "")
+    return f"{template}:{identity.split('?')[0].lower()}"
+
+
+def _slug(value: str) -> str:
+    return re.sub(r"[^a-z0-9.-]+", "-", value.lower()).strip("-")
+
+
+def match_url(url: str, name: Optional[str] = None) -> Optional[Resolution]:
+    """Recognizes a careers or API URL of a known ATS without any request."""
+    parts = urlsplit(url if "://" in url else f"https://{url}")
+    host = parts.netloc.lower()
+    path = [segment for segment in parts.path.split("/") if segment]
+
+    if host in ("boards.greenhouse.io", "job-boards.greenhouse.io", "boards-api.greenhouse.io"):
+        board = parse_qs(parts.query).get("for", [None])[0]
+        if board is None and path:
+            board = path[2] if path[:2] == ["v1", "boards"] and len(path) > 2 else path[0]
+        if board and board != "embed":
+            return Resolution(name or _slug(board), "greenhouse", {"board": board}, url)
+
+    if host in ("jobs.lever.co", "api.lever.co"):
+        org = path[2] if path[:2] == ["v0", "postings"] and len(path) > 2 else (path[0] if path else None)
+        if org:
+            return Resolution(name or _slug(org), "lever",
+                              {"api_url": f"https://api.lever.co/v0/postings/{org}"}, url)
+
+    if host == "jobs.ashbyhq.com" and path:
+        return Resolution(name or _slug(path[0]), "ashbyhq", {"organization": path[0]}, url)
+
+    workday = _WORKDAY_HOST.match(host)
+    if workday:
+        site_path = path[1:] if path and _LOCALE.match(path[0]) else path
+        # Hostnames can't hold the underscores of tenant IDs (osv-accolade for osv_accolade)
+        tenant = workday.group("tenant").replace("-", "_")
+        if site_path[:2] == ["wday", "cxs"] and len(site_path) > 3:
+            tenant, site = site_path[2:4]
+        elif site_path:
+            site = site_path[0]
+        else:
+            return None
+        api_url = f"https://{host}/wday/cxs/{tenant}/{site}/jobs"
+        return Resolution(name or _slug(workday.group("tenant")), "workday",
+                          {"api_url": api_url, "career_page_url": f"https://{host}/{site}"}, url)
+
+    if host.endswith(".jibeapply.com") or path[:2] == ["api", "jobs"]:
+        company = host.split(".")[0] if host.endswith(".jibeapply.com") else host.removeprefix("www.").split(".")[0]
+        return Resolution(name or _slug(company), "jibe", {"api_url": f"https://{host}/api/jobs"}, url)
+
+    return None
+
+
+class AtsResolver:
+    def __init__(self, transport: Optional[Transport] = None, cache_path: str = ATS_RESOLUTION_CACHE_FILE):
+        self.transport = transport or get_transport()
+        self.cache_path = cache_path
+        self._cache: Optional[Dict[str, Dict[str, Any]]] = None
+        self._lock = threading.Lock()
+        # URLs of the same tenant resolved concurrently share one probe
+        self._coalescer = RequestCoalescer(
+            lambda method, url, body: self.transport.request(method, url, body, timeout=REQUEST_TIMEOUT_SECONDS))
+
+    @property
+    def probes(self) -> int:
+        return self._coalescer.sent
+
+    def resolve(self, url: str, name: Optional[str] = None) -> Optional[Resolution]:
+        """Returns the URL's ATS resolution, from the cache when its tenant (or URL) is known."""
+        candidate = match_url(url, name)
+        cached = self._cached(candidate.tenant if candidate else f"url:{url}")
+        if cached:
+            resolution = Resolution(**cached)
+            resolution.name = name or resolution.name
+            return resolution
+
+        if candidate:
+            candidate.verified = self._verify(candidate)
+            resolution = candidate if candidate.verified else None
+        else:
+            resolution = self._scan_page(url, name)
+
+        if resolution:
+            self._store(resolution, url)
+        return resolution
+
+    def _verify(self, resolution: Resolution) -> bool:
+        """One call to the tenant's job API, through the same config the scraper would use."""
+        config = config_from_section(resolution.name, resolution.section())
+        body = config.body if config.http_method.upper() == "POST" else None
+        if resolution.template == "workday":
+            body = _WORKDAY_PROBE_BODY
+        try:
+            data = json.loads(self._coalescer.fetch(config.http_method, config.api_url, body))
+        except (requests.exceptions.RequestException, ValueError) as e:
+            print(f"Warning: Probe of {config.api_url} failed: {e}")
+            return False
+
+        for key in config.data_path or []:
+            data = data.get(key) if isinstance(data, dict) else None
+        if resolution.template in ("lever", "ashbyhq"):
+            return isinstance(data, list)
+        return isinstance(data, dict) and any(key in data for key in ("jobs", "jobPostings", "total"))
+
+    def _scan_page(self, url: str, name: Optional[str]) -> Optional[Resolution]:
+        """Fetches a careers page hosted elsewhere and looks for an embedded ATS link."""
+        try:
+            page = self._coalescer.fetch("GET", url).decode("utf-8", "replace")
+        except requests.exceptions.RequestException as e:
+            print(f"Warning: Could not fetch {url}: {e}")
+            return None
+
+        for link in _EMBEDDED_LINKS.findall(page):
+            resolution = match_url(link, name)
+            if resolution:
+                resolution.source_url = url
+                return resolution
+        if _JIBE_MARKER.search(page):
+            host = urlsplit(url).netloc
+            return Resolution(name or _slug(host.removeprefix("www.").split(".")[0]), "jibe",
+                              {"api_url": f"https://{host}/api/jobs"}, url)
+        return None
+
+    def _cached(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            return self._load().get(key)
+
+    def _store(self, resolution: Resolution, url: str):
+        entry = asdict(resolution)
+        with self._lock:
+            cache = self._load()
+            cache[resolution.tenant] = entry
+            cache[f"url:{url}"] = entry
+            try:
+                os.makedirs(os.path.dirname(self.cache_path) or ".", exist_ok=True)
+                with open(self.cache_path, "w") as f:
+                    json.dump(cache, f, indent=2)
+            except IOError as e:
+                print(f"Warning: Could not save ATS resolution cache: {e}")
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        if self._cache is None:
+            try:
+                with open(self.cache_path, "r") as f:
+                    self._cache = json.load(f)
+            except (json.JSONDecodeError, IOError):
+                self._cache = {}
+        return self._cache
+
+
+def resolve_all(resolver: AtsResolver, entries: List[Tuple[str, Optional[str]]],
+                workers: int = DEFAULT_FETCH_WORKERS) -> List[Tuple[str, Optional[Resolution]]]:
+    """Resolves (url, name) entries concurrently; returns (url, resolution or None) in input order."""
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        resolutions = list(executor.map(lambda entry: resolver.resolve(*entry), entries))
+    return [(url, resolution) for (url, _), resolution in zip(entries, resolutions)]
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(prog="scraper.py discover",
+                                     description="Detect the ATS behind careers-page URLs and print their configs.")
+    parser.add_argument("urls", nargs="*", help="careers-page URLs, optionally as name=URL")
+    parser.add_argument("--file", metavar="PATH", help="read more URLs (or name=URL lines) from PATH")
+    parser.add_argument("--append", action="store_true",
+                        help="append new companies to company_configs.toml instead of printing them")
+    parser.add_argument("--workers", type=int, default=DEFAULT_FETCH_WORKERS, metavar="N",
+                        help=f"URLs resolved concurrently (default: {DEFAULT_FETCH_WORKERS})")
+    args = parser.parse_args(argv)
+
+    lines = list(args.urls)
+    if args.file:
+        with open(args.file, "r") as f:
+            lines.extend(line.strip() for line in f if line.strip() and not line.startswith("#"))
+    if not lines:
+        parser.error("no URLs given")
+    entries = [(line.split("=", 1)[1], line.split("=", 1)[0]) if "=" in line.split("://")[0] else (line, None)
+               for line in lines]
+
+    resolver = AtsResolver(get_transport(max_connections=args.workers))
+    results = resolve_all(resolver, entries, args.workers)
+
+    existing = set(available_companies())
+    snippets = []
+    for url, resolution in results:
+        if resolution is None:
+            print(f"# Could not detect the ATS for {url}")
+        elif resolution.name in existing:
+            print(f"# {resolution.name} is already configured ({url})")
+        else:
+            existing.add(resolution.name)
+            snippets.append(resolution.to_toml())
+
+    if args.append and snippets:
+        with open(CONFIG_PATH, "a") as f:
+            f.write("\n### DISCOVERED\n\n" + "\n".join(snippets))
+        print(f"Appended {len(snippets)} companies to {CONFIG_PATH}")
+    else:
+        print("\n".join(snippets), end="")
+    print(f"# {len(results)} URLs, {resolver.probes} probe requests")
@@ -0,0 +1,358 @@
+# history.py
+"""Compressed archive of every run's parsed postings, with time-travel queries.
+
+Layout, partitioned by company and date:
+
+  history/<company>/<YYYY-MM-DD>.blk   one block per run that day
+  history/<company>/closed.blk         one block per run, of the postings it saw close
+  history/<company>/events.bin         fixed-width open/close events
+
+A block is a fixed header followed by one zlib-compressed column per field
+(job ids, titles, locations, urls, posted dates), so a query only inflates the
+columns it reads. Files are read through mmap. "What was open at X on D" reads
+one block; churn queries ("appeared and vanished within a week") scan the
+small events files, then read the titles of the reported postings from the
+closed-postings index, only inflating blocks from the days they closed on.
+Postings closed before the index existed are read from the snapshot their open
+event points at.
+"""
+import argparse
+import hashlib
+import mmap
+import os
+import struct
+import zlib
+from datetime import date, datetime, timedelta, timezone
+from typing import Dict, Iterator, List, NamedTuple, Optional, Sequence, Set, Tuple
+from constants import HISTORY_DIR
+from models import JobPosting
+
+BLOCK_MAGIC = b"JHB1"
+COLUMNS = ("job_id", "title", "location", "url", "posted_date")
+# magic, run timestamp, row count, compressed length of each column
+BLOCK_HEADER = struct.Struct(f"<4sdI{len(COLUMNS)}I")
+# days since epoch, kind, block number within the day, row within the block, 64-bit hash of the posting key
+EVENT = struct.Struct("<IBBHQ")
+EVENT_OPENED, EVENT_CLOSED = 0, 1
+# block/row numbers too large for their field; such postings are looked up by hash
+UNKNOWN_BLOCK, UNKNOWN_ROW = 0xFF, 0xFFFF
+
+FIELD_SEPARATOR = "\x00"
+COMPRESSION_LEVEL = 6
+EPOCH = date(1970, 1, 1)
+
+
+class ChurnedPosting(NamedTuple):
+    job: JobPosting
+    opened: date
+    closed: date
+
+
+def posting_hash(company: str, job_id: str) -> int:
+    return int.from_bytes(hashlib.blake2b(f"{company}:{job_id}".encode("utf-8"), digest_size=8).digest(), "little")
+
+
+def _day_number(day: date) -> int:
+    return (day - EPOCH).days
+
+
+def _from_day_number(number: int) -> date:
+    return EPOCH + timedelta(days=number)
+
+
+class HistoryArchive:
+    def __init__(self, root: str = HISTORY_DIR):
+        self.root = root
+
+    # --- Writing ---
+
+    def record(self, company: str, jobs: List[JobPosting], when: Optional[datetime] = None) -> Tuple[int, int]:
+        """Appends a run's snapshot of a board and its open/close events; returns (opened, closed)."""
+        when = when or datetime.now(timezone.utc)
+        rows = {str(job.job_id): job for job in jobs}
+
+        previous, blocks_today = self._latest_ids(company, when.date())
+        row_of = {job_id: row for row, job_id in enumerate(rows)}
+        opened = set(rows) - previous
+        closed = previous - set(rows)
+
+        # the previous snapshot is still the latest on or before today, so read the closed postings from it
+        closed_jobs = sorted((job for job in self.open_at(company, when.date()) if job.job_id in closed),
+                             key=lambda job: job.job_id) if closed else []
+
+        directory = self._company_dir(company)
+        os.makedirs(directory, exist_ok=True)
+        with open(os.path.join(directory, f"{when.date().isoformat()}.blk"), "ab") as f:
+            f.write(self._encode_block(list(rows.values()), when.timestamp()))
+        if closed_jobs:
+            with open(os.path.join(directory, "closed.blk"), "ab") as f:
+                f.write(self._encode_block(closed_jobs, when.timestamp()))
+
+        day = _day_number(when.date())
+        block = min(blocks_today, UNKNOWN_BLOCK)
+        events = [EVENT.pack(day, EVENT_OPENED, block, min(row_of[job_id], UNKNOWN_ROW), posting_hash(company, job_id))
+                  for job_id in sorted(opened, key=row_of.get)]
+        events += [EVENT.pack(day, EVENT_CLOSED, 0, 0, posting_hash(company, job_id)) for job_id in sorted(closed)]
+        if events:
+            with open(os.path.join(directory, "events.bin"), "ab") as f:
+                f.write(b"".join(events))
+        return len(opened), len(closed)
+
+    def close(self):
+        pass
+
+    def _encode_block(self, jobs: List[JobPosting], run_at: float) -> bytes:
+        columns = [
+            [str(job.job_id) for job in jobs],
+            [str(job.title or "") for job in jobs],
+            [str(job.location or "") for job in jobs],
+            [job.url or "" for job in jobs],
+            [job.posted_date.isoformat() if job.posted_date else "" for job in jobs],
+        ]
+        compressed = [zlib.compress(FIELD_SEPARATOR.join(value.replace(FIELD_SEPARATOR, " ") for value in column)
+                                    .encode("utf-8"), COMPRESSION_LEVEL)
+                      for column in columns]
+        header = BLOCK_HEADER.pack(BLOCK_MAGIC, run_at, len(jobs), *(len(column) for column in compressed))
+        return header + b"".join(compressed)
+
+    # --- Reading ---
+
+    def companies(self) -> List[str]:
+        if not os.path.isdir(self.root):
+            return []
+        return sorted(name for name in os.listdir(self.root) if os.path.isdir(self._company_dir(name)))
+
+    def open_at(self, company: str, day: date) -> List[JobPosting]:
+        """The postings listed by the company's last run on or before `day`."""
+        path = self._day_file_at_or_before(company, day)
+        if path is None:
+            return []
+        with _mapped(path) as data:
+            offsets = list(self._block_offsets(data))
+            if not offsets:
+                return []
+            columns = self._read_columns(data, offsets[-1], COLUMNS)
+        return [JobPosting(company=company, job_id=job_id, title=title or None, location=location or None,
+                           url=url or None, posted_date=datetime.fromisoformat(posted) if posted else None)
+                for job_id, title, location, url, posted in zip(*columns)]
+
+    def churn(self, within_days: int = 7, since: Optional[date] = None,
+              companies: Optional[Sequence[str]] = None) -> List[ChurnedPosting]:
+        """Postings that opened on or after `since` and closed again within `within_days`."""
+        since_day = _day_number(since) if since else 0
+        churned = []
+        for company in companies or self.companies():
+            spans = self._churn_spans(company, within_days, since_day)
+            if spans:
+                indexed = self._describe_closed(company, spans)
+                churned.extend(indexed)
+                if len(indexed) < len(spans):
+                    found = {posting_hash(company, item.job.job_id) for item in indexed}
+                    churned.extend(self._describe(company, {key: span for key, span in spans.items()
+                                                            if key not in found}))
+        return sorted(churned, key=lambda item: (item.closed, item.job.company))
+
+    def _churn_spans(self, company: str, within_days: int, since_day: int) -> Dict[int, Tuple[int, int, int, int]]:
+        """Posting hash -> (opened day, block, row, closed day), from the events file alone."""
+        path = os.path.join(self._company_dir(company), "events.bin")
+        if not os.path.exists(path) or os.path.getsize(path) == 0:
+            return {}
+        opened_at: Dict[int, Tuple[int, int, int]] = {}
+        spans: Dict[int, Tuple[int, int, int, int]] = {}
+        with _mapped(path) as data, memoryview(data) as view:
+            # ignore a torn event at the end of the file
+            with view[:len(view) - len(view) % EVENT.size] as events:
+                for day, kind, block, row, key in EVENT.iter_unpack(events):
+                    if kind == EVENT_OPENED:
+                        opened_at[key] = (day, block, row)
+                    elif key in opened_at:
+                        start, block, row = opened_at.pop(key)
+                        if start >= since_day and day - start <= within_days:
+                            spans[key] = (start, block, row, day)
+        return spans
+
+    def _describe_closed(self, company: str, spans: Dict[int, Tuple[int, int, int, int]]) -> List[ChurnedPosting]:
+        """Reads churned postings' fields from the closed-postings blocks of the days they closed on."""
+        path = os.path.join(self._company_dir(company), "closed.blk")
+        if not os.path.exists(path):
+            return []
+        # blocks are dated by their UTC run time and events by the run's own date, which can be a day apart
+        close_days = set()
+        for _, _, _, end in spans.values():
+            close_days.update((end - 1, end, end + 1))
+
+        # posting hash -> (block offset, row) of its latest close on or before the span's closing day
+        positions: Dict[int, Tuple[int, int]] = {}
+        with _mapped(path) as data:
+            for offset in self._block_offsets(data):
+                run_at = BLOCK_HEADER.unpack_from(data, offset)[1]
+                day = _day_number(datetime.fromtimestamp(run_at, timezone.utc).date())
+                if day not in close_days:
+                    continue
+                (job_ids,) = self._read_columns(data, offset, ("job_id",))
+                for row, job_id in enumerate(job_ids):
+                    key = posting_hash(company, job_id)
+                    if key in spans and day <= spans[key][3] + 1:
+                        positions[key] = (offset, row)
+
+            by_block: Dict[int, List[Tuple[int, int]]] = {}
+            for key, (offset, row) in positions.items():
+                by_block.setdefault(offset, []).append((row, key))
+            churned = []
+            for offset, rows in sorted(by_block.items()):
+                job_ids, titles, locations, urls = self._read_columns(data, offset, COLUMNS[:4])
+                for row, key in rows:
+                    start, _, _, end = spans[key]
+                    job = JobPosting(company=company, job_id=job_ids[row], title=titles[row] or None,
+                                     location=locations[row] or None, url=urls[row] or None)
+                    churned.append(ChurnedPosting(job, _from_day_number(start), _from_day_number(end)))
+        return churned
+
+    def _describe(self, company: str, spans: Dict[int, Tuple[int, int, int, int]]) -> List[ChurnedPosting]:
+        """Reads each churned posting's fields from the block and row it opened in."""
+        by_block: Dict[Tuple[int, int], List[Tuple[int, int, int]]] = {}
+        for key, (start, block, row, end) in spans.items():
+            by_block.setdefault((start, block), []).append((row, key, end))
+
+        churned = []
+        for (start, block), wanted in sorted(by_block.items()):
+            path = os.path.join(self._company_dir(company), f"{_from_day_number(start).isoformat()}.blk")
+            if not os.path.exists(path):
+                continue
+            with _mapped(path) as data:
+                offsets = list(self._block_offsets(data))
+                if block == UNKNOWN_BLOCK or any(row == UNKNOWN_ROW for row, _, _ in wanted):
+                    candidates = offsets if block == UNKNOWN_BLOCK else offsets[block:block + 1]
+                    wanted = self._rows_by_hash(data, company, candidates, wanted)
+                else:
+                    wanted = [(offsets[block], wanted)] if block < len(offsets) else []
+                for offset, rows in wanted:
+                    job_ids, titles, locations, urls = self._read_columns(data, offset, COLUMNS[:4])
+                    for row, _, end in rows:
+                        job = JobPosting(company=company, job_id=job_ids[row], title=titles[row] or None,
+                                         location=locations[row] or None, url=urls[row] or None)
+                        churned.append(ChurnedPosting(job, _from_day_number(start), _from_day_number(end)))
+        return churned
+
+    def _rows_by_hash(self, data, company: str, offsets: List[int],
+                      wanted: List[Tuple[int, int, int]]) -> List[Tuple[int, List[Tuple[int, int, int]]]]:
+        """Finds postings whose event couldn't store their position, by hashing the ids of `offsets`."""
+        ends = {key: end for _, key, end in wanted}
+        found = []
+        for offset in offsets:
+            (job_ids,) = self._read_columns(data, offset, ("job_id",))
+            rows = []
+            for row, job_id in enumerate(job_ids):
+                key = posting_hash(company, job_id)
+                if key in ends:
+                    rows.append((row, key, ends.pop(key)))
+            if rows:
+                found.append((offset, rows))
+            if not ends:
+                break
+        return found
+
+    def _latest_ids(self, company: str, day: date) -> Tuple[Set[str], int]:
+        """The ids in the company's last snapshot, and how many blocks `day` already has."""
+        path = self._day_file_at_or_before(company, day)
+        if path is None:
+            return set(), 0
+        with _mapped(path) as data:
+            offsets = list(self._block_offsets(data))
+            if not offsets:
+                return set(), 0
+            (job_ids,) = self._read_columns(data, offsets[-1], ("job_id",))
+        blocks_today = len(offsets) if os.path.basename(path) == f"{day.isoformat()}.blk" else 0
+        return set(job_ids), blocks_today
+
+    def _block_offsets(self, data) -> Iterator[int]:
+        offset = 0
+        while offset + BLOCK_HEADER.size <= len(data):
+            magic, _, _, *lengths = BLOCK_HEADER.unpack_from(data, offset)
+            end = offset + BLOCK_HEADER.size + sum(lengths)
+            if magic != BLOCK_MAGIC or end > len(data):
+                # torn write at the end of the file
+                return
+            yield offset
+            offset = end
+
+    def _read_columns(self, data, offset: int, names: Sequence[str]) -> List[List[str]]:
+        """Inflates only the named columns of the block at `offset`."""
+        _, _, rows, *lengths = BLOCK_HEADER.unpack_from(data, offset)
+        starts = [offset + BLOCK_HEADER.size]
+        for length in lengths:
+            starts.append(starts[-1] + length)
+
+        columns = []
+        for name in names:
+            index = COLUMNS.index(name)
+            if rows == 0:
+                columns.append([])
+                continue
+            raw = zlib.decompress(data[starts[index]:starts[index + 1]]).decode("utf-8")
+            columns.append(raw.split(FIELD_SEPARATOR))
+        return columns
+
+    def _day_file_at_or_before(self, company: str, day: date) -> Optional[str]:
+        directory = self._company_dir(company)
+        if not os.path.isdir(directory):
+            return None
+        # ISO dates sort lexically
+        limit = f"{day.isoformat()}.blk"
+        days = sorted(name for name in os.listdir(directory) if name.endswith(".blk") and name <= limit)
+        return os.path.join(directory, days[-1]) if days else None
+
+    def _company_dir(self, company: str) -> str:
+        return os.path.join(self.root, company)
+
+
+class _mapped:
+    """Read-only mmap of a file, as a context manager; empty files map to b""."""
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def __enter__(self):
+        self._file = open(self.path, "rb")
+        if os.fstat(self._file.fileno()).st_size == 0:
+            self._map = None
+            return b""
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        return self._map
+
+    def __exit__(self, *exc_info):
+        if self._map is not None:
+            self._map.close()
+        self._file.close()
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(prog="scraper.py history", description="Query the archive of past runs.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    open_parser = commands.add_parser("open", help="postings a company listed on a date")
+    open_parser.add_argument("company")
+    open_parser.add_argument("date", nargs="?", type=date.fromisoformat, default=None,
+                             help="YYYY-MM-DD (default: today)")
+
+    churn_parser = commands.add_parser("churn", help="postings that appeared and vanished within a short time")
+    churn_parser.add_argument("companies", nargs="*", help="companies to check (default: all archived)")
+    churn_parser.add_argument("--within", type=int, default=7, metavar="DAYS",
+                              help="longest time a posting stayed open (default: 7)")
+    churn_parser.add_argument("--since", type=date.fromisoformat, default=None, metavar="YYYY-MM-DD",
+                              help="only postings that opened on or after this date")
+    args = parser.parse_args(argv)
+
+    archive = HistoryArchive()
+    if args.command == "open":
+        day = args.date or datetime.now(timezone.utc).date()
+        jobs = archive.open_at(args.company, day)
+        print(f"{len(jobs)} postings open at {args.company.title()} on {day.isoformat()}:")
+        for job in jobs:
+            print(f"  - {job.title} ({job.location}) | ID: {job.job_id}")
+    else:
+        churned = archive.churn(args.within, since=args.since, companies=args.companies or None)
+        print(f"{len(churned)} postings closed within {args.within} days of appearing:")
+        for item in churned:
+            print(f"  - {item.job.title} at {item.job.company.title()} ({item.job.location}) | "
+                  f"{item.opened.isoformat()} -> {item.closed.isoformat()} | ID: {item.job.job_id}")
@@ -0,0 +1,208 @@
+# locations.py
+"""Normalizes raw location strings into structured (city, province, country, remote) tuples.
+
+Boards report locations as free text ("Vancouver, BC, Canada", "Remote - Canada",
+"Toronto; Vancouver") or as lists of them. Strings are resolved against the
+bundled offline gazetteer in data/gazetteer.json, and every distinct string is
+resolved (and matched against the include/exclude rules) only once per process.
+"""
+import json
+import os
+import re
+import string
+from functools import lru_cache
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+from constants import EXCLUDE_LOCATIONS, GAZETTEER_FILE, INCLUDE_LOCATIONS
+
+GAZETTEER_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), GAZETTEER_FILE)
+
+# Separators between distinct locations in one string; commas are handled while grouping
+_LOCATION_SEPARATORS = r"\s*(?:;|\||/|\n|\bOR\b|\bAND\b|&)\s*"
+
+
+class Location(NamedTuple):
+    city: Optional[str] = None
+    province: Optional[str] = None
+    country: Optional[str] = None
+    remote: bool = False
+
+
+class _Gazetteer(NamedTuple):
+    pattern: re.Pattern
+    # phrase -> interpretations: ("country", code) | ("province", country, code) |
+    # ("city", name, province, country) | ("remote",)
+    phrases: Dict[str, List[Tuple]]
+    # standalone codes such as "BC" or "CA", only recognized as a whole comma-separated part
+    codes: Dict[str, List[Tuple]]
+    # the separators, plus names that contain one ("NEWFOUNDLAND AND LABRADOR") so they aren't split
+    separators: re.Pattern
+
+
+@lru_cache(maxsize=None)
+def _load_gazetteer() -> _Gazetteer:
+    with open(GAZETTEER_PATH, "r", encoding="utf-8") as f:
+        raw = json.load(f)
+
+    phrases: Dict[str, List[Tuple]] = {}
+    codes: Dict[str, List[Tuple]] = {}
+
+    for term in raw["remote_terms"]:
+        phrases.setdefault(term, []).append(("remote",))
+    for country, names in raw["countries"].items():
+        codes.setdefault(country, []).append(("country", country))
+        for name in names:
+            phrases.setdefault(name, []).append(("country", country))
+    for country, provinces in raw["provinces"].items():
+        for province, names in provinces.items():
+            codes.setdefault(province, []).append(("province", country, province))
+            for name in names:
+                phrases.setdefault(name, []).append(("province", country, province))
+    for name, province, country in raw["cities"]:
+        phrases.setdefault(name, []).append(("city", string.capwords(name), province, country))
+
+    # Longest phrases first so "NORTH VANCOUVER" wins over "VANCOUVER"
+    alternation = "|".join(re.escape(phrase) for phrase in sorted(phrases, key=len, reverse=True))
+    pattern = re.compile(rf"(?<![A-Z0-9])(?:{alternation})(?![A-Z0-9])")
+
+    joined = [re.escape(phrase) for phrase in sorted(phrases, key=len, reverse=True)
+              if re.search(_LOCATION_SEPARATORS, phrase)]
+    names = rf"(?P<name>(?<![A-Z0-9])(?:{'|'.join(joined)})(?![A-Z0-9]))|" if joined else ""
+    separators = re.compile(rf"{names}(?P<separator>{_LOCATION_SEPARATORS})")
+    return _Gazetteer(pattern, phrases, codes, separators)
+
+
+def normalize_location(raw: Any) -> Tuple[Location, ...]:
+    """Returns the structured locations in a raw location string, dict or list of them."""
+    if isinstance(raw, (list, tuple)):
+        return tuple(location for item in raw for location in normalize_location(item))
+    if isinstance(raw, dict):
+        raw = raw.get("name") or raw.get("locationName") or ""
+    if raw is None:
+        return ()
+    return _normalize_string(str(raw))
+
+
+def is_relevant_location(raw: Any) -> bool:
+    """Whether any of the locations in `raw` matches an include rule and no exclude rule."""
+    if isinstance(raw, (list, tuple)):
+        return any(is_relevant_location(item) for item in raw)
+    if isinstance(raw, dict):
+        raw = raw.get("name") or raw.get("locationName") or ""
+    if raw is None:
+        return False
+    return _is_relevant_string(str(raw))
+
+
+@lru_cache(maxsize=4096)
+def _is_relevant_string(raw: str) -> bool:
+    for location in _normalize_string(raw):
+        if any(_matches(location, rule) for rule in EXCLUDE_LOCATIONS):
+            continue
+        if any(_matches(location, rule) for rule in INCLUDE_LOCATIONS):
+            return True
+    return False
+
+
+def _matches(location: Location, rule: Dict[str, Any]) -> bool:
+    return all(getattr(location, field) == value for field, value in rule.items())
+
+
+@lru_cache(maxsize=4096)
+def _normalize_string(raw: str) -> Tuple[Location, ...]:
+    gazetteer = _load_gazetteer()
+    locations = []
+
+    for chunk in _split_locations(gazetteer, raw.upper()):
+        group: List[Tuple] = []
+        for part in chunk.split(","):
+            part = part.strip(" -()[]")
+            if not part:
+                continue
+            interpretations = _interpret_part(gazetteer, part)
+            if _starts_new_location(group, interpretations):
+                locations.append(_resolve(group))
+                group = []
+            group.extend(interpretations)
+        if group:
+            locations.append(_resolve(group))
+
+    return tuple(location for location in locations if location != Location())
+
+
+def _split_locations(gazetteer: _Gazetteer, raw: str) -> List[str]:
+    """Splits a string at its location separators, except inside gazetteer names."""
+    chunks, start = [], 0
+    for match in gazetteer.separators.finditer(raw):
+        if match.lastgroup == "separator":
+            chunks.append(raw[start:match.start()])
+            start = match.end()
+    chunks.append(raw[start:])
+    return chunks
+
+
+def _interpret_part(gazetteer: _Gazetteer, part: str) -> List[Tuple]:
+    """Returns one list of candidate interpretations per gazetteer match in `part`."""
+    if part in gazetteer.codes:
+        return [tuple(gazetteer.codes[part])]
+    return [tuple(gazetteer.phrases[match.group(0)]) for match in gazetteer.pattern.finditer(part)]
+
+
+def _starts_new_location(group: List[Tuple], interpretations: List[Tuple]) -> bool:
+    """A second city (or country) in the same chunk means a second location, e.g. "Toronto, Vancouver"."""
+    for kind in ("city", "country"):
+        incoming = any(_is_kind(candidates, kind) for candidates in interpretations)
+        existing = any(_is_kind(candidates, kind) for candidates in group)
+        if incoming and existing:
+            return True
+    return False
+
+
+def _is_kind(candidates: Tuple, kind: str) -> bool:
+    return all(item[0] == kind for item in candidates)
+
+
+def _resolve(group: List[Tuple]) -> Location:
+    """Picks the most consistent city/province/country from a group's candidate interpretations."""
+    remote = any(candidates[0][0] == "remote" for candidates in group)
+    unambiguous = [candidates[0] for candidates in group if len(candidates) == 1]
+    ambiguous = [candidates for candidates in group if len(candidates) > 1]
+
+    country = next((item[1] for item in unambiguous if item[0] == "country"), None)
+    province = next((item for item in unambiguous if item[0] == "province"
+                     and country in (None, item[1])), None)
+    if province:
+        country = province[1]
+        province = province[2]
+
+    city_candidates = [item for candidates in group for item in candidates if item[0] == "city"]
+
+    # Ambiguous codes ("CA" is Canada or California) follow the unambiguous evidence, then the cities
+    for candidates in ambiguous:
+        if candidates[0][0] == "city":
+            continue
+        consistent = [item for item in candidates if country in (None, item[1])]
+        near_city = [item for item in consistent if any(_fits_city(item, city) for city in city_candidates)]
+        consistent = near_city or consistent
+        if not consistent:
+            continue
+        chosen = consistent[0]
+        if chosen[0] == "country" and country is None:
+            country = chosen[1]
+        elif chosen[0] == "province" and province is None:
+            country, province = chosen[1], chosen[2]
+
+    city = None
+    consistent_cities = [item for item in city_candidates
+                         if country in (None, item[3]) and province in (None, item[2])]
+    if consistent_cities:
+        _, city, city_province, city_country = consistent_cities[0]
+        province = province or city_province
+        country = country or city_country
+
+    return Location(city=city, province=province, country=country, remote=remote)
+
+
+def _fits_city(item: Tuple, city: Tuple) -> bool:
+    if item[0] == "country":
+        return item[1] == city[3]
+    return item[1] == city[3] and item[2] == city[2]
@@ -1,9 +1,9 @@
 # models.py
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Optional
+from typing import Any, Dict, Optional
 
-@dataclass
+@dataclass(slots=True)
 class JobPosting:
     """A standardized representation of a single job posting."""
     # Required fields we need for filtering and identification
@@ -14,4 +14,30 @@ class JobPosting:
     title: Optional[str] = "No Title Provided"
     location: Optional[str] = "N/A"
     url: Optional[str] = None
-    posted_date: Optional[datetime] = None
\ No newline at end of file
+    posted_date: Optional[datetime] = None
+    team: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Returns a JSON-serializable dict of this posting."""
+        return {
+            "company": self.company,
+            "job_id": self.job_id,
+            "title": self.title,
+            "location": self.location,
+            "url": self.url,
+            "posted_date": self.posted_date.isoformat() if self.posted_date else None,
+            "team": self.team,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "JobPosting":
+        posted_date = data.get("posted_date")
+        return cls(
+            company=data["company"],
+            job_id=data["job_id"],
+            title=data.get("title"),
+            location=data.get("location"),
+            url=data.get("url"),
+            posted_date=datetime.fromisoformat(posted_date) if posted_date else None,
+            team=data.get("team"),
+        )
@@ -0,0 +1,121 @@
+# pagination.py
+"""Page-by-page fetching for paginated feeds (Jibe and Lever).
+
+Jibe (`github` parser) pages with `page`/`limit` and reports `totalCount`, so
+every remaining page is known after the first one. Lever pages with
+`skip`/`limit` and reports no total, so pages are requested until one comes
+back short. Either way pages after the first are fetched PAGE_FETCH_CONCURRENCY
+at a time, up to MAX_PAGES_PER_BOARD; a board with more pages than that comes
+back marked truncated. Given an age cutoff, fetching also stops once a page is
+in newest-first order and its oldest posting is past it, because every later
+page is older still. Without one every page is read, since the snapshot stores
+need the complete board to tell which postings closed.
+
+The pages' postings are merged into one payload shaped like a single response,
+so decoding and parsing don't change.
+"""
+import json
+import math
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+from urllib.parse import parse_qsl, quote, urlencode, urlsplit, urlunsplit
+from constants import MAX_PAGES_PER_BOARD, PAGE_FETCH_CONCURRENCY, PAGE_SIZE
+
+
+class PageScheme:
+    """How one ATS pages its feed: query parameters, where the postings and total are, and posting dates."""
+
+    def __init__(self, page_param: str, size_param: str, offset_based: bool,
+                 records_key: Optional[str] = None, total_key: Optional[str] = None,
+                 date_of: Callable[[Dict[str, Any], str], Any] = lambda record, key: record.get(key)):
+        self.page_param = page_param
+        self.size_param = size_param
+        # skip=<postings before this page> rather than page=<1-based page number>
+        self.offset_based = offset_based
+        self.records_key = records_key
+        self.total_key = total_key
+        self.date_of = date_of
+
+    def url(self, api_url: str, index: int, page_size: int) -> str:
+        """The feed URL for the 0-based page `index`, keeping the URL's other parameters."""
+        parts = urlsplit(api_url)
+        params = dict(parse_qsl(parts.query, keep_blank_values=True))
+        params[self.page_param] = str(index * page_size if self.offset_based else index + 1)
+        params[self.size_param] = str(page_size)
+        return urlunsplit(parts._replace(query=urlencode(params, quote_via=quote, safe=",")))
+
+    def records(self, data: Any) -> List[Dict[str, Any]]:
+        records = data.get(self.records_key) if self.records_key else data
+        return records if isinstance(records, list) else []
+
+    def total_pages(self, data: Any, page_size: int) -> Optional[int]:
+        total = data.get(self.total_key) if self.total_key and isinstance(data, dict) else None
+        return math.ceil(total / page_size) if isinstance(total, int) else None
+
+    def merge(self, first: Any, records: List[Dict[str, Any]]) -> bytes:
+        if self.records_key:
+            return json.dumps({**first, self.records_key: records}).encode()
+        return json.dumps(records).encode()
+
+
+# parser_key -> how its feed pages
+PAGE_SCHEMES = {
+    "github": PageScheme("page", "limit", offset_based=False, records_key="jobs", total_key="totalCount",
+                         date_of=lambda record, key: (record.get("data") or {}).get(key)),
+    "lever": PageScheme("skip", "limit", offset_based=True),
+}
+
+
+class Pages(NamedTuple):
+    payload: bytes
+    # the board has more than max_pages pages; postings past them weren't read
+    truncated: bool = False
+
+
+class PageFetcher:
+    def __init__(self, fetch: Callable[[str], bytes], parse_date: Callable[[Any], Optional[datetime]],
+                 max_age_days: Optional[float] = None, page_size: int = PAGE_SIZE,
+                 max_pages: int = MAX_PAGES_PER_BOARD, concurrency: int = PAGE_FETCH_CONCURRENCY):
+        self.fetch = fetch
+        self.parse_date = parse_date
+        # None fetches every page, e.g. when snapshot stores need the complete board
+        self.max_age_days = max_age_days
+        self.page_size = page_size
+        self.max_pages = max_pages
+        self.concurrency = concurrency
+
+    def fetch_all(self, scheme: PageScheme, api_url: str, date_key: str) -> Pages:
+        """Fetches a feed's pages and returns them merged into one payload."""
+        first = json.loads(self.fetch(scheme.url(api_url, 0, self.page_size)))
+        page = scheme.records(first)
+        records = list(page)
+        total_pages = scheme.total_pages(first, self.page_size)
+        last = min(total_pages, self.max_pages) if total_pages is not None else self.max_pages
+        done = self._is_last(scheme, page, date_key)
+
+        index = 1
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            while not done and index < last:
+                wave = range(index, min(index + self.concurrency, last))
+                pages = executor.map(lambda i: scheme.records(json.loads(self.fetch(scheme.url(api_url, i, self.page_size)))),
+                                     wave)
+                for page in pages:
+                    records.extend(page)
+                    if self._is_last(scheme, page, date_key):
+                        done = True
+                        break
+                index = wave.stop
+
+        truncated = not done and index >= self.max_pages and (total_pages is None or total_pages > self.max_pages)
+        return Pages(scheme.merge(first, records), truncated)
+
+    def _is_last(self, scheme: PageScheme, page: List[Dict[str, Any]], date_key: str) -> bool:
+        if len(page) < self.page_size:
+            return True
+        if self.max_age_days is None:
+            return False
+        dates = [date for date in (self.parse_date(scheme.date_of(record, date_key)) for record in page) if date]
+        newest_first = all(earlier >= later for earlier, later in zip(dates, dates[1:]))
+        cutoff = datetime.now(timezone.utc) - timedelta(days=self.max_age_days + 1)
+        return bool(dates) and newest_first and dates[-1] < cutoff
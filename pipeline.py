@@ -0,0 +1,193 @@
+# pipeline.py
+"""Stages connected by bounded queues, for the fetch -> parse -> filter -> output path of a run.
+
+Each stage has its own worker threads, and reads from a queue of at most
+`queue_size` items. A full queue blocks the stage feeding it, so fast fetchers
+wait for parsing instead of piling up payloads. A run holds at most about
+fetch workers + queue size + parse workers payloads at once, whatever the
+number of boards (plus responses shared by several boards, which the scraper's
+RequestCoalescer keeps until the last of those boards has read them). The
+caller's loop over run() is the last stage (output).
+
+Every stage counts the time its workers spend busy, waiting for input (starved)
+and waiting for room downstream (blocked), and samples the depth of its input
+queue. The busiest stage relative to its worker count is the bottleneck.
+"""
+import queue
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable, Iterator, List, Optional
+
+# Marks the end of a stage's input
+_DONE = object()
+
+# How often blocked workers check whether the pipeline was stopped
+_POLL_SECONDS = 0.1
+
+
+@dataclass
+class StageStats:
+    name: str
+    workers: int
+    items: int = 0
+    busy: float = 0.0
+    starved: float = 0.0
+    blocked: float = 0.0
+    depth_max: int = 0
+    depth_total: int = 0
+    depth_samples: int = 0
+
+    @property
+    def depth_mean(self) -> float:
+        return self.depth_total / self.depth_samples if self.depth_samples else 0.0
+
+    def utilization(self, elapsed: float) -> float:
+        return self.busy / (self.workers * elapsed) if elapsed > 0 else 0.0
+
+
+class Stage:
+    """A step run by `workers` threads; `function` maps an item to the next stage's item, or None to drop it."""
+
+    def __init__(self, name: str, function: Callable[[Any], Any], workers: int = 1):
+        self.name = name
+        self.function = function
+        self.workers = max(workers, 1)
+
+
+class Pipeline:
+    def __init__(self, stages: List[Stage], queue_size: int):
+        self.stages = stages
+        self.queue_size = queue_size
+        # Stage i reads queues[i] and writes queues[i + 1]; the first holds the work list
+        self.queues: List[queue.Queue] = [queue.Queue()] + [queue.Queue(maxsize=queue_size) for _ in stages]
+        self.stats = [StageStats(stage.name, stage.workers) for stage in stages]
+        self.output_stats = StageStats("output", 1)
+        self.elapsed = 0.0
+        self._running = [stage.workers for stage in stages]
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._error: Optional[BaseException] = None
+
+    def run(self, items: Iterable[Any], timeout: Optional[Callable[[], Optional[float]]] = None) -> Iterator[Any]:
+        """Yields the last stage's results as they arrive.
+
+        `timeout` returns the seconds left (or None for no limit); once it hits
+        zero the pipeline stops and the remaining items are abandoned. An
+        unexpected error in a stage stops the pipeline and is raised here.
+        """
+        started = time.monotonic()
+        for item in items:
+            self.queues[0].put(item)
+        self.queues[0].put(_DONE)
+        for index, stage in enumerate(self.stages):
+            for worker in range(stage.workers):
+                threading.Thread(target=self._work, args=(index,), daemon=True,
+                                 name=f"{stage.name}-{worker}").start()
+
+        results = self.queues[-1]
+        try:
+            while True:
+                remaining = timeout() if timeout else None
+                if remaining is not None and remaining <= 0:
+                    return
+                waited = time.monotonic()
+                try:
+                    item = results.get(timeout=min(remaining, _POLL_SECONDS) if remaining is not None else _POLL_SECONDS)
+                except queue.Empty:
+                    self.output_stats.starved += time.monotonic() - waited
+                    if self._error is not None:
+                        raise self._error
+                    continue
+                self.output_stats.starved += time.monotonic() - waited
+                if item is _DONE:
+                    if self._error is not None:
+                        raise self._error
+                    return
+                resumed = time.monotonic()
+                yield item
+                self.output_stats.busy += time.monotonic() - resumed
+                self.output_stats.items += 1
+        finally:
+            self.stop()
+            self.elapsed = time.monotonic() - started
+
+    def stop(self):
+        """Stops every worker after its current item."""
+        self._stopped.set()
+
+    def _work(self, index: int):
+        stage, stats = self.stages[index], self.stats[index]
+        inbox, outbox = self.queues[index], self.queues[index + 1]
+        try:
+            while not self._stopped.is_set():
+                waited = time.monotonic()
+                item = self._get(inbox)
+                with self._lock:
+                    stats.starved += time.monotonic() - waited
+                if item is _DONE:
+                    # Leave it for this stage's other workers
+                    inbox.put(_DONE)
+                    return
+                if item is None:
+                    continue
+
+                started = time.monotonic()
+                result = stage.function(item)
+                with self._lock:
+                    stats.busy += time.monotonic() - started
+                    stats.items += 1
+                if result is not None:
+                    self._put(outbox, result, index)
+        except BaseException as e:
+            self._error = e
+            self.stop()
+        finally:
+            with self._lock:
+                self._running[index] -= 1
+                last = self._running[index] == 0
+            if last and not self._stopped.is_set():
+                self._put(outbox, _DONE, index)
+
+    def _get(self, inbox: queue.Queue) -> Any:
+        """The next item, or None if the pipeline was stopped while waiting."""
+        while not self._stopped.is_set():
+            try:
+                return inbox.get(timeout=_POLL_SECONDS)
+            except queue.Empty:
+                continue
+        return None
+
+    def _put(self, outbox: queue.Queue, item: Any, index: int):
+        waited = time.monotonic()
+        while not self._stopped.is_set():
+            try:
+                outbox.put(item, timeout=_POLL_SECONDS)
+                break
+            except queue.Full:
+                continue
+        # The depth seen by the next stage (or the output loop)
+        depth = outbox.qsize()
+        consumer = self.stats[index + 1] if index + 1 < len(self.stats) else self.output_stats
+        with self._lock:
+            self.stats[index].blocked += time.monotonic() - waited
+            consumer.depth_max = max(consumer.depth_max, depth)
+            consumer.depth_total += depth
+            consumer.depth_samples += 1
+
+    def bottleneck(self) -> Optional[str]:
+        stats = [*self.stats, self.output_stats]
+        if not self.elapsed or not any(stage.items for stage in stats):
+            return None
+        return max(stats, key=lambda stage: stage.utilization(self.elapsed)).name
+
+    def report(self):
+        print(f"\n--- Pipeline stages (queues hold up to {self.queue_size}) ---")
+        print(f"  {'stage':8} {'workers':>7} {'items':>6} {'busy':>6} {'starved':>8} {'blocked':>8} {'queue avg/max':>14}")
+        for stage in [*self.stats, self.output_stats]:
+            depth = "-" if stage is self.stats[0] else f"{stage.depth_mean:.1f}/{stage.depth_max}"
+            print(f"  {stage.name:8} {stage.workers:7d} {stage.items:6d} {stage.utilization(self.elapsed):6.0%} "
+                  f"{stage.starved:7.1f}s {stage.blocked:7.1f}s {depth:>14}")
+        bottleneck = self.bottleneck()
+        if bottleneck:
+            print(f"--- Bottleneck: {bottleneck} ---")
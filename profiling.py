@@ -0,0 +1,180 @@
+# profiling.py
+"""Built-in profiling for a scraper run (`scraper.py --profile`).
+
+Runs under cProfile and tracemalloc while `span()` blocks record wall time per
+stage (fetch per company, decode, parse, each filter). The report is written as:
+
+  <prefix>.folded  span stacks in folded format (flamegraph.pl, speedscope, ...)
+  <prefix>.prof    cProfile stats (snakeviz, pstats)
+  <prefix>.txt     stage times, top-N hot functions and top-N allocation sites
+
+Every thread of the run is profiled: the pipeline's fetch, parse and filter
+workers each get their own profiler (cProfile only sees the thread that enabled
+it before Python 3.12), merged into one set of stats for the report. Work done
+in --parse-workers processes shows up as time spent waiting on the pool.
+"""
+import cProfile
+import io
+import os
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+TOP_N = 20
+TRACEMALLOC_FRAMES = 10
+
+# From Python 3.12 cProfile hooks sys.monitoring, which already sees every thread
+_PROFILES_ALL_THREADS = sys.version_info >= (3, 12)
+
+# The profiler of the current run, if any; span() is a no-op without one
+_active: Optional["RunProfiler"] = None
+
+
+@contextmanager
+def span(name: str):
+    """Records the wall time of a stage under the enclosing spans of this thread."""
+    profiler = _active
+    if profiler is None:
+        yield
+        return
+
+    profiler._enter(name)
+    try:
+        yield
+    finally:
+        profiler._exit()
+
+
+class RunProfiler:
+    def __init__(self, top_n: int = TOP_N):
+        self.top_n = top_n
+        self.profile = cProfile.Profile()
+        # one per thread started during the run, when the main profile can't see them
+        self.thread_profiles: List[cProfile.Profile] = []
+        self.snapshot: Optional[tracemalloc.Snapshot] = None
+        self.peak_bytes = 0
+        # folded stack ("run;fetch clio;decode") -> self time in ns, and call counts
+        self.self_time_ns: Dict[str, int] = defaultdict(int)
+        self.calls: Dict[str, int] = defaultdict(int)
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def __enter__(self) -> "RunProfiler":
+        global _active
+        _active = self
+        tracemalloc.start(TRACEMALLOC_FRAMES)
+        if not _PROFILES_ALL_THREADS:
+            threading.setprofile(self._profile_thread)
+        self.profile.enable()
+        return self
+
+    def __exit__(self, *exc_info):
+        global _active
+        self.profile.disable()
+        if not _PROFILES_ALL_THREADS:
+            threading.setprofile(None)
+        self.snapshot = tracemalloc.take_snapshot()
+        self.peak_bytes = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        _active = None
+
+    def _profile_thread(self, frame, event, arg):
+        """Runs once in each new thread (as its first profile event) and hands it a profiler of its own."""
+        profile = cProfile.Profile()
+        with self._lock:
+            self.thread_profiles.append(profile)
+        profile.enable()
+
+    def _enter(self, name: str):
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        # [name, start, time spent in child spans]
+        stack.append([name, time.perf_counter_ns(), 0])
+
+    def _exit(self):
+        stack = self._local.stack
+        key = ";".join(frame[0] for frame in stack)
+        name, start, child_ns = stack.pop()
+        elapsed = time.perf_counter_ns() - start
+        if stack:
+            stack[-1][2] += elapsed
+        with self._lock:
+            self.self_time_ns[key] += elapsed - child_ns
+            self.calls[key] += 1
+
+    def report(self, prefix: str):
+        """Writes the folded stacks, cProfile stats and text summary, and prints the summary."""
+        os.makedirs(os.path.dirname(prefix) or ".", exist_ok=True)
+
+        with open(f"{prefix}.folded", "w") as f:
+            for stack, ns in sorted(self.self_time_ns.items()):
+                # folded format wants integer sample weights; use microseconds
+                f.write(f"{stack} {max(ns // 1000, 1)}\n")
+        self._stats().dump_stats(f"{prefix}.prof")
+
+        summary = self.summary()
+        with open(f"{prefix}.txt", "w") as f:
+            f.write(summary)
+
+        print(summary)
+        print(f"Profile written to {prefix}.folded, {prefix}.prof and {prefix}.txt")
+
+    def summary(self) -> str:
+        lines = ["--- Stage times (inclusive) ---"]
+        for stack, total_ns, calls in self._inclusive_times():
+            lines.append(f"  {total_ns / 1e6:10.1f} ms  {calls:6d}x  {stack}")
+
+        lines.append(f"\n--- Top {self.top_n} functions by cumulative time ---")
+        lines.append(self._pstats("cumulative"))
+        lines.append(f"--- Top {self.top_n} functions by own time ---")
+        lines.append(self._pstats("tottime"))
+
+        lines.append(f"--- Top {self.top_n} allocation sites still held at the end of the run "
+                     f"(peak traced: {self.peak_bytes / 1024 / 1024:.1f} MiB) ---")
+        lines.extend(self._allocations())
+        return "\n".join(lines) + "\n"
+
+    def _inclusive_times(self) -> List[tuple]:
+        inclusive: Dict[str, int] = defaultdict(int)
+        for stack, ns in self.self_time_ns.items():
+            parts = stack.split(";")
+            for depth in range(1, len(parts) + 1):
+                inclusive[";".join(parts[:depth])] += ns
+        return sorted(((stack, ns, self.calls.get(stack, 0)) for stack, ns in inclusive.items()),
+                      key=lambda item: item[1], reverse=True)
+
+    def _pstats(self, sort_key: str) -> str:
+        stream = io.StringIO()
+        stats = self._stats()
+        stats.stream = stream
+        stats.strip_dirs().sort_stats(sort_key).print_stats(self.top_n)
+        return stream.getvalue()
+
+    def _stats(self) -> pstats.Stats:
+        """The main thread's stats merged with every worker thread's."""
+        stats = pstats.Stats()
+        with self._lock:
+            profiles = [self.profile, *self.thread_profiles]
+        for profile in profiles:
+            try:
+                stats.add(profile)
+            except TypeError:  # a profile that recorded nothing
+                continue
+        return stats
+
+    def _allocations(self) -> List[str]:
+        if self.snapshot is None:
+            return []
+        snapshot = self.snapshot.filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+        ))
+        return [f"  {stat.size / 1024:10.1f} KiB  {stat.count:7d} blocks  {stat.traceback[0]}"
+                for stat in snapshot.statistics("lineno")[:self.top_n]]
@@ -5,18 +5,136 @@ import sys
 import re
 import json
 import os
-from typing import Any, Dict, List, Optional, Set
+import argparse
+import importlib
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Set, Tuple
 from datetime import datetime, timezone, timedelta
-from company_configs import COMPANY_CONFIGS, CompanyConfig
-from constants import EXCLUDE_LOCATION_KEY_WORDS, TERMS_TO_EXCLUDE, MAX_AGE_FOR_JOB_IN_DAYS, APPLIED_JOBS_FILE, LOCATION_KEY_WORDS, TIMESTAMP_MILLISECOND_THRESHOLD, MILLISECONDS_PER_SECOND
+from company_configs import CompanyConfig, load_company_configs
+from decoders import DECODER_BACKENDS, get_decoder
+from constants import MAX_AGE_FOR_JOB_IN_DAYS, APPLIED_JOBS_FILE, LAST_RESULTS_FILE, HISTORY_DIR, PROFILE_OUTPUT_PREFIX, DEFAULT_FETCH_WORKERS, PAGE_FETCH_CONCURRENCY, PIPELINE_QUEUE_SIZE, REQUEST_TIMEOUT_SECONDS, MIN_REQUEST_TIMEOUT_SECONDS, TIMESTAMP_MILLISECOND_THRESHOLD, MILLISECONDS_PER_SECOND
+from locations import is_relevant_location
+from titles import is_relevant_title
+from workday_facets import WorkdayFacetResolver
+from profiling import RunProfiler, span
+from coalescing import RequestCoalescer, RequestKey, request_key
+from transport import TRANSPORTS, Transport, get_transport
+from pipeline import Pipeline, Stage
+from pagination import PAGE_SCHEMES, PageFetcher
+
+if TYPE_CHECKING:  # imported when an output or snapshot store is in use
+    from analytics import TrendStore
+    from sinks import OutputSink
+
+# Parse-only scraper used inside each worker process of the parse pool
+_worker_scraper: Optional["JobScraper"] = None
+
+
+# Whether workers also send back every parsed posting, for the snapshot stores
+_worker_returns_parsed = False
+
+
+def _init_parse_worker(applied_ids_by_company: Dict[str, Set[str]], decoder: str, return_parsed: bool = False):
+    """Builds the per-process scraper once, so tasks only ship payload bytes."""
+    global _worker_scraper, _worker_returns_parsed
+    _worker_scraper = JobScraper({}, decoder=decoder, transport="http1")
+    _worker_scraper.applied_ids_by_company = applied_ids_by_company
+    _worker_returns_parsed = return_parsed
+
+
+def _parse_in_worker(company: str, config: CompanyConfig,
+                     payload: bytes) -> Tuple[int, List[JobPosting], Optional[List[JobPosting]]]:
+    """Decodes, parses and pre-filters one payload inside a pool worker."""
+    parsed = _worker_scraper._decode_and_parse(company, config, payload)
+    return len(parsed), _worker_scraper._filter_jobs(parsed), parsed if _worker_returns_parsed else None
+
+
+def load_last_results(path: str = LAST_RESULTS_FILE) -> Dict[str, Dict[str, Any]]:
+    """Each board's last fresh postings: company -> {"fetched_at": ..., "jobs": [...]}."""
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path, 'r') as f:
+            return json.load(f)
+    except (json.JSONDecodeError, IOError) as e:
+        print(f"Warning: Could not load last results: {e}")
+        return {}
+
+
+def save_last_results(fresh_by_company: Dict[str, List[JobPosting]], path: str = LAST_RESULTS_FILE):
+    """Remembers each completed board's fresh postings, to stand in for it if it straggles later.
+
+    The file is replaced in one rename, so readers never see a half-written one.
+    """
+    if not fresh_by_company:
+        return
+    last_results = load_last_results(path)
+    fetched_at = datetime.now(timezone.utc).isoformat()
+    for name, jobs in fresh_by_company.items():
+        last_results[name] = {"fetched_at": fetched_at, "jobs": [job.to_dict() for job in jobs]}
+    staged = f"{path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(staged, 'w') as f:
+            json.dump(last_results, f)
+        os.replace(staged, path)
+    except IOError as e:
+        print(f"Warning: Could not save last results: {e}")
+
 
 class JobScraper:
-    def __init__(self, configs: dict):
+    def __init__(self, configs: dict, parse_workers: int = 0, decoder: str = "auto",
+                 fetch_workers: int = DEFAULT_FETCH_WORKERS, deadline: Optional[float] = None,
+                 sinks: Optional[List["OutputSink"]] = None, snapshots: Optional[List[Any]] = None,
+                 transport: str = "auto", queue_size: int = PIPELINE_QUEUE_SIZE,
+                 last_results_file: Optional[str] = LAST_RESULTS_FILE):
         self.configs = configs
-        self.session = requests.Session()
-        self.session.headers.update({"User-Agent": "MyJobScraper/1.0"})
+        # where each board's last fresh postings are kept for straggler fallback; None keeps none
+        self.last_results_file = last_results_file
+        self.sinks = sinks or []
+        # stores given each fetched board's complete parsed postings via record(company, jobs)
+        self.snapshots = snapshots or []
+        self.parse_workers = parse_workers
+        self.fetch_workers = fetch_workers
+        # bound on the payloads (and parsed boards) waiting between stages
+        self.queue_size = queue_size
+        self.pipeline: Optional[Pipeline] = None
+        self.deadline = deadline
+        self._deadline_at: Optional[float] = None
+        self.stragglers: List[str] = []
+        self.decoder_backend = decoder
+        self.decoder = get_decoder(decoder)
+        self.transport_backend = transport
+        # opened by the first run, once it's known how many boards it fetches; see _open_transport
+        self.transport: Optional[Transport] = None
+        self.facet_resolver = WorkdayFacetResolver(None)
+        self.coalescer = RequestCoalescer(self._send)
         self.applied_ids_by_company = self._load_applied_jobs()
 
+    def __enter__(self) -> "JobScraper":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Closes the transport's connections; a later run opens a new one."""
+        if self.transport is not None:
+            self.transport.close()
+            self.transport = None
+
+    def _open_transport(self, boards: int):
+        transport = self.transport_backend
+        if transport == "auto" and boards <= 1:
+            # a single board has nothing to multiplex, so don't load httpx for it
+            transport = "http1"
+        # every fetch worker can have a paged board's pages in flight at once
+        self.transport = get_transport(transport, max_connections=self.fetch_workers * PAGE_FETCH_CONCURRENCY)
+        self.facet_resolver.transport = self.transport
+
     def _load_applied_jobs(self) -> Dict[str, Set[str]]:
         """Loads applied job IDs from the JSON file."""
         if not os.path.exists(APPLIED_JOBS_FILE):
@@ -40,8 +158,12 @@ class JobScraper:
         except IOError as e:
             print(f"Error: Could not save applied jobs: {e}")
 
-    def run(self, specific_companies: Optional[List[str]] = None):
-        """Main method to run the entire scraping and filtering process."""
+    def run(self, specific_companies: Optional[List[str]] = None) -> List[JobPosting]:
+        """Main method to run the entire scraping and filtering process. Returns the fresh postings."""
+        with span("run"):
+            return self._run(specific_companies)
+
+    def _run(self, specific_companies: Optional[List[str]] = None) -> List[JobPosting]:
         companies_to_scrape = self.configs
 
         if specific_companies:
@@ -51,47 +173,250 @@ class JobScraper:
             }
 
         print("--- Starting Job Scraper ---")
-        all_jobs = self._fetch_and_parse_all_jobs(companies_to_scrape)
-
-        print(f"\n--- Found {len(all_jobs)} total jobs. Filtering... ---")
-        fresh_jobs = self._filter_jobs(all_jobs)
+        self._deadline_at = time.monotonic() + self.deadline if self.deadline else None
+        self.stragglers = []
+        if self.transport is None:
+            self._open_transport(len(companies_to_scrape))
+        # responses are shared within a run, never across runs, and kept only until the last board sending them
+        expected = Counter(key for key in map(self._request_key, companies_to_scrape.values()) if key is not None)
+        self.coalescer = RequestCoalescer(self._send, expected)
 
-        if fresh_jobs:
+        try:
+            total_jobs, fresh_by_company = self._fetch_and_filter(companies_to_scrape)
+            if self.parse_workers > 0:
+                print(f"\n--- Found {total_jobs} total jobs. Filtered in {self.parse_workers} worker processes ---")
+            else:
+                print(f"\n--- Found {total_jobs} total jobs. Filtered in process ---")
+            self.pipeline.report()
+
+            if self.coalescer.coalesced:
+                print(f"--- {self.coalescer.coalesced} identical request(s) shared a response; "
+                      f"{self.coalescer.sent} sent ---")
+            self._save_last_results(fresh_by_company)
+            fresh_jobs = [job for jobs in fresh_by_company.values() for job in jobs]
+            stale_jobs = self._report_stragglers()
+            self._emit(stale_jobs)
+            fresh_jobs.extend(stale_jobs)
+        finally:
+            for sink in self.sinks:
+                sink.flush()
+
+        if fresh_jobs and self.sinks:
+            print(f"\n Found {len(fresh_jobs)} new, relevant jobs, written to "
+                  f"{', '.join(sink.path for sink in self.sinks)}")
+        elif fresh_jobs:
             print(f"\n Found {len(fresh_jobs)} new, relevant jobs to review:")
             for job in fresh_jobs:
                 print(
                     f"  - {job.title} at {job.company.title()} ({job.location}) | ID: {job.job_id}")
         else:
             print("\nNo new relevant jobs found.")
+        return fresh_jobs
+
+    def _record_snapshot(self, company: str, parsed: List[JobPosting]):
+        """Hands a board's complete parsed postings to every snapshot store."""
+        with span("record snapshot"):
+            for store in self.snapshots:
+                store.record(company, parsed)
+
+    def _emit(self, jobs: List[JobPosting]):
+        """Hands postings that passed the filters to every output sink."""
+        for sink in self.sinks:
+            for job in jobs:
+                sink.write(job)
+
+    def _fetch_and_filter(self, companies_to_scrape: Dict[str, CompanyConfig]) -> Tuple[int, Dict[str, List[JobPosting]]]:
+        """Runs the boards through the fetch -> parse -> filter stages and outputs each as it comes out.
+
+        With parse_workers > 0, each parse worker hands its payloads to a process
+        of the parse pool. Pool processes decode, parse and pre-filter, so only
+        the postings travel back. Stops at the run deadline: boards not through
+        by then are recorded in self.stragglers. Requests already in flight end
+        at their timeout, which is capped to the time left.
+        """
+        total_jobs = 0
+        fresh_by_company = {}
+        self._failed: Set[str] = set()
+        pool = None
+        if self.parse_workers > 0:
+            pool = ProcessPoolExecutor(max_workers=self.parse_workers,
+                                       initializer=_init_parse_worker,
+                                       initargs=(self.applied_ids_by_company, self.decoder_backend,
+                                                 bool(self.snapshots)))
+        self.pipeline = Pipeline([
+            Stage("fetch", self._fetch_stage, self.fetch_workers),
+            Stage("parse", partial(self._parse_stage, pool), self.parse_workers),
+            # filtering is pure-Python string matching, so more threads would only contend for the GIL
+            Stage("filter", self._filter_stage),
+        ], queue_size=self.queue_size)
+        try:
+            for name, parsed_count, parsed, fresh in self.pipeline.run(companies_to_scrape.items(),
+                                                                      timeout=self._remaining_time):
+                total_jobs += parsed_count
+                if parsed is not None:
+                    self._record_snapshot(name, parsed)
+                fresh_by_company[name] = fresh
+                self._emit(fresh)
+        finally:
+            if pool is not None:
+                pool.shutdown(wait=self._deadline_at is None, cancel_futures=True)
+            self.stragglers.extend(name for name in companies_to_scrape
+                                   if name not in fresh_by_company and name not in self._failed)
+        return total_jobs, fresh_by_company
+
+    def _fetch_stage(self, item: Tuple[str, CompanyConfig]) -> Optional[Tuple[str, CompanyConfig, bytes]]:
+        name, config = item
+        try:
+            return name, config, self._fetch_company(name, config)
+        except (requests.exceptions.RequestException, ValueError) as e:
+            # ValueError: a body that had to be read while fetching (Workday totals, feed pages) isn't JSON
+            print(f"Error fetching jobs for {name.title()}: {e}")
+            self._failed.add(name)
+            return None
 
-    def _fetch_and_parse_all_jobs(self, companies_to_scrape: Dict[str, CompanyConfig]) -> List[JobPosting]:
-        all_parsed_jobs = []
-        for name, config in companies_to_scrape.items():
-            print(f"Fetching jobs for {name.title()}...")
-            try:
-                if config.http_method.upper() == "POST":
-                    response = self.session.post(
-                        config.api_url, json=config.body, timeout=10)
-                else:
-                    response = self.session.get(config.api_url, timeout=10)
-                response.raise_for_status()
-
-                json_data = response.json()
-                
-                if hasattr(config, 'data_path') and config.data_path: 
-                    jobs_list = json_data
-                    for key in config.data_path:
-                        jobs_list = jobs_list[key]
-                
-                else: 
-                    jobs_list = json_data
+    def _parse_stage(self, pool: Optional[ProcessPoolExecutor], item: Tuple[str, CompanyConfig, bytes]):
+        """(name, payload) -> (name, parsed count, parsed postings or None, fresh postings or None if unfiltered)."""
+        name, config, payload = item
+        try:
+            if pool is None:
+                parsed = self._decode_and_parse(name, config, payload)
+                return name, len(parsed), parsed, None
+            with span("wait for parse workers"):
+                parsed_count, fresh, parsed = pool.submit(_parse_in_worker, name, config, payload).result()
+            return name, parsed_count, parsed, fresh
+        except (ValueError, KeyError, TypeError) as e:
+            print(f"Error parsing jobs for {name.title()}: {e}")
+            self._failed.add(name)
+            return None
 
-                parsed = self._parse_response(name, config, jobs_list)
-                
-                all_parsed_jobs.extend(parsed)
-            except requests.exceptions.RequestException as e:
-                print(f"Error fetching jobs for {name.title()}: {e}")
-        return all_parsed_jobs
+    def _filter_stage(self, item: Tuple[str, int, Optional[List[JobPosting]], Optional[List[JobPosting]]]):
+        name, parsed_count, parsed, fresh = item
+        if fresh is None:
+            fresh = self._filter_jobs(parsed)
+        return name, parsed_count, parsed, fresh
+
+    def _fetch_company(self, name: str, config: CompanyConfig) -> bytes:
+        print(f"Fetching jobs for {name.title()}...")
+        with span(f"fetch {name}"):
+            return self._fetch_payload(config)
+
+    def _remaining_time(self) -> Optional[float]:
+        """Seconds left before the run deadline, or None when there is no deadline."""
+        if self._deadline_at is None:
+            return None
+        return max(self._deadline_at - time.monotonic(), 0)
+
+    def _request_timeout(self) -> float:
+        remaining = self._remaining_time()
+        if remaining is None:
+            return REQUEST_TIMEOUT_SECONDS
+        return max(min(REQUEST_TIMEOUT_SECONDS, remaining), MIN_REQUEST_TIMEOUT_SECONDS)
+
+    def _load_last_results(self) -> Dict[str, Dict[str, Any]]:
+        return load_last_results(self.last_results_file) if self.last_results_file else {}
+
+    def _save_last_results(self, fresh_by_company: Dict[str, List[JobPosting]]):
+        if self.last_results_file:
+            save_last_results(fresh_by_company, self.last_results_file)
+
+    def _report_stragglers(self) -> List[JobPosting]:
+        """Reports boards that missed the deadline and returns their last cached fresh postings."""
+        if not self.stragglers:
+            return []
+
+        print(f"\n--- {len(self.stragglers)} board(s) missed the {self.deadline:g}s deadline ---")
+        last_results = self._load_last_results()
+        stale_jobs = []
+        for name in self.stragglers:
+            cached = last_results.get(name)
+            if not cached:
+                print(f"  - {name.title()}: no cached results")
+                continue
+            jobs = self._filter_jobs([JobPosting.from_dict(job) for job in cached["jobs"]])
+            print(f"  - {name.title()}: using cached results from {cached['fetched_at']} ({len(jobs)} jobs)")
+            stale_jobs.extend(jobs)
+        return stale_jobs
+
+    def _fetch_payload(self, config: CompanyConfig) -> bytes:
+        """Requests a company's job API and returns the raw response body."""
+        if config.parser_key == "workday" and config.facet_names:
+            return self._fetch_workday_payload(config)
+        if config.parser_key in PAGE_SCHEMES and config.http_method.upper() == "GET":
+            return self._fetch_pages(config)
+        return self._request(config, config.body)
+
+    def _fetch_pages(self, config: CompanyConfig) -> bytes:
+        """Fetches a paginated feed (Jibe, Lever) page by page and merges the pages; see pagination.py."""
+        # Snapshot stores diff complete boards, so paging only stops at the age cutoff without them
+        max_age_days = None if self.snapshots else MAX_AGE_FOR_JOB_IN_DAYS
+        fetcher = PageFetcher(lambda url: self.coalescer.fetch("GET", url), self._parse_date, max_age_days)
+        pages = fetcher.fetch_all(PAGE_SCHEMES[config.parser_key], config.api_url, config.job_age_key)
+        if pages.truncated:
+            print(f"Warning: {config.api_url} has more than {fetcher.max_pages} pages; only the first "
+                  f"{fetcher.max_pages} were read, so later postings look closed in the history and trends")
+        return pages.payload
+
+    def _request_key(self, config: CompanyConfig) -> Optional[RequestKey]:
+        """The key of a board fetched with its configured request, or None if its requests are built while fetching."""
+        if config.parser_key == "workday" and config.facet_names:
+            return None
+        if config.parser_key in PAGE_SCHEMES and config.http_method.upper() == "GET":
+            return None
+        body = config.body if config.http_method.upper() == "POST" else None
+        return request_key(config.http_method, config.api_url, body)
+
+    def _request(self, config: CompanyConfig, body: Optional[Dict[str, Any]]) -> bytes:
+        """Sends a board request, or shares the response of an identical one already sent this run."""
+        if config.http_method.upper() != "POST":
+            body = None
+        return self.coalescer.fetch(config.http_method, config.api_url, body)
+
+    def _send(self, method: str, url: str, body: Optional[Dict[str, Any]]) -> bytes:
+        return self.transport.request(method, url, body, timeout=self._request_timeout())
+
+    def _fetch_workday_payload(self, config: CompanyConfig) -> bytes:
+        """Fetches a Workday board with its facet_names resolved to the tenant's current facet IDs.
+
+        If the resolved facets return no jobs and the cached catalog looks stale
+        (see WorkdayFacetResolver.is_stale), it's re-fetched once before trying
+        again with any new IDs.
+        """
+        resolved = self.facet_resolver.resolve(config)
+        payload = self._request(config, self._with_applied_facets(config, resolved))
+
+        if resolved and self.facet_resolver.is_stale(config.api_url, resolved, json.loads(payload)):
+            refreshed = self.facet_resolver.resolve(config, refresh=True)
+            if refreshed != resolved:
+                payload = self._request(config, self._with_applied_facets(config, refreshed))
+        return payload
+
+    def _with_applied_facets(self, config: CompanyConfig, resolved: Dict[str, List[str]]) -> Dict[str, Any]:
+        body = dict(config.body or {})
+        body["appliedFacets"] = {**body.get("appliedFacets", {}), **resolved}
+        return body
+
+    def _decode_and_parse(self, company: str, config: CompanyConfig, payload: bytes) -> List[JobPosting]:
+        """Decodes a raw payload, walks the config's data_path and parses the postings."""
+        if self.decoder and self.decoder.supports(config):
+            with span("decode (typed)"):
+                records = self.decoder.decode(config, payload)
+            if records is not None:
+                with span("_parse_typed_records"):
+                    return self._parse_typed_records(company, config, records)
+
+        with span("decode"):
+            json_data = json.loads(payload)
+
+        if hasattr(config, 'data_path') and config.data_path: 
+            jobs_list = json_data
+            for key in config.data_path:
+                jobs_list = jobs_list[key]
+        
+        else: 
+            jobs_list = json_data
+
+        with span("_parse_response"):
+            return self._parse_response(company, config, jobs_list)
 
     def _parse_response(self, company: str, config: CompanyConfig, data: dict) -> List[JobPosting]:
         """Routes to the correct parser based on the config's parser_key."""
@@ -185,9 +510,6 @@ class JobScraper:
     def _filter_jobs_by_location_fe(self, jobs, key):
         result = []
 
-        included_areas = [kw.upper() for kw in LOCATION_KEY_WORDS]
-        excluded_areas = [kw.upper() for kw in EXCLUDE_LOCATION_KEY_WORDS]
-
         keys = key.split('.')
 
         for raw_job in jobs:
@@ -195,25 +517,22 @@ class JobScraper:
 
             try:
                 for key in keys: 
-                    location_value = location_value[key]
+                    if isinstance(location_value, list):
+                        # e.g. "locations.name" over a list of location objects
+                        location_value = [item[key] for item in location_value if key in item]
+                    else:
+                        location_value = location_value[key]
             except (KeyError, TypeError):
                 location_value = ""
             
-            # TODO: modify logic below to handle a list of locations
-            # we can check if it's a list. For each location in locations list
-            # we convert it to a name as below 
-            location_name = str(location_value).upper()
-
-            # TODO: see if logic works for a lists of locations? 
-            valid_locations = any(kw in location_name for kw in included_areas)
-            invalid_locations = any(kw in location_name for kw in excluded_areas)
-
-            if valid_locations and not invalid_locations:
+            if self._is_relevant_location(location_value):
                 result.append(raw_job)
-                # TODO: break the loop once it ends? 
-                # TODO: create unit tests for these?
                 
         return result
+
+    def _is_relevant_location(self, location_value: Any) -> bool:
+        """Matches a raw location (string, dict or list) on its normalized city/province/country."""
+        return is_relevant_location(location_value)
     
     def _filter_jobs_by_domain(self, jobs, key, target_domain_id): 
         result = []
@@ -229,11 +548,10 @@ class JobScraper:
     def _parse_greenhouse_jobs(self, company: str, config: CompanyConfig, data: dict) -> List[JobPosting]:
         result = []
         jobs = data.get("jobs", [])
-        location_relevant_jobs = self._filter_jobs_by_location_fe(jobs, key="locations.name")
+        location_relevant_jobs = self._filter_jobs_by_location_fe(jobs, key="location.name")
 
         for raw_job in location_relevant_jobs:
             job_id = str(raw_job.get(config.job_id_key, ""))
-            print("job_id =>", job_id)
             if not job_id:
                 continue
 
@@ -257,7 +575,8 @@ class JobScraper:
                 title=raw_job.get("text"),
                 url=raw_job.get("applyUrl"),
                 location=raw_job.get("categories", {}).get("location"),
-                posted_date=self._parse_date(raw_job.get(config.job_age_key))
+                posted_date=self._parse_date(raw_job.get(config.job_age_key)),
+                team=raw_job.get("categories", {}).get("team")
             ))
 
         return result
@@ -265,7 +584,9 @@ class JobScraper:
     def _parse_ashbyhq_jobs(self, company: str, config: CompanyConfig, data: dict) -> List[JobPosting]:
         result = []
         location_relevant_jobs = self._filter_jobs_by_location_fe(data, key="locationName")
-        domain_relevant_jobs = self._filter_jobs_by_domain(location_relevant_jobs, key="teamId", target_domain_id=config.team_id)
+        domain_relevant_jobs = location_relevant_jobs
+        if config.team_id:
+            domain_relevant_jobs = self._filter_jobs_by_domain(location_relevant_jobs, key="teamId", target_domain_id=config.team_id)
 
         for raw_job in domain_relevant_jobs:
             job_id = raw_job.get(config.job_id_key)
@@ -276,7 +597,8 @@ class JobScraper:
                 company=company,
                 job_id=raw_job.get(config.job_id_key),
                 title=raw_job.get("title"),
-                location=raw_job.get("locationName")
+                location=raw_job.get("locationName"),
+                team=raw_job.get("teamId")
             ))
 
         return result
@@ -309,37 +631,246 @@ class JobScraper:
         for job in data: 
             print(job["locations"])
 
-    def _is_relevant_title(self, title: Optional[str]) -> bool:
-        if not title:
-            return False
+    def _parse_typed_records(self, company: str, config: CompanyConfig, records: Any) -> List[JobPosting]:
+        """Builds postings from typed decoder records, mirroring the _parse_*_jobs methods."""
+        result = []
 
-        title_upper = title.upper()
-        to_exclude = any(term in title_upper for term in TERMS_TO_EXCLUDE)
+        if config.parser_key == "workday":
+            for raw_job in records.jobPostings:
+                if not raw_job.bulletFields:
+                    continue
+
+                job_id = raw_job.bulletFields[0]
+                location = raw_job.locationsText
+
+                if company == "accolade":
+                    job_id = raw_job.bulletFields[1]
+                    location = raw_job.bulletFields[0]
+
+                result.append(JobPosting(
+                    company=company,
+                    job_id=job_id,
+                    title=raw_job.title,
+                    url=config.career_page_url,
+                    location=location,
+                    posted_date=self._parse_date(raw_job.postedOn)
+                ))
 
-        return not to_exclude
+        elif config.parser_key == "greenhouse":
+            for raw_job in records.jobs:
+                location = raw_job.location.name if raw_job.location else None
+                if not self._is_relevant_location(location or ""):
+                    continue
+
+                job_id = "" if raw_job.id is None else str(raw_job.id)
+                if not job_id:
+                    continue
+
+                result.append(JobPosting(
+                    company=company,
+                    job_id=job_id,
+                    title=raw_job.title,
+                    url=raw_job.absolute_url,
+                    location=location,
+                    posted_date=self._parse_date(raw_job.first_published)
+                ))
+
+        elif config.parser_key == "lever":
+            for raw_job in records:
+                result.append(JobPosting(
+                    company=company,
+                    job_id=raw_job.id,
+                    title=raw_job.text,
+                    url=raw_job.applyUrl,
+                    location=raw_job.categories.location if raw_job.categories else None,
+                    posted_date=self._parse_date(raw_job.createdAt),
+                    team=raw_job.categories.team if raw_job.categories else None
+                ))
+
+        elif config.parser_key == "ashbyhq":
+            for raw_job in records:
+                if not self._is_relevant_location(raw_job.locationName or ""):
+                    continue
+                if (config.team_id and raw_job.teamId != config.team_id) or not raw_job.id:
+                    continue
+
+                result.append(JobPosting(
+                    company=company,
+                    job_id=raw_job.id,
+                    title=raw_job.title,
+                    location=raw_job.locationName,
+                    team=raw_job.teamId
+                ))
+
+        elif config.parser_key == "github":
+            for job in records.jobs:
+                data = job.data
+                if data is None:
+                    continue
+
+                result.append(JobPosting(
+                    company=company,
+                    job_id=data.req_id,
+                    title=data.title,
+                    location=data.location_name,
+                    posted_date=self._parse_date(data.posted_date)
+                ))
+
+        return result
+
+    def _is_relevant_title(self, title: Optional[str]) -> bool:
+        """Title filter: see titles.py and the EXCLUDE_* title rules in constants.py."""
+        return is_relevant_title(title)
 
     def _filter_jobs(self, jobs: List[JobPosting]) -> List[JobPosting]:
-        final_jobs = []
+        """Applies each filter as its own pass, so profiles can attribute time per filter."""
         today = datetime.now(timezone.utc)
 
-        for job in jobs:
-            if job.job_id in self.applied_ids_by_company.get(job.company, set()):
-                continue
-            if not self._is_relevant_title(job.title):
-                continue
-            if job.posted_date and (today - job.posted_date).days > MAX_AGE_FOR_JOB_IN_DAYS:
-                continue
-
-            final_jobs.append(job)
+        with span("filter applied"):
+            jobs = [job for job in jobs
+                    if job.job_id not in self.applied_ids_by_company.get(job.company, set())]
+        with span("filter title"):
+            jobs = [job for job in jobs if self._is_relevant_title(job.title)]
+        with span("filter age"):
+            jobs = [job for job in jobs
+                    if not (job.posted_date and (today - job.posted_date).days > MAX_AGE_FOR_JOB_IN_DAYS)]
 
-        return final_jobs
+        return jobs
 
 
-if __name__ == "__main__":
-    if len(sys.argv) > 1:
-        company_list = sys.argv[1:]
+def parse_duration(value: str) -> float:
+    """Parses a duration like "30s", "2m", "500ms" or "45" (seconds) into seconds."""
+    match = re.fullmatch(r"(\d+(?:\.\d+)?)(ms|s|m|h)?", value.strip())
+    if not match:
+        raise argparse.ArgumentTypeError(f"invalid duration: {value!r} (use e.g. 30s, 2m, 500ms)")
+    amount, unit = float(match.group(1)), match.group(2) or "s"
+    return amount * {"ms": 0.001, "s": 1, "m": 60, "h": 3600}[unit]
+
+
+def build_parser(description: str = "Find fresh, relevant jobs from company job boards.") -> argparse.ArgumentParser:
+    """The scrape options, shared by the default command and subcommands that run a scrape."""
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument("companies", nargs="*",
+                        help="company key names to scrape (default: all configured companies)")
+    parser.add_argument("--parse-workers", type=int, default=0, metavar="N",
+                        help="decode and parse payloads in N worker processes (default: in-process)")
+    parser.add_argument("--fetch-workers", type=int, default=DEFAULT_FETCH_WORKERS, metavar="N",
+                        help=f"number of boards fetched concurrently (default: {DEFAULT_FETCH_WORKERS})")
+    parser.add_argument("--queue-size", type=int, default=PIPELINE_QUEUE_SIZE, metavar="N",
+                        help="boards held between pipeline stages before the stage feeding them waits; "
+                             f"lower it to cap memory (default: {PIPELINE_QUEUE_SIZE})")
+    parser.add_argument("--deadline", type=parse_duration, default=None, metavar="DURATION",
+                        help="run time budget, e.g. 30s; boards not fetched by then fall back to their last cached results")
+    parser.add_argument("--output", action="append", default=[], metavar="PATH",
+                        help="also write fresh postings to PATH (.ndjson/.jsonl, .csv, optionally .gz, "
+                             "or a .db/.sqlite table); repeat for several outputs")
+    parser.add_argument("--profile", action="store_true",
+                        help="profile the run (cProfile, tracemalloc and per-stage spans) and write a report")
+    parser.add_argument("--profile-output", default=PROFILE_OUTPUT_PREFIX, metavar="PREFIX",
+                        help=f"path prefix for the profile report files (default: {PROFILE_OUTPUT_PREFIX})")
+    parser.add_argument("--decoder", choices=DECODER_BACKENDS, default="auto",
+                        help="JSON decode backend: typed msgspec structs or the pure-Python path (default: auto)")
+    parser.add_argument("--transport", choices=TRANSPORTS, default="auto",
+                        help="HTTP transport: multiplexed HTTP/2 (httpx) or a requests HTTP/1.1 session (default: auto)")
+    parser.add_argument("--no-history", dest="history", action="store_false",
+                        help=f"don't append this run's parsed postings to the {HISTORY_DIR}/ archive")
+    parser.add_argument("--no-trends", dest="trends", action="store_false",
+                        help="don't update the hiring-trend aggregates shown by `scraper.py stats`")
+    parser.add_argument("--due-only", action="store_true",
+                        help="only scrape boards whose poll interval (from their hiring trends) has passed")
+    return parser
+
+
+def validate_args(parser: argparse.ArgumentParser, args: argparse.Namespace) -> argparse.Namespace:
+    if args.due_only and not args.trends:
+        # without trends no run is recorded, so every board would always be due
+        parser.error("--due-only needs the hiring trends that --no-trends turns off")
+    if args.output:
+        from sinks import sink_format
+    for path in args.output:
+        if sink_format(path) is None:
+            parser.error(f"unknown output format for {path}")
+    return args
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = build_parser()
+    return validate_args(parser, parser.parse_args(argv))
+
+
+def select_configs(args: argparse.Namespace, trends: Optional["TrendStore"]) -> Dict[str, CompanyConfig]:
+    """Loads the configs of the requested companies, or only those due for polling with --due-only."""
+    configs = load_company_configs(args.companies or None)
+    for name in args.companies:
+        if name not in configs:
+            print(f"Warning: No config found for company: {name}")
+
+    if args.due_only:
+        due = {name: config for name, config in configs.items() if trends.is_due(name)}
+        print(f"{len(due)} of {len(configs)} boards are due for polling")
+        configs = due
+    return configs
+
+
+def scrape(args: argparse.Namespace) -> List[JobPosting]:
+    """Runs a scrape with the parsed scrape options and returns the fresh postings."""
+    company_list = args.companies or None
+    # the stores (and sinks) are only imported when their feature is on, to keep startup short
+    trends = None
+    if args.trends or args.due_only:
+        from analytics import TrendStore
+        trends = TrendStore()
+    configs = select_configs(args, trends)
+
+    sinks = []
+    if args.output:
+        from sinks import open_sink
+        sinks = [open_sink(path) for path in args.output]
+    snapshots = []
+    if args.history:
+        from history import HistoryArchive
+        snapshots.append(HistoryArchive())
+    if args.trends:
+        snapshots.append(trends)
+    scraper = JobScraper(configs, parse_workers=args.parse_workers, decoder=args.decoder,
+                         fetch_workers=args.fetch_workers, deadline=args.deadline, sinks=sinks,
+                         snapshots=snapshots, transport=args.transport, queue_size=args.queue_size)
+    try:
+        if args.profile:
+            with RunProfiler() as profiler:
+                fresh_jobs = scraper.run(specific_companies=company_list)
+            profiler.report(args.profile_output)
+        else:
+            fresh_jobs = scraper.run(specific_companies=company_list)
+    finally:
+        scraper.close()
+        for sink in sinks:
+            sink.close()
+        for store in snapshots:
+            store.close()
+    return fresh_jobs
+
+
+# `scraper.py <command> ...` -> (module, function) that handles it given argv; anything else is a scrape
+COMMANDS = {
+    "digest": ("digest", "main"),
+    "history": ("history", "main"),
+    "stats": ("analytics", "main"),
+    "coordinate": ("cluster", "coordinate_main"),
+    "worker": ("cluster", "worker_main"),
+    "discover": ("discovery", "main"),
+    "serve": ("server", "main"),
+}
+
+
+def main(argv: Optional[List[str]] = None):
+    argv = sys.argv[1:] if argv is None else argv
+    if argv and argv[0] in COMMANDS:
+        module, function = COMMANDS[argv[0]]
+        getattr(importlib.import_module(module), function)(argv[1:])
     else:
-        company_list = None
+        scrape(parse_args(argv))
+
 
-    scraper = JobScraper(COMPANY_CONFIGS)
-    scraper.run(specific_companies=company_list)
+if __name__ == "__main__":
+    main()
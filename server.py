@@ -0,0 +1,273 @@
+# server.py
+"""Local HTTP API over the latest fresh postings (`scraper.py serve`).
+
+A background thread re-scrapes every --refresh interval while reads are served
+from an in-memory ResultIndex. The index is built once per refresh, with the
+postings sorted newest first, a position list per company, team, seniority and
+role family (see titles.py), and each posting already JSON-encoded. A query
+intersects position lists, bisects for the age cutoff and joins pre-encoded
+rows. Refreshes swap in a new index, so reads never wait on a scrape.
+
+  GET  /jobs?company=clio&seniority=senior&max_age_days=3&limit=50
+  GET  /companies                  fresh postings per company
+  GET  /status                     index age and refresh state
+  POST /applied                    {"company": "clio", "job_id": "R123"}
+
+Marking a job applied updates applied_ids_by_company, saves it, and drops the
+posting from the index right away. With --profile, every refresh writes the
+profile report of its scrape.
+"""
+import argparse
+import json
+import threading
+import time
+from bisect import bisect_left
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+from constants import SERVE_HOST, SERVE_PORT, SERVE_REFRESH_SECONDS
+from models import JobPosting
+from titles import classify_title
+
+# Query parameter -> the posting's value for it; repeat a parameter to match any of several values
+INDEXED_FIELDS: Dict[str, Callable[[JobPosting], Optional[str]]] = {
+    "company": lambda job: job.company,
+    "team": lambda job: job.team,
+    "seniority": lambda job: classify_title(job.title or "").seniority,
+    "family": lambda job: classify_title(job.title or "").family,
+}
+
+
+def _age_key(job: JobPosting) -> float:
+    # Undated postings pass every age filter, so they sort as the newest
+    return -job.posted_date.timestamp() if job.posted_date else float("-inf")
+
+
+class ResultIndex:
+    """An immutable, query-ready view of one refresh's fresh postings."""
+
+    def __init__(self, jobs: List[JobPosting], built_at: Optional[datetime] = None):
+        self.built_at = built_at or datetime.now(timezone.utc)
+        self.jobs = sorted(jobs, key=_age_key)
+        self._age_keys = [_age_key(job) for job in self.jobs]
+        self._rows = [json.dumps(job.to_dict()) for job in self.jobs]
+        # field -> value -> ascending positions in self.jobs (so also newest first)
+        self._indexes: Dict[str, Dict[Any, List[int]]] = {field: {} for field in INDEXED_FIELDS}
+        for position, job in enumerate(self.jobs):
+            for field, value_of in INDEXED_FIELDS.items():
+                self._indexes[field].setdefault(str(value_of(job)), []).append(position)
+        self.companies = json.dumps({company: len(positions)
+                                     for company, positions in sorted(self._indexes["company"].items())})
+
+    def __len__(self) -> int:
+        return len(self.jobs)
+
+    def query(self, filters: Dict[str, List[str]], max_age_days: Optional[float] = None,
+              limit: Optional[int] = None) -> str:
+        """Returns the matching postings, newest first, as a JSON document."""
+        end = len(self.jobs)
+        if max_age_days is not None:
+            # Same rule as JobScraper._filter_jobs: whole days since posting <= max_age_days
+            cutoff = datetime.now(timezone.utc) - timedelta(days=max_age_days + 1)
+            end = bisect_left(self._age_keys, -cutoff.timestamp())
+
+        # Cut each position list at the age cutoff, then intersect starting from the shortest
+        matches = sorted((positions[:bisect_left(positions, end)]
+                          for positions in (self._positions(field, values) for field, values in filters.items())),
+                         key=len)
+        if not matches:
+            rows = self._rows[:end]
+        else:
+            positions = matches[0]
+            for other in matches[1:]:
+                wanted = set(other)
+                positions = [p for p in positions if p in wanted]
+            rows = [self._rows[p] for p in positions]
+        if limit is not None:
+            rows = rows[:limit]
+        return f'{{"count": {len(rows)}, "jobs": [{", ".join(rows)}]}}'
+
+    def _positions(self, field: str, values: List[str]) -> List[int]:
+        index = self._indexes[field]
+        if len(values) == 1:
+            return index.get(values[0], [])
+        return sorted(p for value in set(values) for p in index.get(value, []))
+
+    def without(self, company: str, job_id: str) -> "ResultIndex":
+        """A copy of the index without one posting (e.g. just marked applied)."""
+        return ResultIndex([job for job in self.jobs
+                            if not (job.company == company and str(job.job_id) == job_id)], self.built_at)
+
+
+class ResultService:
+    """Owns the scraper, its refresh thread and the index currently being served."""
+
+    def __init__(self, args: argparse.Namespace, refresh_seconds: float):
+        from scraper import JobScraper
+        from sinks import open_sink
+
+        self.args = args
+        self.refresh_seconds = refresh_seconds
+        self.sinks = [open_sink(path) for path in args.output]
+        self.scraper = JobScraper({}, parse_workers=args.parse_workers, decoder=args.decoder,
+                                  fetch_workers=args.fetch_workers, deadline=args.deadline, sinks=self.sinks,
+                                  transport=args.transport, queue_size=args.queue_size)
+        # Guards applied_ids_by_company writes and index swaps
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self.refreshing = False
+        self.last_refresh_seconds: Optional[float] = None
+        self.index = ResultIndex([])
+        # Serve the last results until the first refresh finishes
+        self.publish()
+
+    @property
+    def companies(self) -> List[str]:
+        from company_configs import available_companies
+        return self.args.companies or available_companies()
+
+    def publish(self):
+        """Rebuilds the index from every board's latest fresh postings, re-filtered against applied jobs."""
+        last_results = self.scraper._load_last_results()
+        jobs = [JobPosting.from_dict(job) for company in self.companies
+                for job in last_results.get(company, {}).get("jobs", [])]
+        with self._lock:
+            self.index = ResultIndex(self.scraper._filter_jobs(jobs))
+
+    def refresh(self):
+        from analytics import TrendStore
+        from history import HistoryArchive
+        from profiling import RunProfiler
+        from scraper import select_configs
+
+        self.refreshing = True
+        started = time.monotonic()
+        trends = TrendStore()
+        snapshots = [HistoryArchive()] if self.args.history else []
+        if self.args.trends:
+            snapshots.append(trends)
+        try:
+            self.scraper.configs = select_configs(self.args, trends)
+            self.scraper.snapshots = snapshots
+            if self.args.profile:
+                # Each refresh overwrites the report, so it always covers the latest scrape
+                with RunProfiler() as profiler:
+                    self.scraper.run()
+                profiler.report(self.args.profile_output)
+            else:
+                self.scraper.run()
+        finally:
+            for store in snapshots:
+                store.close()
+            self.refreshing = False
+        self.publish()
+        self.last_refresh_seconds = time.monotonic() - started
+
+    def refresh_forever(self):
+        while not self._stop.is_set():
+            try:
+                self.refresh()
+            except Exception as e:
+                # Keep serving the previous index; the next refresh may succeed
+                print(f"Error refreshing results: {e}")
+            self._stop.wait(self.refresh_seconds)
+
+    def mark_applied(self, company: str, job_id: str) -> bool:
+        """Records a job as applied and drops it from the index. Returns whether it was listed."""
+        with self._lock:
+            listed = any(job.company == company and str(job.job_id) == job_id for job in self.index.jobs)
+            # Copy-on-write, so a scrape reading the set in another thread never sees it change size
+            applied = self.scraper.applied_ids_by_company
+            applied[company] = applied.get(company, set()) | {job_id}
+            self.scraper.save_applied_jobs()
+            if listed:
+                self.index = self.index.without(company, job_id)
+        return listed
+
+    def status(self) -> Dict[str, Any]:
+        index = self.index
+        return {"built_at": index.built_at.isoformat(), "postings": len(index), "refreshing": self.refreshing,
+                "last_refresh_seconds": self.last_refresh_seconds, "refresh_seconds": self.refresh_seconds}
+
+    def close(self):
+        self._stop.set()
+        self.scraper.close()
+        for sink in self.sinks:
+            sink.close()
+
+
+class ApiHandler(BaseHTTPRequestHandler):
+    server_version = "JobFinder/1.0"
+    service: ResultService
+
+    def do_GET(self):
+        parts = urlsplit(self.path)
+        if parts.path == "/jobs":
+            try:
+                filters, max_age_days, limit = self._parse_query(parts.query)
+            except ValueError as e:
+                return self._send(400, json.dumps({"error": str(e)}))
+            return self._send(200, self.service.index.query(filters, max_age_days, limit))
+        if parts.path == "/companies":
+            return self._send(200, self.service.index.companies)
+        if parts.path == "/status":
+            return self._send(200, json.dumps(self.service.status()))
+        self._send(404, json.dumps({"error": f"no such endpoint: {parts.path}"}))
+
+    def do_POST(self):
+        if urlsplit(self.path).path != "/applied":
+            return self._send(404, json.dumps({"error": f"no such endpoint: {self.path}"}))
+        try:
+            body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+            company, job_id = body["company"], str(body["job_id"])
+        except (ValueError, KeyError, TypeError) as e:
+            return self._send(400, json.dumps({"error": f"expected {{\"company\", \"job_id\"}}: {e}"}))
+        listed = self.service.mark_applied(company, job_id)
+        self._send(200, json.dumps({"company": company, "job_id": job_id, "applied": True, "removed": listed}))
+
+    def _parse_query(self, query: str) -> Tuple[Dict[str, List[str]], Optional[float], Optional[int]]:
+        params = parse_qs(query)
+        max_age_days = float(params.pop("max_age_days")[-1]) if "max_age_days" in params else None
+        limit = int(params.pop("limit")[-1]) if "limit" in params else None
+        unknown = params.keys() - set(INDEXED_FIELDS)
+        if unknown:
+            raise ValueError(f"unknown parameter(s): {', '.join(sorted(unknown))}")
+        return params, max_age_days, limit
+
+    def _send(self, status: int, body: str):
+        data = body.encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format: str, *args: Any):
+        # Per-request logging would cost more than answering the request
+        pass
+
+
+def main(argv: Optional[List[str]] = None):
+    from scraper import build_parser, parse_duration, validate_args
+
+    parser = build_parser("Serve the latest fresh postings over HTTP, re-scraping in the background.")
+    parser.add_argument("--host", default=SERVE_HOST, help=f"address to listen on (default: {SERVE_HOST})")
+    parser.add_argument("--port", type=int, default=SERVE_PORT, help=f"port to listen on (default: {SERVE_PORT})")
+    parser.add_argument("--refresh", type=parse_duration, default=SERVE_REFRESH_SECONDS, metavar="DURATION",
+                        help=f"time between background scrapes, e.g. 15m (default: {SERVE_REFRESH_SECONDS:g}s)")
+    args = validate_args(parser, parser.parse_args(argv))
+
+    service = ResultService(args, args.refresh)
+    handler = type("Handler", (ApiHandler,), {"service": service})
+    httpd = ThreadingHTTPServer((args.host, args.port), handler)
+    threading.Thread(target=service.refresh_forever, name="refresh", daemon=True).start()
+    print(f"--- Serving {len(service.index)} postings on http://{args.host}:{args.port} "
+          f"(refreshing every {args.refresh:g}s) ---")
+    try:
+        httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        httpd.server_close()
+        service.close()
@@ -0,0 +1,167 @@
+# sinks.py
+"""Structured output sinks for fresh postings (NDJSON, CSV, SQLite).
+
+Sinks receive postings as they pass the filters and write them in batches, so a
+run can be consumed by other tools without scraping stdout. Text formats are
+gzip-compressed when the path ends in .gz.
+"""
+import csv
+import gzip
+import io
+import json
+import os
+import sqlite3
+from datetime import datetime, timezone
+from typing import List, Optional, TextIO
+from constants import OUTPUT_BATCH_SIZE
+from models import JobPosting
+
+CSV_FIELDS = ["company", "job_id", "title", "location", "url", "posted_date", "team"]
+
+# Extension (without .gz) -> format
+SINK_FORMATS = {
+    ".ndjson": "ndjson",
+    ".jsonl": "ndjson",
+    ".csv": "csv",
+    ".db": "sqlite",
+    ".sqlite": "sqlite",
+    ".sqlite3": "sqlite",
+}
+
+# Write buffer for text sinks, on top of batching
+FILE_BUFFER_BYTES = 1024 * 1024
+
+
+class OutputSink:
+    """Buffers postings and writes them in batches of `batch_size`."""
+
+    def __init__(self, path: str, batch_size: int = OUTPUT_BATCH_SIZE):
+        self.path = path
+        self.batch_size = batch_size
+        self.written = 0
+        self._buffer: List[JobPosting] = []
+
+    def write(self, job: JobPosting):
+        self._buffer.append(job)
+        if len(self._buffer) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if self._buffer:
+            self._write_batch(self._buffer)
+            self.written += len(self._buffer)
+            self._buffer = []
+
+    def close(self):
+        self.flush()
+        self._close()
+
+    def __enter__(self) -> "OutputSink":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _write_batch(self, jobs: List[JobPosting]):
+        raise NotImplementedError
+
+    def _close(self):
+        pass
+
+
+def _open_text(path: str) -> TextIO:
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    if path.endswith(".gz"):
+        return io.TextIOWrapper(gzip.open(path, "wb"), encoding="utf-8", newline="")
+    return open(path, "w", encoding="utf-8", newline="", buffering=FILE_BUFFER_BYTES)
+
+
+class NdjsonSink(OutputSink):
+    def __init__(self, path: str, batch_size: int = OUTPUT_BATCH_SIZE):
+        super().__init__(path, batch_size)
+        self._file = _open_text(path)
+
+    def _write_batch(self, jobs: List[JobPosting]):
+        self._file.write("".join(json.dumps(job.to_dict()) + "\n" for job in jobs))
+
+    def _close(self):
+        self._file.close()
+
+
+class CsvSink(OutputSink):
+    def __init__(self, path: str, batch_size: int = OUTPUT_BATCH_SIZE):
+        super().__init__(path, batch_size)
+        self._file = _open_text(path)
+        self._writer = csv.DictWriter(self._file, fieldnames=CSV_FIELDS)
+        self._writer.writeheader()
+
+    def _write_batch(self, jobs: List[JobPosting]):
+        self._writer.writerows(job.to_dict() for job in jobs)
+
+    def _close(self):
+        self._file.close()
+
+
+class SqliteSink(OutputSink):
+    """Upserts postings into a `postings` table keyed by (company, job_id).
+
+    Columns added since a database was created are added to it when it's opened.
+    """
+
+    def __init__(self, path: str, batch_size: int = OUTPUT_BATCH_SIZE):
+        super().__init__(path, batch_size)
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._connection = sqlite3.connect(path)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("""
+            CREATE TABLE IF NOT EXISTS postings (
+                company TEXT NOT NULL,
+                job_id TEXT NOT NULL,
+                title TEXT,
+                location TEXT,
+                url TEXT,
+                posted_date TEXT,
+                seen_at TEXT NOT NULL,
+                team TEXT,
+                PRIMARY KEY (company, job_id)
+            )
+        """)
+        columns = {row[1] for row in self._connection.execute("PRAGMA table_info(postings)")}
+        if "team" not in columns:
+            with self._connection:
+                self._connection.execute("ALTER TABLE postings ADD COLUMN team TEXT")
+        self._seen_at = datetime.now(timezone.utc).isoformat()
+
+    def _write_batch(self, jobs: List[JobPosting]):
+        rows = []
+        for job in jobs:
+            data = job.to_dict()
+            rows.append((data["company"], str(data["job_id"]), data["title"], data["location"],
+                         data["url"], data["posted_date"], self._seen_at, data["team"]))
+        with self._connection:
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO postings (company, job_id, title, location, url, posted_date, seen_at, team) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows)
+
+    def _close(self):
+        self._connection.close()
+
+
+SINK_CLASSES = {"ndjson": NdjsonSink, "csv": CsvSink, "sqlite": SqliteSink}
+
+
+def sink_format(path: str) -> Optional[str]:
+    """Returns the sink format implied by the path's extension, or None if unknown."""
+    base = path[:-len(".gz")] if path.endswith(".gz") else path
+    fmt = SINK_FORMATS.get(os.path.splitext(base)[1].lower())
+    if fmt == "sqlite" and base != path:
+        return None
+    return fmt
+
+
+def open_sink(path: str, batch_size: int = OUTPUT_BATCH_SIZE) -> OutputSink:
+    fmt = sink_format(path)
+    if fmt is None:
+        raise ValueError(f"Unknown output format for {path} (use one of: "
+                         f"{', '.join(sorted(SINK_FORMATS))}, optionally with .gz for text formats)")
+    return SINK_CLASSES[fmt](path, batch_size)
@@ -0,0 +1,114 @@
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+from datetime import datetime, timedelta, timezone
+
+from analytics import TrendStore, _median_from_histogram
+from constants import MAX_POLL_INTERVAL_HOURS, MIN_POLL_INTERVAL_HOURS
+from models import JobPosting
+from scraper import parse_args
+
+
+def make_jobs(*job_ids, team="Platform"):
+    return [JobPosting(company="clio", job_id=job_id, title="Software Developer", team=team) for job_id in job_ids]
+
+
+def days_ago(days):
+    return datetime.now(timezone.utc) - timedelta(days=days)
+
+
+class TrendStoreTestCase(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "cache", "trends.json")
+        self.store = TrendStore(self.path)
+
+
+class TestAggregates(TrendStoreTestCase):
+    def test_first_run_is_a_baseline(self):
+        self.store.record("clio", make_jobs("1", "2", "3"), when=days_ago(2))
+
+        trend, = self.store.trends()
+        self.assertEqual((trend.open, trend.new, trend.closed), (3, 0, 0))
+
+    def test_runs_count_new_and_closed_postings(self):
+        self.store.record("clio", make_jobs("1", "2", "3"), when=days_ago(3))
+        self.store.record("clio", make_jobs("2", "3", "4", "5"), when=days_ago(2))
+        self.store.record("clio", make_jobs("3", "4", "5"), when=days_ago(1))
+
+        trend, = self.store.trends()
+        self.assertEqual((trend.open, trend.new, trend.closed, trend.net), (3, 2, 2, 0))
+        # "1" stayed open 1 day and "2" 2 days
+        self.assertEqual(trend.median_days_open, 1.5)
+
+    def test_teams_are_counted_separately(self):
+        self.store.record("clio", make_jobs("1") + make_jobs("2", team=None), when=days_ago(2))
+        self.store.record("clio", make_jobs("1", "3") + make_jobs("4", team="Data") + make_jobs("2", team=None),
+                          when=days_ago(1))
+
+        self.assertEqual([(trend.name, trend.open, trend.new) for trend in self.store.trends(teams=True)],
+                         [("clio/Data", 1, 1), ("clio/Platform", 2, 1)])
+        self.assertEqual(self.store.open_count("clio"), 4)
+
+    def test_ramping_up_compares_with_the_previous_window(self):
+        self.store.record("clio", make_jobs("1"), when=days_ago(10))
+        self.store.record("clio", make_jobs("1", "2"), when=days_ago(9))
+        self.store.record("clio", make_jobs("1", "2", "3", "4"), when=days_ago(1))
+
+        trend, = self.store.trends(window_days=7)
+        self.assertEqual((trend.new, trend.previous_new), (2, 1))
+        self.assertTrue(trend.ramping_up)
+
+    def test_median_from_histogram(self):
+        self.assertIsNone(_median_from_histogram({}))
+        self.assertEqual(_median_from_histogram({"3": 1, "10": 1, "1": 1}), 3)
+        self.assertEqual(_median_from_histogram({"2": 2, "6": 2}), 4)
+
+    def test_aggregates_survive_reloading_and_old_days_are_dropped(self):
+        self.store.record("clio", make_jobs("1"), when=days_ago(200))
+        self.store.record("clio", make_jobs("2"), when=days_ago(199))
+        self.store.record("clio", make_jobs("3"), when=days_ago(1))
+        self.store.close()
+
+        reloaded = TrendStore(self.path)
+        self.assertEqual(reloaded.open_count("clio"), 1)
+        self.assertEqual(reloaded.trends(window_days=365)[0].new, 1)
+
+
+class TestPollSchedule(TrendStoreTestCase):
+    def test_unknown_board_is_due(self):
+        self.assertTrue(self.store.is_due("clio"))
+        self.assertEqual(self.store.poll_interval_hours("clio"), MIN_POLL_INTERVAL_HOURS)
+
+    def test_quiet_board_is_due_once_a_day(self):
+        self.store.record("clio", make_jobs("1"), when=days_ago(0))
+
+        self.assertEqual(self.store.poll_interval_hours("clio"), MAX_POLL_INTERVAL_HOURS)
+        self.assertFalse(self.store.is_due("clio"))
+        self.assertTrue(self.store.is_due("clio", now=datetime.now(timezone.utc) + timedelta(hours=24)))
+
+    def test_busy_board_is_polled_more_often(self):
+        self.store.record("clio", make_jobs(), when=days_ago(2))
+        self.store.record("clio", make_jobs(*map(str, range(70))), when=days_ago(1))
+
+        # 70 changes over 7 days: 10 a day, so every 24 / 11 hours
+        self.assertAlmostEqual(self.store.poll_interval_hours("clio"), 24 / 11)
+        self.assertFalse(self.store.is_due("clio", now=days_ago(1) + timedelta(hours=2)))
+        self.assertTrue(self.store.is_due("clio", now=days_ago(1) + timedelta(hours=3)))
+
+
+class TestDueOnlyOption(unittest.TestCase):
+    def test_needs_trends(self):
+        with contextlib.redirect_stderr(io.StringIO()) as stderr, self.assertRaises(SystemExit):
+            parse_args(["--due-only", "--no-trends"])
+        self.assertIn("--due-only needs the hiring trends", stderr.getvalue())
+
+    def test_accepted_with_trends(self):
+        self.assertTrue(parse_args(["--due-only"]).due_only)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,223 @@
+import argparse
+import contextlib
+import io
+import os
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+
+import cluster
+from cluster import WorkQueue, coordinate_main, plan_shards, run_worker, wait_for_sweep
+from company_configs import CompanyConfig
+
+
+class QueueTestCase(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.queue = WorkQueue(directory.name, lease_seconds=30, max_attempts=2)
+        self.queue.create([["clio"], ["stripe", "plaid"]])
+        self.enterContext(contextlib.redirect_stdout(io.StringIO()))
+
+    def expire(self, shard_id):
+        path = self.queue._path("leased", shard_id)
+        stale = time.time() - self.queue.lease_seconds - 1
+        os.utime(path, (stale, stale))
+
+
+class TestWorkQueue(QueueTestCase):
+    def test_each_shard_is_claimed_once(self):
+        claimed = [self.queue.claim(), self.queue.claim(), self.queue.claim()]
+
+        self.assertEqual([shard["id"] for shard in claimed[:2]], ["shard-00000", "shard-00001"])
+        self.assertIsNone(claimed[2])
+        self.assertEqual(self.queue.counts()["leased"], 2)
+
+    def test_complete_publishes_results(self):
+        shard = self.queue.claim()
+        self.assertTrue(self.queue.complete(shard["id"], [{"company": "clio", "fresh": [], "parsed": []}]))
+
+        self.assertEqual(self.queue.results(), [{"company": "clio", "fresh": [], "parsed": []}])
+        self.assertEqual(self.queue.counts()["done"], 1)
+
+    def test_live_lease_is_not_requeued(self):
+        self.queue.claim()
+        self.assertEqual(self.queue.requeue_expired(), [])
+
+    def test_expired_lease_is_requeued_and_late_result_dropped(self):
+        shard = self.queue.claim()
+        self.expire(shard["id"])
+
+        self.assertEqual(self.queue.requeue_expired(), [shard["id"]])
+        self.assertFalse(self.queue.heartbeat(shard["id"]))
+        self.assertFalse(self.queue.complete(shard["id"], [{"company": "clio"}]))
+        self.assertEqual(self.queue.results(), [])
+
+        retried = self.queue.claim()
+        self.assertEqual((retried["id"], retried["attempts"]), (shard["id"], 1))
+
+    def test_shard_fails_after_max_attempts(self):
+        for _ in range(2):
+            shard = self.queue.claim()
+            self.expire(shard["id"])
+            self.queue.requeue_expired()
+
+        self.assertEqual(self.queue.failed_companies(), ["clio"])
+        self.assertEqual(self.queue.companies_in("pending"), ["stripe", "plaid"])
+
+    def test_heartbeat_keeps_the_lease(self):
+        shard = self.queue.claim()
+        self.expire(shard["id"])
+        self.assertTrue(self.queue.heartbeat(shard["id"]))
+
+        self.assertEqual(self.queue.requeue_expired(), [])
+
+    def test_activity_changes_on_progress(self):
+        before = self.queue.activity()
+        shard = self.queue.claim()
+        claimed = self.queue.activity()
+        self.queue.complete(shard["id"], [])
+
+        self.assertNotEqual(before, claimed)
+        self.assertNotEqual(claimed, self.queue.activity())
+
+
+class TestWorkers(QueueTestCase):
+    def test_worker_drains_the_queue(self):
+        args = argparse.Namespace(id="test", exit_when_idle=False)
+        with mock.patch("cluster.process_shard", side_effect=lambda shard, args: [
+                {"company": company, "fresh": [], "parsed": []} for company in shard["companies"]]):
+            processed = run_worker(self.queue, args)
+
+        self.assertEqual(processed, 2)
+        self.assertTrue(self.queue.finished())
+        self.assertEqual([batch["company"] for batch in self.queue.results()], ["clio", "stripe", "plaid"])
+
+    def test_failed_shard_is_left_to_expire(self):
+        args = argparse.Namespace(id="test", exit_when_idle=True)
+        with mock.patch("cluster.process_shard", side_effect=RuntimeError("boom")):
+            processed = run_worker(self.queue, args)
+
+        self.assertEqual(processed, 0)
+        self.assertEqual(self.queue.counts()["leased"], 2)
+
+    def test_workers_keep_no_last_results(self):
+        args = argparse.Namespace(parse_workers=0, decoder="python", fetch_workers=1, transport="http1", queue_size=2)
+        with mock.patch("scraper.JobScraper") as scraper_class, \
+                mock.patch("cluster.load_company_configs", return_value={}):
+            scraper_class.return_value.run.return_value = []
+            cluster.process_shard({"companies": ["clio"]}, args)
+
+        self.assertIsNone(scraper_class.call_args.kwargs["last_results_file"])
+        self.assertEqual(scraper_class.call_args.kwargs["queue_size"], 2)
+
+    def test_failed_boards_are_returned(self):
+        args = argparse.Namespace(parse_workers=0, decoder="python", fetch_workers=1, transport="http1", queue_size=2)
+
+        def run():
+            collector = scraper_class.call_args.kwargs["snapshots"][0]
+            collector.record("clio", [])
+            return []
+
+        with mock.patch("scraper.JobScraper") as scraper_class, \
+                mock.patch("cluster.load_company_configs", return_value={}):
+            scraper_class.return_value.run.side_effect = run
+            batches = cluster.process_shard({"companies": ["clio", "stripe"]}, args)
+
+        self.assertEqual(batches, [{"company": "clio", "parsed_count": 0, "fresh": [], "parsed": []},
+                                   {"company": "stripe", "failed": True}])
+
+
+class TestCoordinator(QueueTestCase):
+    def test_summary_lists_boards_that_failed_in_workers(self):
+        for batches in ([{"company": "clio", "parsed_count": 0, "fresh": [], "parsed": []}],
+                        [{"company": "stripe", "failed": True}, {"company": "plaid", "failed": True}]):
+            self.queue.complete(self.queue.claim()["id"], batches)
+
+        with mock.patch("cluster.WorkQueue", return_value=self.queue), \
+                mock.patch("cluster.plan_shards", return_value=[]), \
+                mock.patch("analytics.TrendStore"), \
+                mock.patch("scraper.save_last_results") as save, \
+                mock.patch.object(self.queue, "create"), \
+                contextlib.redirect_stdout(io.StringIO()) as stdout:
+            coordinate_main(["--no-history", "--no-trends"])
+
+        self.assertIn("2 board(s) failed to fetch or parse", stdout.getvalue())
+        self.assertIn("  - Stripe\n  - Plaid\n", stdout.getvalue())
+        self.assertEqual(list(save.call_args.args[0]), ["clio"])
+
+
+class TestWaitForSweep(QueueTestCase):
+    def setUp(self):
+        super().setUp()
+        patcher = mock.patch("cluster.POLL_SECONDS", 0.01)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_gives_up_without_workers(self):
+        started = time.monotonic()
+        self.assertFalse(wait_for_sweep(self.queue, [], idle_timeout=0.1))
+        self.assertLess(time.monotonic() - started, 5)
+
+    def test_gives_up_once_local_workers_exited(self):
+        exited = mock.Mock()
+        exited.poll.return_value = 1
+        self.assertFalse(wait_for_sweep(self.queue, [exited], idle_timeout=0.1))
+
+    def test_waits_while_a_local_worker_runs(self):
+        running = mock.Mock()
+        running.poll.return_value = None
+
+        def finish_later():
+            time.sleep(0.3)
+            for _ in range(2):
+                shard = self.queue.claim()
+                self.queue.complete(shard["id"], [])
+
+        worker = threading.Thread(target=finish_later)
+        worker.start()
+        self.addCleanup(worker.join)
+        self.assertTrue(wait_for_sweep(self.queue, [running], idle_timeout=0.1))
+
+    def test_finished_sweep(self):
+        for _ in range(2):
+            shard = self.queue.claim()
+            self.queue.complete(shard["id"], [])
+        self.assertTrue(wait_for_sweep(self.queue, [], idle_timeout=0.1))
+
+
+class TestCoordinateOptions(unittest.TestCase):
+    def test_rejects_per_run_options(self):
+        for option in (["--deadline", "30s"], ["--profile"]):
+            with self.subTest(option=option), contextlib.redirect_stderr(io.StringIO()) as stderr:
+                with self.assertRaises(SystemExit):
+                    coordinate_main(option)
+                self.assertIn("can't be used with coordinate", stderr.getvalue())
+
+
+class TestPlanShards(unittest.TestCase):
+    def test_keeps_hosts_together_and_balances_cost(self):
+        configs = {f"gh{index}": CompanyConfig(api_url=f"https://boards-api.greenhouse.io/v1/boards/gh{index}/jobs")
+                   for index in range(4)}
+        configs.update({f"wd{index}": CompanyConfig(api_url=f"https://wd{index}.wd3.myworkdayjobs.com/jobs")
+                        for index in range(4)})
+        costs = {name: 1.0 for name in configs}
+
+        shards = plan_shards(configs, costs, 2)
+
+        self.assertEqual(sorted(name for shard in shards for name in shard), sorted(configs))
+        self.assertEqual([len(shard) for shard in shards], [4, 4])
+        self.assertTrue(any(set(shard) == {"gh0", "gh1", "gh2", "gh3"} for shard in shards))
+
+    def test_busy_host_is_split(self):
+        configs = {f"gh{index}": CompanyConfig(api_url=f"https://boards-api.greenhouse.io/v1/boards/gh{index}/jobs")
+                   for index in range(6)}
+        shards = plan_shards(configs, {name: 1.0 for name in configs}, 3)
+
+        self.assertEqual([len(shard) for shard in shards], [2, 2, 2])
+
+
+if __name__ == "__main__":
+    unittest.main()
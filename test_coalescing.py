@@ -0,0 +1,110 @@
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from coalescing import RequestCoalescer, request_key
+
+
+class SlowSend:
+    """A send() that blocks until released, so concurrent callers pile up behind it."""
+
+    def __init__(self, error=None):
+        self.release = threading.Event()
+        self.started = threading.Event()
+        self.calls = []
+        self.error = error
+        self._lock = threading.Lock()
+
+    def __call__(self, method, url, body):
+        with self._lock:
+            self.calls.append((method, url, body))
+        self.started.set()
+        self.release.wait(5)
+        if self.error is not None:
+            raise self.error
+        return f"{method} {url}".encode()
+
+
+class TestRequestKey(unittest.TestCase):
+    def test_equivalent_requests_compare_equal(self):
+        self.assertEqual(request_key("get", "HTTPS://Boards.Example.com/jobs?b=2&a=1#top"),
+                         request_key("GET", "https://boards.example.com/jobs?a=1&b=2"))
+        self.assertEqual(request_key("POST", "https://x/jobs", {"limit": 20, "offset": 0}),
+                         request_key("POST", "https://x/jobs", {"offset": 0, "limit": 20}))
+
+    def test_different_requests_differ(self):
+        self.assertNotEqual(request_key("POST", "https://x/jobs", {"offset": 0}),
+                            request_key("POST", "https://x/jobs", {"offset": 20}))
+        self.assertNotEqual(request_key("GET", "https://x/jobs?page=1"), request_key("GET", "https://x/jobs?page=2"))
+
+
+class TestRequestCoalescer(unittest.TestCase):
+    def fetch_concurrently(self, coalescer, send, requests):
+        with ThreadPoolExecutor(max_workers=len(requests)) as executor:
+            futures = [executor.submit(coalescer.fetch, *request) for request in requests]
+            send.started.wait(5)
+            # let every caller reach the coalescer before the leader's response arrives
+            while coalescer.sent + coalescer.coalesced < len(requests):
+                time.sleep(0.001)
+            send.release.set()
+            return futures
+
+    def test_concurrent_identical_requests_share_one_send(self):
+        send = SlowSend()
+        coalescer = RequestCoalescer(send)
+
+        futures = self.fetch_concurrently(coalescer, send, [("GET", "https://x/jobs")] * 8)
+
+        self.assertEqual([future.result() for future in futures], [b"GET https://x/jobs"] * 8)
+        self.assertEqual(len(send.calls), 1)
+        self.assertEqual((coalescer.sent, coalescer.coalesced), (1, 7))
+
+    def test_distinct_requests_are_sent_separately(self):
+        send = SlowSend()
+        coalescer = RequestCoalescer(send)
+
+        futures = self.fetch_concurrently(coalescer, send, [("GET", "https://x/a"), ("GET", "https://x/b")])
+
+        self.assertEqual(sorted(future.result() for future in futures), [b"GET https://x/a", b"GET https://x/b"])
+        self.assertEqual(coalescer.sent, 2)
+
+    def test_waiting_callers_get_the_error_and_later_callers_retry(self):
+        send = SlowSend(error=ConnectionError("boom"))
+        coalescer = RequestCoalescer(send)
+
+        futures = self.fetch_concurrently(coalescer, send, [("GET", "https://x/jobs")] * 3)
+        for future in futures:
+            with self.assertRaises(ConnectionError):
+                future.result()
+
+        send.error = None
+        self.assertEqual(coalescer.fetch("GET", "https://x/jobs"), b"GET https://x/jobs")
+        self.assertEqual(len(send.calls), 2)
+
+    def test_response_is_kept_until_its_last_expected_caller(self):
+        send = SlowSend()
+        send.release.set()
+        coalescer = RequestCoalescer(send, {request_key("GET", "https://x/jobs"): 3})
+
+        for _ in range(3):
+            self.assertEqual(coalescer.fetch("GET", "https://x/jobs"), b"GET https://x/jobs")
+            self.assertEqual(len(send.calls), 1)
+        self.assertEqual(coalescer._calls, {})
+
+        coalescer.fetch("GET", "https://x/jobs")
+        self.assertEqual(len(send.calls), 2)
+
+    def test_unexpected_response_is_not_kept(self):
+        send = SlowSend()
+        coalescer = RequestCoalescer(send)
+
+        futures = self.fetch_concurrently(coalescer, send, [("GET", "https://x/page?n=1")] * 2)
+
+        self.assertEqual([future.result() for future in futures], [b"GET https://x/page?n=1"] * 2)
+        self.assertEqual(len(send.calls), 1)
+        self.assertEqual(coalescer._calls, {})
+
+
+if __name__ == "__main__":
+    unittest.main()
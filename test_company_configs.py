@@ -0,0 +1,142 @@
+import json
+import os
+import tempfile
+import textwrap
+import unittest
+from unittest import mock
+
+import company_configs
+from company_configs import CompanyConfig, available_companies, config_from_section, load_company_configs
+
+CONFIGS = """\
+[templates.greenhouse]
+vars = ["board"]
+api_url = "https://boards-api.greenhouse.io/v1/boards/{{board}}/jobs"
+http_method = "GET"
+parser_key = "greenhouse"
+job_id_key = "id"
+job_age_key = "first_published"
+
+[templates.workday]
+body = { limit = 20, offset = 0, appliedFacets = { locationCountry = ["ca"] } }
+
+[companies.stripe]
+template = "greenhouse"
+board = "stripe"
+
+[companies.clio]
+template = "workday"
+api_url = "https://clio.wd3.myworkdayjobs.com/wday/cxs/clio/careers/jobs"
+body.searchText = "developer"
+
+[companies."two words"]
+template = "greenhouse"
+board = "two-words"
+"""
+
+
+class ConfigTestCase(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.config_path = os.path.join(directory.name, "company_configs.toml")
+        self.index_path = os.path.join(directory.name, ".company_configs.index.json")
+        self.enterContext(mock.patch("company_configs.CONFIG_PATH", self.config_path))
+        self.enterContext(mock.patch("company_configs.INDEX_PATH", self.index_path))
+        self.enterContext(mock.patch.dict(company_configs._templates, clear=True))
+        self.write(CONFIGS)
+
+    def write(self, text):
+        with open(self.config_path, "w") as f:
+            f.write(text)
+
+
+class TestLoadCompanyConfigs(ConfigTestCase):
+    def test_templates_fill_in_vars_and_merge_tables(self):
+        configs = load_company_configs()
+
+        self.assertEqual(list(configs), ["stripe", "clio", "two words"])
+        self.assertEqual(configs["stripe"], CompanyConfig(
+            api_url="https://boards-api.greenhouse.io/v1/boards/stripe/jobs", http_method="GET",
+            parser_key="greenhouse", job_id_key="id", job_age_key="first_published"))
+        self.assertEqual(configs["clio"].body, {"limit": 20, "offset": 0, "searchText": "developer",
+                                                "appliedFacets": {"locationCountry": ["ca"]}})
+        self.assertEqual(configs["two words"].api_url, "https://boards-api.greenhouse.io/v1/boards/two-words/jobs")
+
+    def test_only_the_requested_sections_are_parsed(self):
+        self.write(CONFIGS + '\n[companies.broken]\ntemplate = "greenhouse"\nboard = \n')
+
+        self.assertEqual(list(load_company_configs(["stripe", "unknown"])), ["stripe"])
+        with self.assertRaises(ValueError):
+            load_company_configs(["broken"])
+
+    def test_config_from_section(self):
+        config = config_from_section("acme", {"template": "greenhouse", "board": "acme"})
+        self.assertEqual(config.api_url, "https://boards-api.greenhouse.io/v1/boards/acme/jobs")
+
+
+class TestIndex(ConfigTestCase):
+    def test_index_is_written_and_reused(self):
+        self.assertEqual(available_companies(), ["stripe", "clio", "two words"])
+        with open(self.index_path) as f:
+            index = json.load(f)
+
+        with mock.patch("company_configs._build_index") as build:
+            self.assertEqual(available_companies(), ["stripe", "clio", "two words"])
+        build.assert_not_called()
+        start, end = index["companies"]["stripe"]
+        with open(self.config_path, "rb") as f:
+            self.assertTrue(f.read()[start:end].startswith(b"[companies.stripe]"))
+
+    def test_index_is_rebuilt_when_the_toml_changes(self):
+        available_companies()
+        self.write(CONFIGS + '\n[companies.samsara]\ntemplate = "greenhouse"\nboard = "samsara"\n')
+
+        self.assertEqual(available_companies(), ["stripe", "clio", "two words", "samsara"])
+        self.assertEqual(load_company_configs(["samsara"])["samsara"].api_url,
+                         "https://boards-api.greenhouse.io/v1/boards/samsara/jobs")
+
+    def test_corrupt_index_is_rebuilt(self):
+        with open(self.index_path, "w") as f:
+            f.write("{not json")
+
+        self.assertEqual(available_companies(), ["stripe", "clio", "two words"])
+
+    def test_duplicate_and_nested_sections_are_rejected(self):
+        for extra, message in (('[companies.stripe]\nboard = "again"\n', "Duplicate companies entry"),
+                               ('[companies.stripe.body]\nlimit = 1\n', "Unsupported section header")):
+            with self.subTest(message=message):
+                self.write(CONFIGS + "\n" + extra)
+                with self.assertRaisesRegex(ValueError, message):
+                    available_companies()
+
+
+class TestValidation(ConfigTestCase):
+    def assertInvalid(self, section, message):
+        with self.assertRaisesRegex(ValueError, message):
+            config_from_section("acme", section)
+
+    def test_invalid_sections(self):
+        self.assertInvalid({"template": "greenhouse"}, r"missing template vars \['board'\]")
+        self.assertInvalid({"template": "greenhouse", "board": "acme", "colour": "blue"}, "unknown keys")
+        self.assertInvalid({"template": "nope"}, "unknown template 'nope'")
+        self.assertInvalid({"template": "workday"}, "api_url is required")
+        self.assertInvalid({"template": "workday", "api_url": "https://acme.example.com", "parser_key": "indeed"},
+                           "parser_key must be one of")
+        self.assertInvalid({"template": "workday", "api_url": "https://acme.example.com", "http_method": "PUT"},
+                           "http_method must be one of")
+        self.assertInvalid({"template": "workday", "api_url": "https://acme.example.com", "data_path": "jobs"},
+                           "data_path must be a list")
+        self.assertInvalid({"template": "workday", "api_url": "https://acme.example.com",
+                            "facet_names": {"locationCountry": "Canada"}}, "facet_names must map")
+
+    def test_placeholder_without_a_value(self):
+        self.write(textwrap.dedent("""\
+            [templates.broken]
+            api_url = "https://{{tenant}}.example.com"
+            """))
+        self.assertInvalid({"template": "broken"}, r"placeholder \{\{tenant\}\} has no value")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,127 @@
+import contextlib
+import io
+import json
+import unittest
+from dataclasses import replace
+from unittest import mock
+
+from company_configs import CompanyConfig
+from decoders import MsgspecDecoder, get_decoder
+from scraper import JobScraper
+
+try:
+    import msgspec
+except ImportError:  # optional dependency
+    msgspec = None
+
+DESCRIPTION = "<p>" + "We are hiring. " * 20 + "</p>"
+
+# parser_key -> (config, payload with fields the schemas don't declare)
+BOARDS = {
+    "workday": (CompanyConfig(api_url="https://acme.wd3.myworkdayjobs.com/jobs"), {
+        "total": 2, "facets": [{"facetParameter": "locations", "values": []}], "jobPostings": [
+            {"title": "Software Developer", "locationsText": "Vancouver, BC", "bulletFields": ["R1"],
+             "postedOn": "Posted Today", "externalPath": "/job/1"},
+            {"title": "No Id", "locationsText": "Vancouver, BC", "bulletFields": []}]}),
+    "greenhouse": (CompanyConfig(api_url="https://boards-api.greenhouse.io/v1/boards/acme/jobs", http_method="GET",
+                                 parser_key="greenhouse", job_id_key="id", job_age_key="first_published"), {
+        "meta": {"total": 2}, "jobs": [
+            {"id": 11, "title": "Software Developer", "absolute_url": "https://example.com/11",
+             "location": {"name": "Vancouver, BC"}, "first_published": "2026-10-01T10:00:00-04:00",
+             "content": DESCRIPTION, "metadata": [{"id": 1, "name": "Team", "value": "Platform"}]},
+            {"id": 12, "title": "Software Developer", "location": {"name": "Toronto, ON"}}]}),
+    "lever": (CompanyConfig(api_url="https://api.lever.co/v0/postings/acme?mode=json", http_method="GET",
+                            parser_key="lever", job_id_key="text", job_age_key="createdAt"), [
+        {"id": "lever-1", "text": "Software Developer", "applyUrl": "https://example.com/lever-1",
+         "categories": {"location": "Vancouver, BC", "team": "Engineering", "commitment": "Full-time"},
+         "createdAt": 1760000000000, "description": DESCRIPTION, "lists": [{"text": "Requirements"}]}]),
+    "ashbyhq": (CompanyConfig(api_url="https://jobs.ashbyhq.com/api/non-user-graphql", parser_key="ashbyhq",
+                              job_id_key="id", data_path=["data", "jobBoard", "jobPostings"], team_id="team-1"), {
+        "data": {"jobBoard": {"teams": [], "jobPostings": [
+            {"id": "ashby-1", "title": "Software Developer", "teamId": "team-1", "locationName": "Vancouver, BC",
+             "compensationTierSummary": "$100K"},
+            {"id": "ashby-2", "title": "Software Developer", "teamId": "team-2", "locationName": "Vancouver, BC"}]}}}),
+    "github": (CompanyConfig(api_url="https://careers.example.com/api/jobs", http_method="GET", parser_key="github",
+                             job_id_key="req_id", job_age_key="posted_date"), {
+        "totalCount": 1, "jobs": [{"data": {"req_id": "J1", "title": "Software Developer",
+                                            "location_name": "Vancouver, BC",
+                                            "posted_date": "2026-10-01T10:00:00+0000", "description": DESCRIPTION}}]}),
+}
+
+
+def comparable(jobs):
+    # relative dates ("Posted Today") resolve against now(), so compare them to the minute
+    return [replace(job, posted_date=job.posted_date.replace(second=0, microsecond=0)) if job.posted_date else job
+            for job in jobs]
+
+
+class TestGetDecoder(unittest.TestCase):
+    def test_python_backend_has_no_typed_decoder(self):
+        self.assertIsNone(get_decoder("python"))
+
+    def test_unknown_backend(self):
+        with self.assertRaises(ValueError):
+            get_decoder("simdjson")
+
+    def test_missing_msgspec_falls_back_to_python(self):
+        with mock.patch.dict("sys.modules", {"msgspec": None}):
+            self.assertIsNone(get_decoder("auto"))
+            with contextlib.redirect_stdout(io.StringIO()) as stdout:
+                self.assertIsNone(get_decoder("msgspec"))
+        self.assertIn("msgspec is not installed", stdout.getvalue())
+
+
+@unittest.skipIf(msgspec is None, "msgspec is not installed")
+class TestMsgspecDecoder(unittest.TestCase):
+    def setUp(self):
+        self.decoder = get_decoder("auto")
+
+    def test_auto_uses_msgspec(self):
+        self.assertIsInstance(self.decoder, MsgspecDecoder)
+
+    def test_supports_only_the_fields_its_schemas_declare(self):
+        for parser_key, (config, _) in BOARDS.items():
+            with self.subTest(parser_key=parser_key):
+                self.assertTrue(self.decoder.supports(config))
+
+        greenhouse = BOARDS["greenhouse"][0]
+        self.assertFalse(self.decoder.supports(replace(greenhouse, job_id_key="requisition_id")))
+        self.assertFalse(self.decoder.supports(replace(greenhouse, data_path=["jobs"])))
+        self.assertFalse(self.decoder.supports(CompanyConfig(api_url="https://example.com", parser_key="atlassian")))
+
+    def test_payload_that_does_not_fit_the_schema(self):
+        config = BOARDS["greenhouse"][0]
+        self.assertIsNone(self.decoder.decode(config, b'{"jobs": "none"}'))
+        self.assertIsNone(self.decoder.decode(config, b"<html>maintenance</html>"))
+
+
+@unittest.skipIf(msgspec is None, "msgspec is not installed")
+class TestDecodeAndParse(unittest.TestCase):
+    def setUp(self):
+        self.typed = JobScraper({}, decoder="msgspec", transport="http1")
+        self.python = JobScraper({}, decoder="python", transport="http1")
+
+    def test_typed_and_python_paths_find_the_same_postings(self):
+        for parser_key, (config, data) in BOARDS.items():
+            with self.subTest(parser_key=parser_key):
+                payload = json.dumps(data).encode()
+                typed = self.typed._decode_and_parse("acme", config, payload)
+
+                self.assertTrue(typed)
+                self.assertEqual(comparable(typed),
+                                 comparable(self.python._decode_and_parse("acme", config, payload)))
+
+    def test_payload_that_does_not_fit_falls_back_to_python(self):
+        config, data = BOARDS["greenhouse"]
+        # a float id isn't in the schema, but the Python parser takes it
+        payload = json.dumps({"jobs": [{**data["jobs"][0], "id": 11.5}]}).encode()
+
+        with mock.patch.object(self.typed, "_parse_typed_records") as typed_parse:
+            jobs = self.typed._decode_and_parse("acme", config, payload)
+
+        typed_parse.assert_not_called()
+        self.assertEqual([job.job_id for job in jobs], ["11.5"])
+
+
+if __name__ == "__main__":
+    unittest.main()
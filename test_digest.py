@@ -0,0 +1,106 @@
+import contextlib
+import email
+import io
+import os
+import tempfile
+import unittest
+from datetime import datetime, timedelta, timezone
+from unittest import mock
+
+from digest import (DigestRenderer, LocalOutbox, SentState, group_by_company, in_window, send_digests,
+                    smtp_from_env)
+from models import JobPosting
+
+
+def make_job(job_id, company="clio", title="Software Developer", days_old=0):
+    return JobPosting(company=company, job_id=job_id, title=title, location="Vancouver, BC",
+                      url=f"https://example.com/{job_id}",
+                      posted_date=datetime.now(timezone.utc) - timedelta(days=days_old))
+
+
+class TestSendDigests(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.outbox_dir = os.path.join(self.directory.name, "outbox")
+        self.state = SentState(path=os.path.join(self.directory.name, "sent.json"))
+
+    def send(self, jobs, recipients=("me@example.com",)):
+        outbox = LocalOutbox(self.outbox_dir)
+        with contextlib.redirect_stdout(io.StringIO()):
+            sent = send_digests(jobs, list(recipients), "bot@example.com", outbox, self.state)
+        return sent, outbox
+
+    def test_writes_one_eml_per_recipient(self):
+        sent, outbox = self.send([make_job("1"), make_job("2", company="stripe")],
+                                 recipients=["a@example.com", "b@example.com"])
+
+        self.assertEqual(sent, 2)
+        self.assertEqual([message["To"] for message in outbox.sent], ["a@example.com", "b@example.com"])
+        files = sorted(os.listdir(self.outbox_dir))
+        self.assertEqual(len(files), 2)
+        with open(os.path.join(self.outbox_dir, files[0]), "rb") as f:
+            message = email.message_from_bytes(f.read())
+        self.assertEqual(message["Subject"].split(" (")[0], "2 new jobs at 2 companies")
+        self.assertTrue(message.is_multipart())
+
+    def test_does_not_resend_unchanged_postings(self):
+        self.send([make_job("1")])
+        sent, outbox = self.send([make_job("1")])
+
+        self.assertEqual(sent, 0)
+        self.assertEqual(outbox.sent, [])
+
+    def test_resends_changed_posting(self):
+        self.send([make_job("1")])
+        sent, outbox = self.send([make_job("1", title="Senior Software Developer")])
+
+        self.assertEqual(sent, 1)
+        self.assertIn("Senior Software Developer", outbox.sent[0].get_body(("plain",)).get_content())
+
+    def test_sent_state_survives_reload(self):
+        self.send([make_job("1")])
+        self.state = SentState(path=self.state.path)
+
+        sent, _ = self.send([make_job("1"), make_job("2")])
+
+        self.assertEqual(sent, 1)
+        self.assertEqual(self.state.unsent("me@example.com", [make_job("1"), make_job("2")]), [])
+
+
+class TestSmtpFromEnv(unittest.TestCase):
+    def test_requires_a_host(self):
+        with mock.patch.dict(os.environ, {}, clear=True):
+            with self.assertRaises(ValueError):
+                smtp_from_env()
+
+    def test_local_outbox_is_opt_in(self):
+        with mock.patch.dict(os.environ, {"SMTP_HOST": "local"}, clear=True):
+            self.assertIsInstance(smtp_from_env(), LocalOutbox)
+        with mock.patch.dict(os.environ, {}, clear=True):
+            self.assertIsInstance(smtp_from_env("local"), LocalOutbox)
+
+
+class TestRendering(unittest.TestCase):
+    def test_escapes_html_but_not_text(self):
+        html_body, text_body = DigestRenderer().render({"clio": [make_job("1", title="C++ <Backend> Developer")]})
+
+        self.assertIn("C++ &lt;Backend&gt; Developer", html_body)
+        self.assertIn("C++ <Backend> Developer", text_body)
+
+    def test_groups_by_company_sorted_by_title(self):
+        grouped = group_by_company([make_job("1", company="stripe", title="B"), make_job("2", title="Z"),
+                                    make_job("3", title="A")])
+
+        self.assertEqual(list(grouped), ["clio", "stripe"])
+        self.assertEqual([job.title for job in grouped["clio"]], ["A", "Z"])
+
+    def test_window_keeps_undated_postings(self):
+        undated = JobPosting(company="clio", job_id="3")
+        jobs = in_window([make_job("1"), make_job("2", days_old=3), undated], window_days=1)
+
+        self.assertEqual([job.job_id for job in jobs], ["1", "3"])
+
+
+if __name__ == "__main__":
+    unittest.main()
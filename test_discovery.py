@@ -0,0 +1,189 @@
+import contextlib
+import io
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from functools import partial
+from unittest import mock
+
+import requests
+
+import company_configs
+from discovery import AtsResolver, main, match_url, resolve_all
+
+
+class FakeTransport:
+    """Answers like the ATS job APIs for known boards (and a couple of careers pages); records requests."""
+
+    def __init__(self, delay=0):
+        self.delay = delay
+        self.requests = []
+        self._lock = threading.Lock()
+
+    def request(self, method, url, body=None, timeout=None):
+        with self._lock:
+            self.requests.append((method, url))
+        time.sleep(self.delay)
+        if "missing" in url:
+            raise requests.exceptions.HTTPError(f"404 Client Error: Not Found for url: {url}")
+        if url.startswith("https://boards-api.greenhouse.io/"):
+            return json.dumps({"jobs": []}).encode()
+        if url.startswith("https://api.lever.co/"):
+            return b"[]"
+        if url.startswith("https://jobs.ashbyhq.com/"):
+            return json.dumps({"data": {"jobBoard": {"jobPostings": []}}}).encode()
+        if ".myworkdayjobs.com/" in url:
+            return json.dumps({"total": 0, "jobPostings": []}).encode()
+        if url == "https://www.acme.com/careers":
+            return b'<a href="https://job-boards.greenhouse.io/acme/jobs/123">Apply</a>'
+        if url == "https://careers.globex.com/":
+            return b'<script src="https://cdn.jibeapply.com/widget.js"></script>'
+        return b"<html>No jobs here</html>"
+
+
+class TestMatchUrl(unittest.TestCase):
+    def test_known_ats_urls(self):
+        cases = {
+            "https://boards.greenhouse.io/stripe/jobs/123": ("stripe", "greenhouse", {"board": "stripe"}),
+            "https://boards.greenhouse.io/embed/job_board?for=samsara": ("samsara", "greenhouse",
+                                                                         {"board": "samsara"}),
+            "https://boards-api.greenhouse.io/v1/boards/gitlab/jobs": ("gitlab", "greenhouse", {"board": "gitlab"}),
+            "jobs.lever.co/Plaid/abc": ("plaid", "lever", {"api_url": "https://api.lever.co/v0/postings/Plaid"}),
+            "https://jobs.ashbyhq.com/jane": ("jane", "ashbyhq", {"organization": "jane"}),
+            "https://osv-accolade.wd5.myworkdayjobs.com/en-US/External": ("osv-accolade", "workday", {
+                "api_url": "https://osv-accolade.wd5.myworkdayjobs.com/wday/cxs/osv_accolade/External/jobs",
+                "career_page_url": "https://osv-accolade.wd5.myworkdayjobs.com/External"}),
+            "https://www.careers.example.com/api/jobs?location=Canada": ("careers", "jibe", {
+                "api_url": "https://www.careers.example.com/api/jobs"}),
+        }
+        for url, (name, template, fields) in cases.items():
+            with self.subTest(url=url):
+                resolution = match_url(url)
+                self.assertEqual((resolution.name, resolution.template, resolution.fields), (name, template, fields))
+
+    def test_unknown_urls_and_bare_hosts(self):
+        for url in ("https://www.acme.com/careers", "https://boards.greenhouse.io/embed/job_board",
+                    "https://acme.wd3.myworkdayjobs.com/"):
+            with self.subTest(url=url):
+                self.assertIsNone(match_url(url))
+
+    def test_name_and_toml(self):
+        resolution = match_url("https://jobs.ashbyhq.com/jane", name="jane app")
+
+        self.assertEqual(resolution.to_toml(),
+                         '[companies."jane app"]\ntemplate = "ashbyhq"\norganization = "jane"\n')
+
+
+class ResolverTestCase(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+        self.cache_path = os.path.join(self.directory, "cache", "ats_resolutions.json")
+        self.enterContext(contextlib.redirect_stdout(io.StringIO()))
+
+
+class TestAtsResolver(ResolverTestCase):
+    def make_resolver(self, transport=None):
+        return AtsResolver(transport or FakeTransport(), cache_path=self.cache_path)
+
+    def test_known_tenant_is_verified_with_one_probe(self):
+        resolver = self.make_resolver()
+        resolution = resolver.resolve("https://osv-accolade.wd5.myworkdayjobs.com/en-US/External")
+
+        self.assertTrue(resolution.verified)
+        self.assertEqual(resolver.transport.requests, [
+            ("POST", "https://osv-accolade.wd5.myworkdayjobs.com/wday/cxs/osv_accolade/External/jobs")])
+
+    def test_failed_probe_is_not_a_resolution(self):
+        self.assertIsNone(self.make_resolver().resolve("https://boards.greenhouse.io/missing"))
+
+    def test_careers_pages_are_scanned_for_ats_links(self):
+        resolver = self.make_resolver()
+
+        acme = resolver.resolve("https://www.acme.com/careers")
+        globex = resolver.resolve("https://careers.globex.com/", name="globex")
+
+        self.assertEqual((acme.template, acme.fields, acme.source_url),
+                         ("greenhouse", {"board": "acme"}, "https://www.acme.com/careers"))
+        self.assertEqual((globex.name, globex.template, globex.fields),
+                         ("globex", "jibe", {"api_url": "https://careers.globex.com/api/jobs"}))
+        self.assertIsNone(resolver.resolve("https://www.initech.com/jobs"))
+
+    def test_resolutions_are_cached_by_tenant_and_url(self):
+        self.make_resolver().resolve("https://boards.greenhouse.io/stripe")
+        self.make_resolver().resolve("https://www.acme.com/careers")
+
+        resolver = self.make_resolver()
+        stripe = resolver.resolve("https://job-boards.greenhouse.io/stripe/jobs/42", name="stripe-canada")
+        acme = resolver.resolve("https://www.acme.com/careers")
+
+        self.assertEqual(resolver.transport.requests, [])
+        self.assertEqual((stripe.name, stripe.fields), ("stripe-canada", {"board": "stripe"}))
+        self.assertEqual(acme.fields, {"board": "acme"})
+
+    def test_concurrent_urls_of_a_tenant_share_a_probe(self):
+        resolver = self.make_resolver(FakeTransport(delay=0.05))
+        urls = ["https://boards.greenhouse.io/stripe", "https://boards.greenhouse.io/stripe/jobs/1",
+                "https://job-boards.greenhouse.io/stripe/jobs/2", "https://jobs.lever.co/plaid"]
+
+        results = resolve_all(resolver, [(url, None) for url in urls], workers=4)
+
+        self.assertEqual([url for url, _ in results], urls)
+        self.assertTrue(all(resolution.verified for _, resolution in results))
+        self.assertEqual(resolver.probes, 2)
+
+
+class TestDiscoverCommand(ResolverTestCase):
+    def setUp(self):
+        super().setUp()
+        self.config_path = os.path.join(self.directory, "company_configs.toml")
+        shutil.copy(company_configs.CONFIG_PATH, self.config_path)
+        self.enterContext(mock.patch("company_configs.CONFIG_PATH", self.config_path))
+        self.enterContext(mock.patch("company_configs.INDEX_PATH", os.path.join(self.directory, "index.json")))
+        self.enterContext(mock.patch.dict(company_configs._templates, clear=True))
+        self.enterContext(mock.patch("discovery.CONFIG_PATH", self.config_path))
+        self.enterContext(mock.patch("discovery.get_transport", return_value=FakeTransport()))
+        self.enterContext(mock.patch("discovery.AtsResolver", partial(AtsResolver, cache_path=self.cache_path)))
+
+    def discover(self, *argv):
+        with contextlib.redirect_stdout(io.StringIO()) as stdout:
+            main(list(argv))
+        return stdout.getvalue()
+
+    def test_append_adds_loadable_configs_once(self):
+        output = self.discover("--append", "newco=https://jobs.ashbyhq.com/newco",
+                               "https://boards.greenhouse.io/stripe", "https://www.initech.com/jobs")
+
+        self.assertIn("Appended 1 companies", output)
+        self.assertIn("stripe is already configured", output)
+        self.assertIn("Could not detect the ATS for https://www.initech.com/jobs", output)
+        config = company_configs.load_company_configs(["newco"])["newco"]
+        self.assertEqual(config.body["variables"], {"organizationHostedJobsPageName": "newco"})
+
+        self.assertIn("newco is already configured", self.discover("--append", "newco=https://jobs.ashbyhq.com/newco"))
+        with open(self.config_path) as f:
+            self.assertEqual(f.read().count("[companies.newco]"), 1)
+
+    def test_prints_configs_without_append(self):
+        with open(self.config_path) as f:
+            before = f.read()
+        urls_file = os.path.join(self.directory, "urls.txt")
+        with open(urls_file, "w") as f:
+            f.write("# careers pages\nhttps://jobs.lever.co/newco\n")
+
+        output = self.discover("--file", urls_file)
+
+        self.assertIn('[companies.newco]\ntemplate = "lever"\napi_url = "https://api.lever.co/v0/postings/newco"',
+                      output)
+        self.assertIn("# 1 URLs, 1 probe requests", output)
+        with open(self.config_path) as f:
+            self.assertEqual(f.read(), before)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,125 @@
+import os
+import tempfile
+import unittest
+from datetime import date, datetime, timezone
+
+from history import HistoryArchive
+from models import JobPosting
+
+
+def at(day, hour=12):
+    return datetime(2026, 9, day, hour, tzinfo=timezone.utc)
+
+
+def make_job(job_id, title=None, posted_date=None):
+    return JobPosting(company="clio", job_id=job_id, title=title or f"Developer {job_id}", location="Vancouver, BC",
+                      url=f"https://example.com/{job_id}", posted_date=posted_date)
+
+
+class HistoryTestCase(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.archive = HistoryArchive(root=directory.name)
+
+
+class TestSnapshots(HistoryTestCase):
+    def test_round_trip(self):
+        jobs = [make_job("1", posted_date=at(1)), make_job("2", title="Dev\x00Ops")]
+        self.archive.record("clio", jobs, when=at(2))
+
+        restored = self.archive.open_at("clio", date(2026, 9, 2))
+
+        self.assertEqual(restored[0], jobs[0])
+        self.assertEqual(restored[1].title, "Dev Ops")
+        self.assertIsNone(restored[1].posted_date)
+
+    def test_open_at_reads_the_last_run_on_or_before_the_day(self):
+        self.archive.record("clio", [make_job("1")], when=at(1, 8))
+        self.archive.record("clio", [make_job("1"), make_job("2")], when=at(1, 20))
+        self.archive.record("clio", [make_job("3")], when=at(5))
+
+        self.assertEqual([job.job_id for job in self.archive.open_at("clio", date(2026, 9, 3))], ["1", "2"])
+        self.assertEqual([job.job_id for job in self.archive.open_at("clio", date(2026, 9, 5))], ["3"])
+        self.assertEqual(self.archive.open_at("clio", date(2026, 8, 31)), [])
+        self.assertEqual(self.archive.open_at("stripe", date(2026, 9, 5)), [])
+
+    def test_empty_snapshot(self):
+        self.archive.record("clio", [make_job("1")], when=at(1))
+        self.assertEqual(self.archive.record("clio", [], when=at(2)), (0, 1))
+        self.assertEqual(self.archive.open_at("clio", date(2026, 9, 2)), [])
+
+    def test_record_counts_opened_and_closed(self):
+        self.assertEqual(self.archive.record("clio", [make_job("1"), make_job("2")], when=at(1)), (2, 0))
+        self.assertEqual(self.archive.record("clio", [make_job("2"), make_job("3")], when=at(2)), (1, 1))
+        self.assertEqual(self.archive.record("clio", [make_job("2"), make_job("3")], when=at(3)), (0, 0))
+
+    def test_torn_block_is_ignored(self):
+        self.archive.record("clio", [make_job("1")], when=at(1))
+        with open(os.path.join(self.archive.root, "clio", "2026-09-01.blk"), "ab") as f:
+            f.write(b"JHB1\x00\x01")
+
+        self.assertEqual([job.job_id for job in self.archive.open_at("clio", date(2026, 9, 1))], ["1"])
+        self.assertEqual(self.archive.record("clio", [make_job("1")], when=at(2)), (0, 0))
+
+
+class TestChurn(HistoryTestCase):
+    def test_postings_that_closed_within_the_window(self):
+        self.archive.record("clio", [make_job("1"), make_job("2")], when=at(1))
+        self.archive.record("clio", [make_job("2"), make_job("3", title="Flash Posting")], when=at(3))
+        self.archive.record("clio", [make_job("2")], when=at(6))
+        self.archive.record("clio", [], when=at(20))
+
+        churned = self.archive.churn(within_days=7)
+
+        self.assertEqual([(item.job.job_id, item.job.title, item.opened, item.closed) for item in churned], [
+            ("1", "Developer 1", date(2026, 9, 1), date(2026, 9, 3)),
+            ("3", "Flash Posting", date(2026, 9, 3), date(2026, 9, 6)),
+        ])
+
+    def test_since_and_companies_filters(self):
+        for company in ("clio", "stripe"):
+            self.archive.record(company, [make_job("1")], when=at(1))
+            self.archive.record(company, [make_job("2")], when=at(4))
+            self.archive.record(company, [], when=at(5))
+
+        self.assertEqual([item.job.job_id for item in self.archive.churn(since=date(2026, 9, 2), companies=["clio"])],
+                         ["2"])
+        self.assertEqual(len(self.archive.churn()), 4)
+
+    def test_several_runs_a_day_point_at_the_right_block(self):
+        self.archive.record("clio", [make_job("1")], when=at(1, 8))
+        self.archive.record("clio", [make_job("1"), make_job("2", title="Second Run")], when=at(1, 20))
+        self.archive.record("clio", [make_job("1")], when=at(2))
+
+        churned = self.archive.churn()
+
+        self.assertEqual([(item.job.job_id, item.job.title) for item in churned], [("2", "Second Run")])
+
+    def test_reads_closed_postings_without_their_snapshots(self):
+        self.archive.record("clio", [make_job("1")], when=at(1))
+        self.archive.record("clio", [make_job("1", title="Renamed")], when=at(2))
+        self.archive.record("clio", [], when=at(3))
+        for day in ("2026-09-01.blk", "2026-09-02.blk"):
+            os.remove(os.path.join(self.archive.root, "clio", day))
+
+        churned = self.archive.churn()
+
+        # the title it was last listed with
+        self.assertEqual([(item.job.job_id, item.job.title, item.closed) for item in churned],
+                         [("1", "Renamed", date(2026, 9, 3))])
+
+    def test_archive_without_a_closed_index(self):
+        self.archive.record("clio", [make_job("1"), make_job("2")], when=at(1))
+        self.archive.record("clio", [make_job("2")], when=at(2))
+        os.remove(os.path.join(self.archive.root, "clio", "closed.blk"))
+        self.archive.record("clio", [], when=at(3))
+
+        churned = self.archive.churn()
+
+        self.assertEqual([(item.job.job_id, item.job.title, item.closed) for item in churned],
+                         [("1", "Developer 1", date(2026, 9, 2)), ("2", "Developer 2", date(2026, 9, 3))])
+
+
+if __name__ == "__main__":
+    unittest.main()
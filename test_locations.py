@@ -0,0 +1,52 @@
+import unittest
+
+from locations import Location, is_relevant_location, normalize_location
+
+
+class TestIsRelevantLocation(unittest.TestCase):
+    def test_includes_all_of_canada_but_excluded_provinces(self):
+        for location in ["Vancouver, BC", "Burnaby", "Canada", "Remote - Canada", "Winnipeg, Manitoba, Canada",
+                         "Halifax, Nova Scotia, Canada", "Regina, SK, Canada",
+                         "St. John's, Newfoundland and Labrador, Canada"]:
+            with self.subTest(location=location):
+                self.assertTrue(is_relevant_location(location))
+
+    def test_excludes_ontario_quebec_and_alberta(self):
+        for location in ["Toronto, Ontario, Canada", "Montreal, QC", "Calgary, AB, Canada", "Ottawa"]:
+            with self.subTest(location=location):
+                self.assertFalse(is_relevant_location(location))
+
+    def test_excludes_other_countries(self):
+        for location in ["San Francisco, CA", "Seattle, WA", "Remote - US"]:
+            with self.subTest(location=location):
+                self.assertFalse(is_relevant_location(location))
+
+    def test_any_of_several_locations(self):
+        self.assertTrue(is_relevant_location("Toronto; Vancouver"))
+        self.assertTrue(is_relevant_location(["Toronto, ON", {"name": "Vancouver, BC"}]))
+        self.assertFalse(is_relevant_location("Toronto or Montreal"))
+
+    def test_missing_location(self):
+        self.assertFalse(is_relevant_location(None))
+        self.assertFalse(is_relevant_location(""))
+
+
+class TestNormalizeLocation(unittest.TestCase):
+    def test_names_containing_a_separator_are_not_split(self):
+        self.assertEqual(normalize_location("Newfoundland and Labrador"),
+                         (Location(province="NL", country="CA"),))
+
+    def test_and_still_separates_locations(self):
+        self.assertEqual([location.city for location in normalize_location("Ottawa and Vancouver")],
+                         ["Ottawa", "Vancouver"])
+
+    def test_ambiguous_code_follows_the_city(self):
+        self.assertEqual(normalize_location("San Francisco, CA"),
+                         (Location(city="San Francisco", province="CA", country="US"),))
+
+    def test_remote(self):
+        self.assertEqual(normalize_location("Remote - Canada"), (Location(country="CA", remote=True),))
+
+
+if __name__ == "__main__":
+    unittest.main()
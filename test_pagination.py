@@ -0,0 +1,131 @@
+import json
+import threading
+import unittest
+from datetime import datetime, timedelta, timezone
+from urllib.parse import parse_qs, urlsplit
+
+from pagination import PAGE_SCHEMES, PageFetcher
+
+JIBE_URL = "https://careers.example.com/api/jobs?location=Canada&sortBy=relevance"
+LEVER_URL = "https://api.lever.co/v0/postings/acme?mode=json"
+
+
+class FakeFeed:
+    """Serves `postings` records page by page, in the shape of a Jibe or Lever feed."""
+
+    def __init__(self, scheme_key, postings, broken_page=None):
+        self.scheme_key = scheme_key
+        self.postings = postings
+        self.broken_page = broken_page
+        self.urls = []
+        self._lock = threading.Lock()
+
+    def __call__(self, url):
+        with self._lock:
+            self.urls.append(url)
+        params = {key: int(values[0]) for key, values in parse_qs(urlsplit(url).query).items()
+                  if key in ("page", "skip", "limit")}
+        if self.scheme_key == "github":
+            start = (params["page"] - 1) * params["limit"]
+        else:
+            start = params["skip"]
+        if start // params["limit"] == self.broken_page:
+            return b"<html>rate limited</html>"
+        records = self.postings[start:start + params["limit"]]
+        if self.scheme_key == "github":
+            return json.dumps({"totalCount": len(self.postings), "jobs": records}).encode()
+        return json.dumps(records).encode()
+
+
+def postings(count):
+    return [{"id": str(index)} for index in range(count)]
+
+
+def dated_postings(count, per_day):
+    """Newest-first postings, `per_day` of them on each day going back from today (half a day into it)."""
+    now = datetime.now(timezone.utc)
+    return [{"id": str(index),
+             "createdAt": int((now - timedelta(days=index // per_day + 0.5)).timestamp() * 1000)}
+            for index in range(count)]
+
+
+def parse_millis(value):
+    return datetime.fromtimestamp(value / 1000, timezone.utc) if value else None
+
+
+class TestPageScheme(unittest.TestCase):
+    def test_url_keeps_other_parameters(self):
+        url = PAGE_SCHEMES["github"].url(JIBE_URL, 2, 100)
+        self.assertEqual(parse_qs(urlsplit(url).query),
+                         {"location": ["Canada"], "sortBy": ["relevance"], "page": ["3"], "limit": ["100"]})
+        self.assertIn("skip=200", PAGE_SCHEMES["lever"].url(LEVER_URL, 2, 100))
+
+
+class TestPageFetcher(unittest.TestCase):
+    def fetch(self, scheme_key, feed, **kwargs):
+        url = JIBE_URL if scheme_key == "github" else LEVER_URL
+        return PageFetcher(feed, parse_millis, page_size=10, concurrency=3, **kwargs).fetch_all(
+            PAGE_SCHEMES[scheme_key], url, "createdAt")
+
+    def test_jibe_reads_the_pages_its_total_asks_for(self):
+        feed = FakeFeed("github", postings(35))
+        pages = self.fetch("github", feed)
+
+        merged = json.loads(pages.payload)
+        self.assertEqual([job["id"] for job in merged["jobs"]], [str(index) for index in range(35)])
+        self.assertEqual(merged["totalCount"], 35)
+        self.assertEqual(len(feed.urls), 4)
+        self.assertFalse(pages.truncated)
+
+    def test_lever_stops_at_a_short_page(self):
+        feed = FakeFeed("lever", postings(25))
+        pages = self.fetch("lever", feed)
+
+        self.assertEqual(len(json.loads(pages.payload)), 25)
+        self.assertFalse(pages.truncated)
+
+    def test_single_short_page(self):
+        feed = FakeFeed("lever", postings(3))
+        self.assertEqual(len(json.loads(self.fetch("lever", feed).payload)), 3)
+        self.assertEqual(len(feed.urls), 1)
+
+    def test_board_past_the_page_cap_is_truncated(self):
+        for scheme_key in ("github", "lever"):
+            with self.subTest(scheme=scheme_key):
+                feed = FakeFeed(scheme_key, postings(100))
+                pages = self.fetch(scheme_key, feed, max_pages=4)
+
+                self.assertTrue(pages.truncated)
+                self.assertEqual(len(feed.urls), 4)
+
+    def test_board_exactly_at_the_page_cap_is_complete(self):
+        self.assertFalse(self.fetch("github", FakeFeed("github", postings(40)), max_pages=4).truncated)
+
+    def test_stops_after_the_first_page_past_the_age_cutoff(self):
+        feed = FakeFeed("lever", dated_postings(200, per_day=10))
+        pages = self.fetch("lever", feed, max_age_days=3)
+
+        # one page a day: the page from 4.5 days ago is the first past the cutoff (3 days + 1 of slack),
+        # so reading stops after it, within the second wave of 3 pages
+        self.assertEqual([job["id"] for job in json.loads(pages.payload)], [str(index) for index in range(50)])
+        self.assertEqual(len(feed.urls), 7)
+        self.assertFalse(pages.truncated)
+
+    def test_reads_every_page_without_an_age_cutoff(self):
+        feed = FakeFeed("lever", dated_postings(195, per_day=10))
+        pages = self.fetch("lever", feed)
+
+        self.assertEqual(len(json.loads(pages.payload)), 195)
+        self.assertEqual(len(feed.urls), 20)
+
+    def test_unordered_pages_are_read_in_full(self):
+        feed = FakeFeed("lever", list(reversed(dated_postings(55, per_day=1))))
+        self.assertEqual(len(json.loads(self.fetch("lever", feed, max_age_days=3).payload)), 55)
+
+    def test_non_json_page_raises(self):
+        with self.assertRaises(ValueError):
+            self.fetch("lever", FakeFeed("lever", postings(50), broken_page=2))
+
+
+if __name__ == "__main__":
+    unittest.main()
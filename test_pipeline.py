@@ -0,0 +1,74 @@
+import threading
+import time
+import unittest
+
+from pipeline import Pipeline, Stage
+
+
+def stage_threads(*names):
+    return [thread for thread in threading.enumerate() if thread.name.split("-")[0] in names]
+
+
+class TestPipeline(unittest.TestCase):
+    def assertWorkersExit(self, *names):
+        deadline = time.monotonic() + 2
+        while stage_threads(*names) and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(stage_threads(*names), [])
+
+    def test_every_item_passes_through_every_stage(self):
+        pipeline = Pipeline([Stage("double", lambda item: item * 2, 3),
+                             Stage("odd", lambda item: item + 1 if item % 4 else None)], queue_size=2)
+
+        results = sorted(pipeline.run(range(10)))
+
+        self.assertEqual(results, [3, 7, 11, 15, 19])
+        self.assertEqual([stats.items for stats in pipeline.stats], [10, 10])
+        self.assertEqual(pipeline.output_stats.items, 5)
+        self.assertWorkersExit("double", "odd")
+
+    def test_queues_stay_bounded(self):
+        pipeline = Pipeline([Stage("produce", lambda item: item, 4)], queue_size=2)
+
+        for _ in pipeline.run(range(20)):
+            time.sleep(0.005)
+
+        self.assertLessEqual(pipeline.output_stats.depth_max, 2)
+        self.assertGreater(pipeline.stats[0].blocked, 0)
+
+    def test_stage_error_stops_the_pipeline_and_is_raised(self):
+        def fail_on_three(item):
+            if item == 3:
+                raise ValueError("bad item")
+            return item
+
+        pipeline = Pipeline([Stage("boom", fail_on_three, 2), Stage("after", lambda item: item)], queue_size=1)
+
+        with self.assertRaisesRegex(ValueError, "bad item"):
+            list(pipeline.run(range(100)))
+        self.assertWorkersExit("boom", "after")
+
+    def test_timeout_abandons_the_remaining_items(self):
+        release = threading.Event()
+        self.addCleanup(release.set)
+        pipeline = Pipeline([Stage("stuck", lambda item: release.wait(5) and item)], queue_size=1)
+        started = time.monotonic()
+
+        results = list(pipeline.run(range(5), timeout=lambda: 0.2 - (time.monotonic() - started)))
+
+        self.assertEqual(results, [])
+        self.assertLess(time.monotonic() - started, 2)
+        release.set()
+        self.assertWorkersExit("stuck")
+
+    def test_report_names_the_bottleneck(self):
+        pipeline = Pipeline([Stage("fast", lambda item: item), Stage("slow", lambda item: time.sleep(0.01) or item)],
+                            queue_size=2)
+
+        list(pipeline.run(range(10)))
+
+        self.assertEqual(pipeline.bottleneck(), "slow")
+
+
+if __name__ == "__main__":
+    unittest.main()
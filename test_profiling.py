@@ -0,0 +1,55 @@
+import contextlib
+import io
+import os
+import tempfile
+import threading
+import unittest
+
+from profiling import RunProfiler, span
+
+
+def work_in_thread():
+    return sum(range(1000))
+
+
+class TestRunProfiler(unittest.TestCase):
+    def test_worker_threads_are_profiled(self):
+        with RunProfiler() as profiler:
+            worker = threading.Thread(target=work_in_thread)
+            worker.start()
+            worker.join()
+
+        self.assertIn("work_in_thread", profiler._pstats("cumulative"))
+
+    def test_spans_nest_per_thread(self):
+        def filter_board():
+            with span("filter"):
+                pass
+
+        with RunProfiler() as profiler:
+            with span("run"):
+                with span("fetch clio"):
+                    worker = threading.Thread(target=filter_board)
+                    worker.start()
+                    worker.join()
+
+        self.assertEqual(sorted(profiler.calls), ["filter", "run", "run;fetch clio"])
+
+    def test_report_writes_every_file(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        prefix = os.path.join(directory.name, "profile")
+        with RunProfiler() as profiler:
+            with span("run"):
+                work_in_thread()
+
+        with contextlib.redirect_stdout(io.StringIO()) as stdout:
+            profiler.report(prefix)
+
+        for suffix in (".folded", ".prof", ".txt"):
+            self.assertTrue(os.path.exists(prefix + suffix))
+        self.assertIn("Stage times", stdout.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
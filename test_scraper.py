@@ -0,0 +1,297 @@
+import contextlib
+import io
+import json
+import os
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+from urllib.parse import parse_qs, urlsplit
+
+from company_configs import CompanyConfig
+from constants import MIN_REQUEST_TIMEOUT_SECONDS, PAGE_FETCH_CONCURRENCY, REQUEST_TIMEOUT_SECONDS
+from scraper import JobScraper
+from workday_facets import CATALOG_REQUEST_BODY, WorkdayFacetResolver
+
+
+class FakeTransport:
+    """Answers requests from `handler(method, url, body)` and records them."""
+
+    def __init__(self, handler):
+        self.handler = handler
+        self.requests = []
+
+    def request(self, method, url, body=None, timeout=None):
+        self.requests.append((method, url, body))
+        return self.handler(method, url, body)
+
+
+def workday_config(tenant):
+    return CompanyConfig(api_url=f"https://{tenant}.wd3.myworkdayjobs.com/wday/cxs/{tenant}/careers/jobs",
+                         body={"limit": 20, "offset": 0, "searchText": ""},
+                         facet_names={"locationCountry": ["Canada"]})
+
+
+def workday_jobs(*titles):
+    return json.dumps({"total": len(titles), "jobPostings": [
+        {"title": title, "locationsText": "Vancouver, BC", "bulletFields": [f"R{index}"], "postedOn": "Posted Today"}
+        for index, title in enumerate(titles)]}).encode()
+
+
+def lever_config(board):
+    return CompanyConfig(api_url=f"https://api.lever.co/v0/postings/{board}?mode=json", http_method="GET",
+                         parser_key="lever", job_id_key="text", job_age_key="createdAt")
+
+
+def lever_page(url, count=100):
+    skip = int(parse_qs(urlsplit(url).query)["skip"][0])
+    return json.dumps([{"id": str(skip + index), "text": f"Software Developer {skip + index}",
+                        "categories": {"location": "Vancouver, BC"}, "createdAt": int(time.time() * 1000)}
+                       for index in range(count)]).encode()
+
+
+def greenhouse_config(board):
+    return CompanyConfig(api_url=f"https://boards-api.greenhouse.io/v1/boards/{board}/jobs", http_method="GET",
+                         parser_key="greenhouse", job_id_key="id", job_age_key="first_published")
+
+
+def greenhouse_jobs(*titles):
+    return json.dumps({"jobs": [{"id": index, "title": title, "location": {"name": "Vancouver, BC"},
+                                 "absolute_url": f"https://example.com/{index}"}
+                                for index, title in enumerate(titles)]}).encode()
+
+
+WORKDAY_CATALOG = json.dumps({"total": 1, "facets": [
+    {"facetParameter": "locationCountry", "values": [{"id": "ca-1", "descriptor": "Canada"}]}]}).encode()
+
+
+class ScraperTestCase(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+        self.last_results_file = os.path.join(self.directory, "last_results.json")
+
+    def make_scraper(self, configs, handler, **kwargs):
+        scraper = JobScraper(configs, decoder="python", transport="http1", last_results_file=self.last_results_file,
+                             **kwargs)
+        scraper.transport = FakeTransport(handler)
+        scraper.facet_resolver = WorkdayFacetResolver(scraper.transport,
+                                                      cache_path=os.path.join(self.directory, "facets.json"))
+        return scraper
+
+    def run_quietly(self, scraper):
+        with contextlib.redirect_stdout(io.StringIO()):
+            return scraper.run()
+
+
+class TestWorkdayFetch(ScraperTestCase):
+    def test_non_json_body_fails_only_its_board(self):
+        def handler(method, url, body):
+            if body == CATALOG_REQUEST_BODY:
+                return WORKDAY_CATALOG
+            return b"<html>maintenance</html>" if "broken" in url else workday_jobs("Software Developer")
+
+        scraper = self.make_scraper({"broken": workday_config("broken"), "acme": workday_config("acme")}, handler)
+        jobs = self.run_quietly(scraper)
+
+        self.assertEqual([job.company for job in jobs], ["acme"])
+        self.assertEqual(scraper._failed, {"broken"})
+        self.assertEqual(scraper.stragglers, [])
+
+    def test_empty_board_does_not_refetch_a_young_catalog(self):
+        def handler(method, url, body):
+            return WORKDAY_CATALOG if body == CATALOG_REQUEST_BODY else workday_jobs()
+
+        scraper = self.make_scraper({"acme": workday_config("acme")}, handler)
+        self.run_quietly(scraper)
+        self.run_quietly(scraper)
+
+        catalog_requests = [request for request in scraper.transport.requests if request[2] == CATALOG_REQUEST_BODY]
+        self.assertEqual(len(catalog_requests), 1)
+        self.assertEqual(scraper.transport.requests[-1][2]["appliedFacets"], {"locationCountry": ["ca-1"]})
+
+
+class TestPagedFetch(ScraperTestCase):
+    def test_non_json_page_fails_only_its_board(self):
+        def handler(method, url, body):
+            if "broken" in url and "skip=100" in url:
+                return b"<html>rate limited</html>"
+            return lever_page(url, 100 if "skip=0" in url else 5)
+
+        scraper = self.make_scraper({"broken": lever_config("broken"), "acme": lever_config("acme")}, handler)
+        jobs = self.run_quietly(scraper)
+
+        self.assertEqual({job.company for job in jobs}, {"acme"})
+        self.assertEqual(len(jobs), 105)
+        self.assertEqual(scraper._failed, {"broken"})
+
+    def test_paging_stops_at_the_age_cutoff_only_without_snapshot_stores(self):
+        def handler(method, url, body):
+            skip = int(parse_qs(urlsplit(url).query)["skip"][0])
+            created = int((time.time() - (skip // 100 + 0.5) * 86400) * 1000)
+            return json.dumps([{"id": f"{skip}-{index}", "text": "Software Developer",
+                                "categories": {"location": "Vancouver, BC"}, "createdAt": created}
+                               for index in range(100)]).encode()
+
+        # a page a day, newest first: the fifth page (4.5 days old) is the first past the cutoff
+        for snapshots, pages in (([], 5), ([mock.Mock()], 20)):
+            with self.subTest(snapshots=bool(snapshots)):
+                scraper = self.make_scraper({"acme": lever_config("acme")}, handler, snapshots=snapshots)
+                self.run_quietly(scraper)
+                self.assertEqual(len(scraper.transport.requests), pages)
+
+    def test_truncated_board_is_reported(self):
+        scraper = self.make_scraper({"acme": lever_config("acme")}, lambda method, url, body: lever_page(url))
+
+        with contextlib.redirect_stdout(io.StringIO()) as stdout:
+            jobs = scraper.run()
+
+        self.assertEqual(len(jobs), 2000)
+        self.assertIn("has more than 20 pages", stdout.getvalue())
+
+
+class TestDeadline(ScraperTestCase):
+    def setUp(self):
+        super().setUp()
+        self.release = threading.Event()
+        self.addCleanup(self.release.set)
+        self.configs = {name: greenhouse_config(name) for name in ("acme", "slow", "stuck")}
+
+    def handler(self, method, url, body):
+        if "slow" in url or "stuck" in url:
+            self.release.wait(5)
+        return greenhouse_jobs("Software Developer")
+
+    def test_stragglers_fall_back_to_their_last_results(self):
+        # an earlier run without a deadline caches every board but "stuck"
+        self.run_quietly(self.make_scraper({name: self.configs[name] for name in ("acme", "slow")},
+                                           lambda method, url, body: greenhouse_jobs("Senior Developer")))
+        scraper = self.make_scraper(self.configs, self.handler, deadline=0.3)
+        started = time.monotonic()
+
+        with contextlib.redirect_stdout(io.StringIO()) as stdout:
+            jobs = scraper.run()
+
+        self.assertLess(time.monotonic() - started, 2)
+        self.assertEqual(sorted(scraper.stragglers), ["slow", "stuck"])
+        self.assertEqual(sorted((job.company, job.title) for job in jobs),
+                         [("acme", "Software Developer"), ("slow", "Senior Developer")])
+        self.assertIn("2 board(s) missed the 0.3s deadline", stdout.getvalue())
+        self.assertIn("Stuck: no cached results", stdout.getvalue())
+
+    def test_stragglers_do_not_replace_their_last_results(self):
+        self.run_quietly(self.make_scraper({"slow": self.configs["slow"]},
+                                           lambda method, url, body: greenhouse_jobs("Senior Developer")))
+        self.run_quietly(self.make_scraper(self.configs, self.handler, deadline=0.3))
+
+        with open(self.last_results_file) as f:
+            last_results = json.load(f)
+        self.assertEqual(sorted(last_results), ["acme", "slow"])
+        self.assertEqual(last_results["slow"]["jobs"][0]["title"], "Senior Developer")
+
+    def test_request_timeout_is_capped_to_the_time_left(self):
+        scraper = self.make_scraper({}, self.handler)
+        scraper._deadline_at = None
+        self.assertEqual(scraper._request_timeout(), REQUEST_TIMEOUT_SECONDS)
+
+        scraper._deadline_at = time.monotonic() + 3
+        self.assertLessEqual(scraper._request_timeout(), 3)
+        scraper._deadline_at = time.monotonic() - 1
+        self.assertEqual(scraper._request_timeout(), MIN_REQUEST_TIMEOUT_SECONDS)
+
+
+class TestTransportChoice(ScraperTestCase):
+    def run_with(self, configs, run_configs=None, **kwargs):
+        chosen = []
+
+        def fake_get_transport(name, max_connections):
+            chosen.append((name, max_connections))
+            return FakeTransport(lambda method, url, body: workday_jobs())
+
+        scraper = JobScraper(configs, decoder="python", last_results_file=self.last_results_file, **kwargs)
+        with mock.patch("scraper.get_transport", side_effect=fake_get_transport):
+            if run_configs is not None:
+                scraper.configs = run_configs
+            self.run_quietly(scraper)
+        return scraper, chosen
+
+    def test_single_board_uses_http1_and_several_use_auto(self):
+        configs = {"acme": CompanyConfig(api_url="https://acme.wd3.myworkdayjobs.com/jobs"),
+                   "globex": CompanyConfig(api_url="https://globex.wd3.myworkdayjobs.com/jobs")}
+
+        self.assertEqual(self.run_with({"acme": configs["acme"]})[1][0][0], "http1")
+        self.assertEqual(self.run_with(configs)[1][0][0], "auto")
+
+    def test_boards_set_after_construction_choose_the_transport(self):
+        configs = {name: CompanyConfig(api_url=f"https://{name}.wd3.myworkdayjobs.com/jobs")
+                   for name in ("acme", "globex")}
+        scraper, chosen = self.run_with({}, run_configs=configs, fetch_workers=3)
+
+        self.assertEqual(chosen, [("auto", 3 * PAGE_FETCH_CONCURRENCY)])
+        self.assertIs(scraper.facet_resolver.transport, scraper.transport)
+
+    def test_close_releases_the_transport(self):
+        scraper, _ = self.run_with({"acme": CompanyConfig(api_url="https://acme.wd3.myworkdayjobs.com/jobs")})
+        transport = scraper.transport = mock.Mock()
+
+        with scraper:
+            pass
+
+        transport.close.assert_called_once()
+        self.assertIsNone(scraper.transport)
+
+
+class TestParsePool(ScraperTestCase):
+    @staticmethod
+    def handler(method, url, body):
+        if "broken" in url:
+            return b"<html>maintenance</html>"
+        return greenhouse_jobs("Software Developer", "Junior Developer", "Product Designer")
+
+    def run_boards(self, parse_workers, **kwargs):
+        configs = {name: greenhouse_config(name) for name in ("acme", "broken", "globex")}
+        scraper = self.make_scraper(configs, self.handler, parse_workers=parse_workers, **kwargs)
+        scraper.applied_ids_by_company = {"acme": {"1"}}
+        return scraper, self.run_quietly(scraper)
+
+    def test_pool_finds_the_same_postings_as_parsing_in_process(self):
+        in_process, expected = self.run_boards(0)
+        pooled, jobs = self.run_boards(2)
+
+        self.assertEqual(sorted((job.company, job.job_id) for job in jobs),
+                         [("acme", "0"), ("globex", "0"), ("globex", "1")])
+        self.assertEqual(sorted(jobs, key=lambda job: (job.company, job.job_id)),
+                         sorted(expected, key=lambda job: (job.company, job.job_id)))
+        self.assertEqual(pooled._failed, in_process._failed)
+        self.assertEqual(pooled._failed, {"broken"})
+
+    def test_parsed_postings_come_back_only_for_snapshot_stores(self):
+        store = mock.Mock()
+        with mock.patch.object(JobScraper, "_record_snapshot") as record_without_stores:
+            self.run_boards(2)
+        record_without_stores.assert_not_called()
+
+        self.run_boards(2, snapshots=[store])
+
+        recorded = {call.args[0]: call.args[1] for call in store.record.call_args_list}
+        self.assertEqual(sorted(recorded), ["acme", "globex"])
+        # every parsed posting, not just the ones that passed the filters
+        self.assertEqual(len(recorded["acme"]), 3)
+
+
+class TestCoalescing(ScraperTestCase):
+    def test_boards_sharing_a_request_send_it_once_and_release_it(self):
+        configs = {"acme": greenhouse_config("acme"), "acme-vancouver": greenhouse_config("acme")}
+        scraper = self.make_scraper(configs, lambda method, url, body: greenhouse_jobs("Software Developer"))
+
+        jobs = self.run_quietly(scraper)
+
+        self.assertEqual(sorted(job.company for job in jobs), ["acme", "acme-vancouver"])
+        self.assertEqual(len(scraper.transport.requests), 1)
+        self.assertEqual(scraper.coalescer._calls, {})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,148 @@
+import contextlib
+import io
+import json
+import os
+import tempfile
+import threading
+import unittest
+from datetime import datetime, timedelta, timezone
+from http.client import HTTPConnection
+from http.server import ThreadingHTTPServer
+from unittest import mock
+
+from models import JobPosting
+from scraper import build_parser
+from server import ApiHandler, ResultIndex, ResultService
+
+
+def days_ago(days):
+    return datetime.now(timezone.utc) - timedelta(days=days)
+
+
+JOBS = [
+    JobPosting(company="clio", job_id="1", title="Senior Software Engineer", team="Platform", posted_date=days_ago(5)),
+    JobPosting(company="clio", job_id="2", title="Junior Software Developer", team="Platform",
+               posted_date=days_ago(1)),
+    JobPosting(company="clio", job_id="3", title="Software Developer", team="Billing", posted_date=None),
+    JobPosting(company="stripe", job_id="4", title="Senior Software Engineer", team="Payments",
+               posted_date=days_ago(2)),
+]
+
+
+def ids(document):
+    return [job["job_id"] for job in json.loads(document)["jobs"]]
+
+
+class TestResultIndex(unittest.TestCase):
+    def setUp(self):
+        self.index = ResultIndex(JOBS)
+
+    def test_everything_newest_first_with_undated_postings_first(self):
+        self.assertEqual(ids(self.index.query({})), ["3", "2", "4", "1"])
+        self.assertEqual(json.loads(self.index.query({}, limit=2))["count"], 2)
+
+    def test_filters_intersect_and_repeated_values_match_any(self):
+        self.assertEqual(ids(self.index.query({"company": ["clio"], "team": ["Platform"]})), ["2", "1"])
+        self.assertEqual(ids(self.index.query({"seniority": ["senior"]})), ["4", "1"])
+        self.assertEqual(ids(self.index.query({"team": ["Billing", "Payments"]})), ["3", "4"])
+        self.assertEqual(ids(self.index.query({"company": ["clio"], "team": ["Payments"]})), [])
+        self.assertEqual(ids(self.index.query({"company": ["xero"]})), [])
+
+    def test_age_cutoff_keeps_undated_postings(self):
+        self.assertEqual(ids(self.index.query({}, max_age_days=2)), ["3", "2", "4"])
+        self.assertEqual(ids(self.index.query({"company": ["clio"]}, max_age_days=2)), ["3", "2"])
+
+    def test_companies_and_without(self):
+        self.assertEqual(json.loads(self.index.companies), {"clio": 3, "stripe": 1})
+
+        smaller = self.index.without("clio", "2")
+
+        self.assertEqual(ids(smaller.query({"company": ["clio"]})), ["3", "1"])
+        self.assertEqual(smaller.built_at, self.index.built_at)
+        self.assertEqual(len(self.index), 4)
+
+
+class ServiceTestCase(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+        self.enterContext(contextlib.redirect_stdout(io.StringIO()))
+        self.enterContext(mock.patch("scraper.APPLIED_JOBS_FILE", os.path.join(self.directory, "applied.json")))
+        self.enterContext(mock.patch("scraper.JobScraper._load_last_results", return_value={
+            "clio": {"jobs": [job.to_dict() for job in JOBS[1:3]]}, "stripe": {"jobs": [JOBS[3].to_dict()]}}))
+
+    def make_service(self, *options):
+        args = build_parser().parse_args(["clio", "--no-history", "--no-trends", *options])
+        service = ResultService(args, refresh_seconds=60)
+        self.addCleanup(service.close)
+        return service
+
+
+class TestResultService(ServiceTestCase):
+    def test_serves_the_last_results_until_the_first_refresh(self):
+        self.assertEqual(ids(self.make_service().index.query({})), ["3", "2"])
+
+    def test_profile_reports_each_refresh(self):
+        prefix = os.path.join(self.directory, "profile", "serve")
+        service = self.make_service("--profile", "--profile-output", prefix)
+
+        with mock.patch("scraper.select_configs", return_value={}), \
+                mock.patch("scraper.JobScraper.run", return_value=[]) as run:
+            service.refresh()
+
+        run.assert_called_once()
+        self.assertTrue(os.path.exists(prefix + ".txt"))
+
+    def test_refresh_without_profile_writes_no_report(self):
+        service = self.make_service("--profile-output", os.path.join(self.directory, "serve"))
+
+        with mock.patch("scraper.select_configs", return_value={}), \
+                mock.patch("scraper.JobScraper.run", return_value=[]):
+            service.refresh()
+
+        self.assertEqual(os.listdir(self.directory), [])
+        self.assertIsNotNone(service.status()["last_refresh_seconds"])
+
+
+class TestApi(ServiceTestCase):
+    def setUp(self):
+        super().setUp()
+        self.service = self.make_service()
+        handler = type("Handler", (ApiHandler,), {"service": self.service})
+        httpd = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+        threading.Thread(target=httpd.serve_forever, args=(0.01,), daemon=True).start()
+        self.addCleanup(httpd.server_close)
+        self.addCleanup(httpd.shutdown)
+        self.port = httpd.server_address[1]
+
+    def request(self, method, path, body=None):
+        connection = HTTPConnection("127.0.0.1", self.port)
+        self.addCleanup(connection.close)
+        connection.request(method, path, body=json.dumps(body) if body is not None else None)
+        response = connection.getresponse()
+        return response.status, json.loads(response.read())
+
+    def test_jobs_query(self):
+        status, body = self.request("GET", "/jobs?company=clio&team=Platform")
+        self.assertEqual((status, [job["job_id"] for job in body["jobs"]]), (200, ["2"]))
+
+        status, body = self.request("GET", "/jobs?colour=blue")
+        self.assertEqual(status, 400)
+        self.assertIn("colour", body["error"])
+
+    def test_marking_applied_drops_the_posting(self):
+        status, body = self.request("POST", "/applied", {"company": "clio", "job_id": "2"})
+
+        self.assertEqual((status, body["removed"]), (200, True))
+        self.assertEqual([job["job_id"] for job in self.request("GET", "/jobs")[1]["jobs"]], ["3"])
+        with open(os.path.join(self.directory, "applied.json")) as f:
+            self.assertIn("2", json.dumps(json.load(f)))
+
+    def test_bad_applied_body_and_unknown_endpoint(self):
+        self.assertEqual(self.request("POST", "/applied", {"company": "clio"})[0], 400)
+        self.assertEqual(self.request("GET", "/nowhere")[0], 404)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,109 @@
+import csv
+import gzip
+import json
+import os
+import sqlite3
+import tempfile
+import unittest
+from datetime import datetime, timezone
+
+from models import JobPosting
+from sinks import CSV_FIELDS, CsvSink, NdjsonSink, SqliteSink, open_sink, sink_format
+
+
+def make_job(job_id, title="Software Developer", team="Platform"):
+    return JobPosting(company="clio", job_id=job_id, title=title, location="Vancouver, BC",
+                      url=f"https://example.com/{job_id}", posted_date=datetime(2026, 9, 1, tzinfo=timezone.utc),
+                      team=team)
+
+
+class SinkTestCase(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+
+    def path(self, name):
+        return os.path.join(self.directory, "out", name)
+
+
+class TestSinkFormat(unittest.TestCase):
+    def test_formats_from_extensions(self):
+        self.assertEqual(sink_format("jobs.ndjson"), "ndjson")
+        self.assertEqual(sink_format("jobs.jsonl.gz"), "ndjson")
+        self.assertEqual(sink_format("JOBS.CSV"), "csv")
+        self.assertEqual(sink_format("jobs.sqlite3"), "sqlite")
+
+    def test_unknown_and_compressed_sqlite_are_rejected(self):
+        self.assertIsNone(sink_format("jobs.txt"))
+        self.assertIsNone(sink_format("jobs.db.gz"))
+        with self.assertRaises(ValueError):
+            open_sink("jobs.txt")
+
+
+class TestTextSinks(SinkTestCase):
+    def test_ndjson_round_trips_postings(self):
+        jobs = [make_job("1"), make_job("2", team=None)]
+        with NdjsonSink(self.path("jobs.ndjson")) as sink:
+            for job in jobs:
+                sink.write(job)
+
+        with open(self.path("jobs.ndjson")) as f:
+            self.assertEqual([JobPosting.from_dict(json.loads(line)) for line in f], jobs)
+
+    def test_gzipped_csv_has_every_field(self):
+        with open_sink(self.path("jobs.csv.gz")) as sink:
+            sink.write(make_job("1"))
+
+        with gzip.open(self.path("jobs.csv.gz"), "rt", newline="") as f:
+            rows = list(csv.DictReader(f))
+        self.assertEqual(list(rows[0]), CSV_FIELDS)
+        self.assertEqual((rows[0]["job_id"], rows[0]["team"]), ("1", "Platform"))
+
+    def test_writes_in_batches(self):
+        sink = CsvSink(self.path("jobs.csv"), batch_size=2)
+        sink.write(make_job("1"))
+        self.assertEqual(sink.written, 0)
+        sink.write(make_job("2"))
+        self.assertEqual(sink.written, 2)
+        sink.write(make_job("3"))
+        sink.close()
+        self.assertEqual(sink.written, 3)
+
+
+class TestSqliteSink(SinkTestCase):
+    def rows(self, path):
+        connection = sqlite3.connect(path)
+        self.addCleanup(connection.close)
+        return connection.execute("SELECT company, job_id, title, team FROM postings ORDER BY job_id").fetchall()
+
+    def test_upserts_by_company_and_job_id(self):
+        path = self.path("jobs.db")
+        with SqliteSink(path) as sink:
+            sink.write(make_job("1"))
+            sink.write(make_job("2"))
+        with SqliteSink(path) as sink:
+            sink.write(make_job("1", title="Senior Software Developer"))
+
+        self.assertEqual(self.rows(path), [("clio", "1", "Senior Software Developer", "Platform"),
+                                           ("clio", "2", "Software Developer", "Platform")])
+
+    def test_adds_the_team_column_to_an_existing_database(self):
+        path = self.path("jobs.db")
+        os.makedirs(os.path.dirname(path))
+        connection = sqlite3.connect(path)
+        connection.execute("CREATE TABLE postings (company TEXT NOT NULL, job_id TEXT NOT NULL, title TEXT, "
+                           "location TEXT, url TEXT, posted_date TEXT, seen_at TEXT NOT NULL, "
+                           "PRIMARY KEY (company, job_id))")
+        connection.execute("INSERT INTO postings VALUES ('clio', '0', 'Old', NULL, NULL, NULL, '2026-01-01')")
+        connection.commit()
+        connection.close()
+
+        with SqliteSink(path) as sink:
+            sink.write(make_job("1"))
+
+        self.assertEqual(self.rows(path), [("clio", "0", "Old", None), ("clio", "1", "Software Developer", "Platform")])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,45 @@
+import unittest
+
+from titles import TitleInfo, classify_title, is_relevant_title, normalize_title
+
+
+class TestClassifyTitle(unittest.TestCase):
+    def test_abbreviations_are_expanded(self):
+        self.assertEqual(normalize_title("Sr. SWE II"), "SENIOR SOFTWARE ENGINEER II")
+
+    def test_highest_seniority_and_every_level_seen(self):
+        self.assertEqual(classify_title("Junior Developer (Co-op)"),
+                         TitleInfo("software_engineering", "junior", (), ("junior", "intern")))
+        self.assertEqual(classify_title("Senior Software Engineer, Tech Lead").seniority, "lead")
+
+    def test_phrases_claim_their_words(self):
+        self.assertEqual(classify_title("Lead Generation Engineer").seniority, None)
+        self.assertEqual(classify_title("Internal Tools Developer").seniority, None)
+
+
+class TestIsRelevantTitle(unittest.TestCase):
+    def test_co_op_and_intern_titles_with_a_junior_level_are_excluded(self):
+        for title in ("Junior Developer (Co-op)", "Software Engineer I - Co-op", "New Grad Software Engineer Intern",
+                      "Associate Software Engineer, Internship"):
+            with self.subTest(title=title):
+                self.assertFalse(is_relevant_title(title))
+
+    def test_relevant_titles(self):
+        for title in ("Software Developer", "Junior Software Engineer", "Senior Software Engineer",
+                      "Lead Generation Engineer", "Internal Tools Developer", "SRE"):
+            with self.subTest(title=title):
+                self.assertTrue(is_relevant_title(title))
+
+    def test_excluded_seniorities_families_and_specialties(self):
+        for title in ("Staff Software Engineer", "Tech Lead", "Engineering Manager", "Product Designer",
+                      "iOS Developer", "DevOps Engineer"):
+            with self.subTest(title=title):
+                self.assertFalse(is_relevant_title(title))
+
+    def test_empty_title(self):
+        self.assertFalse(is_relevant_title(None))
+        self.assertFalse(is_relevant_title(""))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,132 @@
+import contextlib
+import gzip
+import io
+import json
+import socket
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+
+import requests
+
+from transport import Http2Transport, SessionTransport, USER_AGENT, get_transport, load_httpx
+
+
+class EchoHandler(BaseHTTPRequestHandler):
+    """Echoes the request back as gzipped JSON; /missing is a 404 and /slow answers late."""
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        self._answer(None)
+
+    def do_POST(self):
+        self._answer(json.loads(self.rfile.read(int(self.headers["Content-Length"]))))
+
+    def _answer(self, body):
+        if self.path == "/missing":
+            self.send_response(404)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        if self.path == "/slow":
+            time.sleep(0.5)
+        data = gzip.compress(json.dumps({"method": self.command, "body": body, "headers": dict(self.headers)})
+                             .encode())
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def unused_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class TransportTests:
+    """Run against each transport by the subclasses below."""
+
+    def make_transport(self):
+        raise NotImplementedError
+
+    def setUp(self):
+        httpd = ThreadingHTTPServer(("127.0.0.1", 0), EchoHandler)
+        httpd.daemon_threads = True
+        threading.Thread(target=httpd.serve_forever, args=(0.01,), daemon=True).start()
+        self.addCleanup(httpd.server_close)
+        self.addCleanup(httpd.shutdown)
+        self.base_url = f"http://127.0.0.1:{httpd.server_address[1]}"
+        self.transport = self.make_transport()
+        self.addCleanup(self.transport.close)
+
+    def test_json_body_and_headers(self):
+        echoed = json.loads(self.transport.request("post", f"{self.base_url}/jobs", {"limit": 20}))
+
+        self.assertEqual((echoed["method"], echoed["body"]), ("POST", {"limit": 20}))
+        self.assertEqual(echoed["headers"]["User-Agent"], USER_AGENT)
+        self.assertIn("gzip", echoed["headers"]["Accept-Encoding"])
+
+    def test_http_error_status(self):
+        with self.assertRaises(requests.exceptions.HTTPError):
+            self.transport.request("GET", f"{self.base_url}/missing")
+
+    def test_timeout(self):
+        with self.assertRaises(requests.exceptions.Timeout):
+            self.transport.request("GET", f"{self.base_url}/slow", timeout=0.1)
+
+    def test_connection_refused(self):
+        with self.assertRaises(requests.exceptions.ConnectionError):
+            self.transport.request("GET", f"http://127.0.0.1:{unused_port()}/jobs", timeout=1)
+
+
+class TestSessionTransport(TransportTests, unittest.TestCase):
+    def make_transport(self):
+        return SessionTransport()
+
+
+@unittest.skipIf(load_httpx() is None, "httpx with HTTP/2 support is not installed")
+class TestHttp2Transport(TransportTests, unittest.TestCase):
+    def make_transport(self):
+        return Http2Transport()
+
+    def test_counts_the_negotiated_protocol(self):
+        # plain http has no ALPN, so h2 isn't offered
+        self.transport.request("GET", f"{self.base_url}/jobs")
+        self.assertEqual(self.transport.http_versions, {"HTTP/1.1": 1})
+
+
+class TestGetTransport(unittest.TestCase):
+    def get(self, name):
+        transport = get_transport(name, max_connections=4)
+        self.addCleanup(transport.close)
+        return transport
+
+    def test_unknown_transport(self):
+        with self.assertRaises(ValueError):
+            get_transport("http3")
+
+    def test_http1_is_the_requests_session(self):
+        self.assertIsInstance(self.get("http1"), SessionTransport)
+
+    @unittest.skipIf(load_httpx() is None, "httpx with HTTP/2 support is not installed")
+    def test_auto_prefers_http2(self):
+        self.assertIsInstance(self.get("auto"), Http2Transport)
+
+    def test_falls_back_without_httpx(self):
+        with mock.patch("transport.load_httpx", return_value=None):
+            self.assertIsInstance(self.get("auto"), SessionTransport)
+            with contextlib.redirect_stdout(io.StringIO()) as stdout:
+                self.assertIsInstance(self.get("http2"), SessionTransport)
+        self.assertIn("falling back to HTTP/1.1", stdout.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,137 @@
+import contextlib
+import io
+import json
+import os
+import tempfile
+import time
+import unittest
+
+import requests
+
+from company_configs import CompanyConfig
+from constants import REQUEST_TIMEOUT_SECONDS
+from workday_facets import WorkdayFacetResolver
+
+API_URL = "https://acme.wd3.myworkdayjobs.com/wday/cxs/acme/careers/jobs"
+
+
+def catalog_response(country_ids):
+    return json.dumps({"total": 5, "facets": [
+        {"facetParameter": "locationCountry",
+         "values": [{"id": facet_id, "descriptor": name} for name, facet_id in country_ids.items()]},
+        {"facetParameter": "locationMainGroup", "values": [
+            {"facetParameter": "locations", "values": [{"id": "loc-van", "descriptor": "Vancouver, BC, Canada"}]},
+        ]},
+    ]}).encode()
+
+
+class FakeTransport:
+    def __init__(self, country_ids, error=None):
+        self.country_ids = country_ids
+        self.error = error
+        self.requests = 0
+        self.timeouts = []
+
+    def request(self, method, url, body=None, timeout=None):
+        self.requests += 1
+        self.timeouts.append(timeout)
+        if self.error is not None:
+            raise self.error
+        return catalog_response(self.country_ids)
+
+
+class TestWorkdayFacetResolver(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.cache_path = os.path.join(directory.name, "facets.json")
+        self.transport = FakeTransport({"Canada": "ca-1"})
+        self.resolver = WorkdayFacetResolver(self.transport, cache_path=self.cache_path)
+        self.config = CompanyConfig(api_url=API_URL, facet_names={"locationCountry": ["Canada"],
+                                                                  "locations": ["Vancouver"]})
+
+    def test_resolves_names_and_nested_groups(self):
+        self.assertEqual(self.resolver.resolve(self.config), {"locationCountry": ["ca-1"], "locations": ["loc-van"]})
+
+    def test_catalog_is_cached_on_disk(self):
+        self.resolver.resolve(self.config)
+        WorkdayFacetResolver(self.transport, cache_path=self.cache_path).resolve(self.config)
+
+        self.assertEqual(self.transport.requests, 1)
+
+    def test_missing_name_refetches_once(self):
+        self.resolver.resolve(self.config)
+        config = CompanyConfig(api_url=API_URL, facet_names={"locationCountry": ["Atlantis"]})
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.assertEqual(self.resolver.resolve(config), {})
+        self.assertEqual(self.transport.requests, 2)
+
+    def test_names_match_whole_words_only(self):
+        self.transport.country_ids = {"Australia": "au-1", "United States": "us-1"}
+        config = CompanyConfig(api_url=API_URL, facet_names={"locationCountry": ["US", "States"],
+                                                             "locations": ["Vancouver"]})
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.assertEqual(self.resolver.resolve(config), {"locationCountry": ["us-1"], "locations": ["loc-van"]})
+
+    def test_hyphenated_descriptor_is_not_a_match(self):
+        catalog = {"jobFamilyGroup": {"NON-ENGINEERING SUPPORT": "f-1", "ENGINEERING": "f-2",
+                                      "SOFTWARE ENGINEERING": "f-3"}}
+        resolved, unmatched = self.resolver._match(catalog, {"jobFamilyGroup": ["Engineering", "Support Ops"]})
+
+        self.assertEqual(resolved, {"jobFamilyGroup": ["f-2"]})
+        self.assertEqual(unmatched, ["jobFamilyGroup=Support Ops"])
+
+    def test_unmatched_name_is_reported(self):
+        config = CompanyConfig(api_url=API_URL, facet_names={"locationCountry": ["Atlantis"]})
+        with contextlib.redirect_stdout(io.StringIO()) as stdout:
+            self.resolver.resolve(config)
+
+        self.assertIn("No Workday facet matches locationCountry=Atlantis", stdout.getvalue())
+
+    def test_failed_fetch_costs_one_request(self):
+        self.transport.error = requests.exceptions.ConnectionError("down")
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.assertEqual(self.resolver.resolve(self.config), {})
+
+        self.assertEqual(self.transport.requests, 1)
+        self.assertEqual(self.transport.timeouts, [REQUEST_TIMEOUT_SECONDS])
+
+
+class TestIsStale(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.resolver = WorkdayFacetResolver(FakeTransport({"Canada": "ca-1"}),
+                                             cache_path=os.path.join(directory.name, "facets.json"),
+                                             min_refresh_hours=24)
+        self.resolver.resolve(CompanyConfig(api_url=API_URL, facet_names={"locationCountry": ["Canada"]}))
+        self.resolved = {"locationCountry": ["ca-1"]}
+
+    def set_catalog_age(self, hours):
+        self.resolver._load()[API_URL]["fetched_at"] = time.time() - hours * 3600
+
+    def test_non_empty_response_is_never_stale(self):
+        self.set_catalog_age(48)
+        self.assertFalse(self.resolver.is_stale(API_URL, self.resolved, {"total": 3, "jobPostings": []}))
+
+    def test_empty_response_listing_the_ids_is_not_stale(self):
+        self.set_catalog_age(48)
+        response = json.loads(catalog_response({"Canada": "ca-1"}))
+        response["total"] = 0
+        self.assertFalse(self.resolver.is_stale(API_URL, self.resolved, response))
+
+    def test_empty_response_missing_an_id_is_stale(self):
+        response = json.loads(catalog_response({"Canada": "ca-2"}))
+        response["total"] = 0
+        self.assertTrue(self.resolver.is_stale(API_URL, self.resolved, response))
+
+    def test_empty_response_without_facets_waits_for_the_minimum_age(self):
+        self.assertFalse(self.resolver.is_stale(API_URL, self.resolved, {"total": 0}))
+        self.set_catalog_age(25)
+        self.assertTrue(self.resolver.is_stale(API_URL, self.resolved, {"total": 0}))
+
+
+if __name__ == "__main__":
+    unittest.main()
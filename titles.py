@@ -0,0 +1,106 @@
+# titles.py
+"""Classifies job titles into (role family, seniority, specialties).
+
+Titles are tokenized, abbreviations expanded ("Sr. SWE II" -> "SENIOR SOFTWARE
+ENGINEER II"), and matched phrase by phrase against the bundled rules in
+data/title_rules.json, compiled once into a single longest-first pattern. A
+phrase claims its words, so "Lead Generation Engineer" is an engineer with a
+growth specialty while "Tech Lead" is a lead, and whole words only, so
+"Internal Tools" isn't an internship. Every distinct title string is classified
+(and matched against the exclude rules) only once per process.
+"""
+import json
+import os
+import re
+from functools import lru_cache
+from typing import Dict, List, NamedTuple, Optional, Tuple
+from constants import EXCLUDE_SENIORITIES, EXCLUDE_SPECIALTIES, EXCLUDE_TITLE_FAMILIES, TITLE_RULES_FILE
+
+TITLE_RULES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), TITLE_RULES_FILE)
+
+_TOKEN = re.compile(r"[A-Z0-9+#]+")
+
+
+class TitleInfo(NamedTuple):
+    family: Optional[str] = None
+    seniority: Optional[str] = None
+    specialties: Tuple[str, ...] = ()
+    # every seniority level named in the title, e.g. ("junior", "intern") for "Junior Developer (Co-op)"
+    seniorities: Tuple[str, ...] = ()
+
+
+class _Rules(NamedTuple):
+    abbreviations: Dict[str, str]
+    pattern: re.Pattern
+    # phrase -> tags: ("family", name) | ("seniority", level) | ("specialty", name)
+    phrases: Dict[str, List[Tuple[str, str]]]
+    # seniority level -> rank, from least to most senior
+    ranks: Dict[str, int]
+
+
+@lru_cache(maxsize=None)
+def _load_rules() -> _Rules:
+    with open(TITLE_RULES_PATH, "r", encoding="utf-8") as f:
+        raw = json.load(f)
+
+    phrases: Dict[str, List[Tuple[str, str]]] = {}
+    for kind, section in (("seniority", "seniority"), ("family", "families"), ("specialty", "specialties")):
+        for value, terms in raw[section].items():
+            for term in terms:
+                phrases.setdefault(term, []).append((kind, value))
+
+    # Longest phrases first so "LEAD GENERATION" wins over "LEAD"
+    alternation = "|".join(re.escape(phrase) for phrase in sorted(phrases, key=len, reverse=True))
+    pattern = re.compile(rf"(?<!\S)(?:{alternation})(?!\S)")
+    ranks = {level: rank for rank, level in enumerate(raw["seniority"])}
+    return _Rules(raw["abbreviations"], pattern, phrases, ranks)
+
+
+def normalize_title(title: str) -> str:
+    """Uppercases a title into space-separated words with abbreviations expanded."""
+    abbreviations = _load_rules().abbreviations
+    return " ".join(abbreviations.get(token, token) for token in _TOKEN.findall(title.upper()))
+
+
+@lru_cache(maxsize=16384)
+def classify_title(title: str) -> TitleInfo:
+    """Returns a title's role family (from its longest family phrase), highest seniority and specialties."""
+    rules = _load_rules()
+    family, family_length = None, 0
+    seniority = None
+    specialties: List[str] = []
+    seniorities: List[str] = []
+
+    for match in rules.pattern.finditer(normalize_title(title)):
+        phrase = match.group(0)
+        for kind, value in rules.phrases[phrase]:
+            if kind == "family" and len(phrase) > family_length:
+                family, family_length = value, len(phrase)
+            elif kind == "seniority":
+                if seniority is None or rules.ranks[value] > rules.ranks[seniority]:
+                    seniority = value
+                if value not in seniorities:
+                    seniorities.append(value)
+            elif kind == "specialty" and value not in specialties:
+                specialties.append(value)
+
+    return TitleInfo(family, seniority, tuple(specialties), tuple(seniorities))
+
+
+def is_relevant_title(title: Optional[str]) -> bool:
+    """Whether a title avoids every excluded seniority, role family and specialty.
+
+    Any excluded seniority in the title counts, not just the highest, so
+    "Junior Developer (Co-op)" is still a co-op.
+    """
+    if not title:
+        return False
+    return _is_relevant_string(title)
+
+
+@lru_cache(maxsize=16384)
+def _is_relevant_string(title: str) -> bool:
+    info = classify_title(title)
+    return (not any(seniority in EXCLUDE_SENIORITIES for seniority in info.seniorities)
+            and info.family not in EXCLUDE_TITLE_FAMILIES
+            and not any(specialty in EXCLUDE_SPECIALTIES for specialty in info.specialties))
@@ -0,0 +1,125 @@
+# transport.py
+"""HTTP transports behind the scraper's fetches.
+
+Most boards live on a handful of shared hosts (boards-api.greenhouse.io,
+jobs.ashbyhq.com, api.lever.co, *.myworkdayjobs.com). The HTTP/2 transport
+(httpx with h2) multiplexes every concurrent request to a host over one
+connection. Hosts that don't negotiate h2 over ALPN fall back to HTTP/1.1 on
+the same client. Without httpx/h2 installed, the requests session transport is
+used; httpx is only imported once an HTTP/2 transport is built. Both ask for
+gzip explicitly, and for brotli too when a decoder for it is installed.
+
+Errors are raised as requests exceptions whichever transport is used, so
+callers handle failures the same way.
+"""
+import threading
+from collections import Counter
+from typing import Any, Dict, Optional
+import requests
+from constants import DEFAULT_FETCH_WORKERS
+
+try:
+    import brotli  # noqa: F401
+    BROTLI = True
+except ImportError:  # optional dependency: pip install brotli
+    try:
+        import brotlicffi  # noqa: F401
+        BROTLI = True
+    except ImportError:
+        BROTLI = False
+
+TRANSPORTS = ("auto", "http2", "http1")
+ACCEPT_ENCODING = "gzip, br, deflate" if BROTLI else "gzip, deflate"
+USER_AGENT = "MyJobScraper/1.0"
+
+
+def load_httpx():
+    """Imports httpx with h2 on first use (it is slow to load), or returns None when not installed."""
+    try:
+        import httpx
+        import h2  # noqa: F401  (httpx needs it for http2=True)
+    except ImportError:  # optional dependency: pip install "httpx[http2]"
+        return None
+    return httpx
+
+
+class Transport:
+    name = ""
+
+    def __init__(self, headers: Optional[Dict[str, str]] = None):
+        self.headers = {"User-Agent": USER_AGENT, "Accept-Encoding": ACCEPT_ENCODING, **(headers or {})}
+
+    def request(self, method: str, url: str, body: Optional[Any] = None,
+                timeout: Optional[float] = None) -> bytes:
+        """Sends a request (JSON body for POST) and returns the decoded response body."""
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+class SessionTransport(Transport):
+    """HTTP/1.1 over a requests session: one pooled connection per concurrent request to a host."""
+    name = "http1"
+
+    def __init__(self, headers: Optional[Dict[str, str]] = None, max_connections: int = DEFAULT_FETCH_WORKERS):
+        super().__init__(headers)
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        adapter = requests.adapters.HTTPAdapter(pool_maxsize=max_connections)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def request(self, method: str, url: str, body: Optional[Any] = None,
+                timeout: Optional[float] = None) -> bytes:
+        response = self.session.request(method.upper(), url, json=body, timeout=timeout)
+        response.raise_for_status()
+        return response.content
+
+    def close(self):
+        self.session.close()
+
+
+class Http2Transport(Transport):
+    """HTTP/2 over httpx: concurrent requests to a host share one multiplexed connection."""
+    name = "http2"
+
+    def __init__(self, headers: Optional[Dict[str, str]] = None, max_connections: int = DEFAULT_FETCH_WORKERS):
+        super().__init__(headers)
+        self.httpx = httpx = load_httpx()
+        self.client = httpx.Client(http2=True, headers=self.headers, follow_redirects=True,
+                                   limits=httpx.Limits(max_connections=max_connections))
+        # negotiated protocol per response ("HTTP/2", or "HTTP/1.1" after fallback)
+        self.http_versions: Counter = Counter()
+        self._lock = threading.Lock()
+
+    def request(self, method: str, url: str, body: Optional[Any] = None,
+                timeout: Optional[float] = None) -> bytes:
+        try:
+            response = self.client.request(method.upper(), url, json=body, timeout=timeout)
+            response.raise_for_status()
+        except self.httpx.HTTPStatusError as e:
+            raise requests.exceptions.HTTPError(str(e)) from e
+        except self.httpx.TimeoutException as e:
+            raise requests.exceptions.Timeout(str(e)) from e
+        except self.httpx.HTTPError as e:
+            raise requests.exceptions.ConnectionError(str(e)) from e
+        with self._lock:
+            self.http_versions[response.http_version] += 1
+        return response.content
+
+    def close(self):
+        self.client.close()
+
+
+def get_transport(name: str = "auto", headers: Optional[Dict[str, str]] = None,
+                  max_connections: int = DEFAULT_FETCH_WORKERS) -> Transport:
+    """Returns the HTTP/2 transport when available (or asked for), else the requests session."""
+    if name not in TRANSPORTS:
+        raise ValueError(f"Unknown transport: {name}")
+    if name != "http1" and load_httpx() is not None:
+        return Http2Transport(headers, max_connections)
+    if name == "http2":
+        print('Warning: httpx with HTTP/2 support is not installed (pip install "httpx[http2]"), '
+              'falling back to HTTP/1.1')
+    return SessionTransport(headers, max_connections)
@@ -0,0 +1,159 @@
+# workday_facets.py
+"""Resolves human-readable Workday facet names to a tenant's opaque facet IDs.
+
+Every Workday jobs response carries the tenant's facet catalog (locations, job
+families, countries, ...). The resolver fetches it once per tenant, maps
+descriptors such as "Canada" or "Engineering" to IDs and caches the mapping on
+disk, so runs keep sending narrow `appliedFacets` without hand-maintained IDs.
+"""
+import json
+import os
+import re
+import threading
+import time
+import requests
+from typing import Any, Dict, List, Optional, Tuple
+from company_configs import CompanyConfig
+from constants import (REQUEST_TIMEOUT_SECONDS, WORKDAY_FACET_CACHE_FILE, WORKDAY_FACET_CACHE_TTL_DAYS,
+                       WORKDAY_FACET_MIN_REFRESH_HOURS)
+
+SECONDS_PER_HOUR = 60 * 60
+SECONDS_PER_DAY = 24 * SECONDS_PER_HOUR
+
+# Smallest request that still returns the full facet catalog
+CATALOG_REQUEST_BODY = {"appliedFacets": {}, "limit": 1, "offset": 0, "searchText": ""}
+
+
+class WorkdayFacetResolver:
+    def __init__(self, transport, cache_path: str = WORKDAY_FACET_CACHE_FILE,
+                 ttl_days: float = WORKDAY_FACET_CACHE_TTL_DAYS,
+                 min_refresh_hours: float = WORKDAY_FACET_MIN_REFRESH_HOURS):
+        self.transport = transport
+        self.cache_path = cache_path
+        self.ttl_seconds = ttl_days * SECONDS_PER_DAY
+        # an empty board re-fetches its catalog at most this often
+        self.min_refresh_seconds = min_refresh_hours * SECONDS_PER_HOUR
+        self._cache: Optional[Dict[str, Dict[str, Any]]] = None
+        self._lock = threading.Lock()
+
+    def resolve(self, config: CompanyConfig, refresh: bool = False) -> Dict[str, List[str]]:
+        """Returns appliedFacets IDs for the config's facet_names.
+
+        Facets whose names can't be resolved are left out, with a warning, so the
+        caller keeps any hard-coded IDs for them. A cached catalog missing a
+        requested name is re-fetched once, in case the tenant renamed or
+        re-created the facet.
+        """
+        if not config.facet_names:
+            return {}
+
+        catalog, fetched = self._catalog(config.api_url, refresh)
+        resolved, unmatched = self._match(catalog, config.facet_names)
+        if not fetched and unmatched:
+            catalog, _ = self._catalog(config.api_url, refresh=True)
+            resolved, unmatched = self._match(catalog, config.facet_names)
+        if unmatched:
+            print(f"Warning: No Workday facet matches {', '.join(unmatched)} for {config.api_url}")
+        return resolved
+
+    def is_stale(self, api_url: str, resolved: Dict[str, List[str]], response: Any) -> bool:
+        """Whether a jobs response to the resolved facets suggests the cached catalog is out of date.
+
+        Only an empty response is suspect. If it lists facets, the catalog is stale
+        exactly when a resolved ID is missing from them; otherwise it's stale once
+        it's older than the minimum refresh age, so a board with no matching
+        openings doesn't re-fetch its catalog every run.
+        """
+        if not isinstance(response, dict) or response.get("total") != 0:
+            return False
+
+        current: Dict[str, Dict[str, str]] = {}
+        self._flatten(response.get("facets") or [], current)
+        if current:
+            ids = {facet_id for descriptors in current.values() for facet_id in descriptors.values()}
+            return any(facet_id not in ids for facet_ids in resolved.values() for facet_id in facet_ids)
+
+        with self._lock:
+            entry = self._load().get(api_url)
+        return entry is None or time.time() - entry["fetched_at"] >= self.min_refresh_seconds
+
+    def _match(self, catalog: Dict[str, Dict[str, str]],
+               facet_names: Dict[str, List[str]]) -> Tuple[Dict[str, List[str]], List[str]]:
+        """Returns (parameter -> IDs, "parameter=name" for each name nothing matched)."""
+        resolved = {}
+        unmatched = []
+        for parameter, names in facet_names.items():
+            descriptors = catalog.get(parameter, {})
+            ids = []
+            for name in names:
+                name_upper = name.upper()
+                if name_upper in descriptors:
+                    ids.append(descriptors[name_upper])
+                    continue
+                # Whole words only: "Vancouver" matches "Vancouver, British Columbia, Canada", but "US"
+                # doesn't match "Australia" nor "Engineering" "Non-Engineering Support"
+                words = re.compile(rf"(?<![\w-]){re.escape(name_upper)}(?![\w-])")
+                matches = [facet_id for descriptor, facet_id in descriptors.items() if words.search(descriptor)]
+                if not matches:
+                    unmatched.append(f"{parameter}={name}")
+                ids.extend(matches)
+            if ids:
+                resolved[parameter] = list(dict.fromkeys(ids))
+        return resolved, unmatched
+
+    def _catalog(self, api_url: str, refresh: bool = False) -> Tuple[Dict[str, Dict[str, str]], bool]:
+        """Returns (catalog, fetch_attempted) for a tenant, from the cache while it's within its TTL.
+
+        A failed fetch falls back to the cached catalog but still counts as an
+        attempt, so the caller doesn't retry the same failing request.
+        """
+        with self._lock:
+            entry = self._load().get(api_url)
+        if entry and not refresh and time.time() - entry["fetched_at"] < self.ttl_seconds:
+            return entry["facets"], False
+
+        try:
+            facets = self._fetch_catalog(api_url)
+        except (requests.exceptions.RequestException, ValueError) as e:
+            print(f"Warning: Could not fetch Workday facets for {api_url}: {e}")
+            return (entry["facets"] if entry else {}), True
+
+        with self._lock:
+            cache = self._load()
+            cache[api_url] = {"fetched_at": time.time(), "facets": facets}
+            self._save(cache)
+        return facets, True
+
+    def _fetch_catalog(self, api_url: str) -> Dict[str, Dict[str, str]]:
+        payload = self.transport.request("POST", api_url, CATALOG_REQUEST_BODY, timeout=REQUEST_TIMEOUT_SECONDS)
+
+        catalog: Dict[str, Dict[str, str]] = {}
+        self._flatten(json.loads(payload).get("facets", []), catalog)
+        return catalog
+
+    def _flatten(self, facets: List[Dict[str, Any]], catalog: Dict[str, Dict[str, str]]):
+        # Grouped facets (e.g. locationMainGroup) nest their own facetParameter/values
+        for facet in facets:
+            parameter = facet.get("facetParameter")
+            for value in facet.get("values", []):
+                if "facetParameter" in value:
+                    self._flatten([value], catalog)
+                elif parameter and value.get("id") and value.get("descriptor"):
+                    catalog.setdefault(parameter, {})[value["descriptor"].upper()] = value["id"]
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        if self._cache is None:
+            try:
+                with open(self.cache_path, "r") as f:
+                    self._cache = json.load(f)
+            except (json.JSONDecodeError, IOError):
+                self._cache = {}
+        return self._cache
+
+    def _save(self, cache: Dict[str, Dict[str, Any]]):
+        try:
+            os.makedirs(os.path.dirname(self.cache_path) or ".", exist_ok=True)
+            with open(self.cache_path, "w") as f:
+                json.dump(cache, f, indent=2)
+        except IOError as e:
+            print(f"Warning: Could not save Workday facet cache: {e}")